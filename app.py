@@ -16,6 +16,10 @@ from datetime import datetime
 import shap
 import matplotlib.pyplot as plt
 
+from src.feature_engineering import load_feature_pipeline
+from src.feature_store import load_features
+from src.imputation_stats import DEFAULT_STATS_PATH, load_stats
+
 # Page configuration
 st.set_page_config(
     page_title="Spotify Track Analytics",
@@ -107,12 +111,15 @@ def load_data():
     df = pd.read_parquet('data/processed/cleaned_spotify_data.parquet')
     return df
 
+@st.cache_resource
+def load_model_feature_pipeline():
+    """Load the feature pipeline saved with the latest model (nothing is fitted at startup)"""
+    model, _, _, model_path = load_model()
+    return load_feature_pipeline(model_path, model, load_stats(DEFAULT_STATS_PATH))
+
 @st.cache_data
 def load_ml_data():
     """Load ML-ready data - use randomized sample from full dataset"""
-    # Load the full dataset and prepare features
-    df = pd.read_parquet('data/processed/cleaned_spotify_data.parquet')
-
     # Get model to know which features to use
     _, metadata, _, _ = load_model()
     feature_cols = metadata.get('feature_names', [])
@@ -122,12 +129,8 @@ def load_ml_data():
         feature_cols = ['danceability', 'energy', 'loudness', 'speechiness',
                        'acousticness', 'instrumentalness', 'liveness', 'valence', 'tempo']
 
-    X = df[feature_cols].copy()
-    y = df['popularity'].copy()
-
-    # Remove NaN
-    mask = ~(X.isnull().any(axis=1) | y.isnull())
-    X, y = X[mask], y[mask]
+    # Memory-mapped feature store (cleaned Parquet if absent), NaN rows already left out
+    X, y = load_features(feature_cols)
 
     # Use RANDOMIZED sample for performance (to avoid sorted data bias)
     # Dataset is sorted by popularity, so we must shuffle!
@@ -1816,11 +1819,11 @@ with tab5:
 
     # Predict button
     if st.button("🚀 Predict Popularity", type="primary", width='stretch'):
-        # Prepare features
         duration_min = duration_ms / 60000
 
-        # Create feature dict
-        features = {
+        # Raw track attributes; the model's fitted feature pipeline derives,
+        # encodes and orders the model inputs
+        track = pd.DataFrame([{
             'danceability': danceability,
             'energy': energy,
             'key': key,
@@ -1833,88 +1836,11 @@ with tab5:
             'valence': valence,
             'tempo': tempo,
             'time_signature': time_signature,
-            'explicit': int(explicit),
+            'explicit': explicit,
             'duration_ms': duration_ms,
-            'duration_min': duration_min,
-        }
-
-        # Add engineered features
-        features['energy_danceability'] = energy * danceability
-        features['valence_energy'] = valence * energy
-        features['acousticness_energy'] = acousticness * energy
-        features['energy_squared'] = energy ** 2
-        features['danceability_squared'] = danceability ** 2
-        features['valence_squared'] = valence ** 2
-        features['is_short_track'] = int(duration_min < 3)
-        features['is_long_track'] = int(duration_min > 5)
-        features['high_energy_happy'] = int(energy > 0.7 and valence > 0.7)
-        features['low_energy_sad'] = int(energy < 0.3 and valence < 0.3)
-
-        # Encode categorical features (simplified - using defaults)
-        # In production, you'd need the exact encoding from training
-        features['track_genre_encoded'] = 0  # Would need actual encoding
-
-        # One-hot encoded features (set all to 0 by default, set specific ones to 1)
-        features['mode_1'] = int(mode == 1)
-        features['time_signature_4'] = int(time_signature == 4)
-        features['time_signature_5'] = int(time_signature == 5)
-
-        # Mood/energy (simplified)
-        if valence > 0.5 and energy > 0.5:
-            mood = "Happy/High Energy"
-        elif valence <= 0.5 and energy > 0.5:
-            mood = "Energetic/Sad"
-        elif valence > 0.5 and energy <= 0.5:
-            mood = "Chill/Happy"
-        else:
-            mood = "Sad/Low Energy"
-
-        # Create dummy columns for mood encoding (simplified)
-        features['mood_energy_Energetic/Sad'] = int(mood == "Energetic/Sad")
-        features['mood_energy_Happy/High Energy'] = int(mood == "Happy/High Energy")
-        features['mood_energy_Sad/Low Energy'] = int(mood == "Sad/Low Energy")
-
-        # Energy category
-        if energy < 0.33:
-            energy_cat = "Low Energy"
-        elif energy < 0.66:
-            energy_cat = "Medium Energy"
-        else:
-            energy_cat = "High Energy"
-
-        features['energy_category_Low Energy'] = int(energy_cat == "Low Energy")
-        features['energy_category_Medium Energy'] = int(energy_cat == "Medium Energy")
-
-        # Tempo category
-        if tempo < 90:
-            tempo_cat = "Slow"
-        elif tempo < 120:
-            tempo_cat = "Moderate"
-        elif tempo < 150:
-            tempo_cat = "Fast"
-        else:
-            tempo_cat = "Very Fast"
-
-        features['tempo_category_Moderate'] = int(tempo_cat == "Moderate")
-        features['tempo_category_Slow'] = int(tempo_cat == "Slow")
-        features['tempo_category_Very Fast'] = int(tempo_cat == "Very Fast")
-
-        # Create DataFrame with correct column order
-        feature_df = pd.DataFrame([features])
-
-        # Filter to only include features the model expects
-        feature_df_model = feature_df[[col for col in model.feature_names_in_ if col in feature_df.columns]].copy()
-
-        # Add missing features with appropriate default values
-        for col in model.feature_names_in_:
-            if col not in feature_df_model.columns:
-                if col == 'release_year':
-                    feature_df_model[col] = 2020  # Default year for missing release_year
-                else:
-                    feature_df_model[col] = 0  # Default to 0 for other missing features
-
-        # Ensure column order matches model's expectations
-        feature_df_model = feature_df_model[model.feature_names_in_]
+            'track_genre': track_genre,
+        }])
+        feature_df_model = load_model_feature_pipeline().transform(track)
 
         # Make prediction
         try:
@@ -15,6 +15,10 @@ from pathlib import Path
 import shap
 import matplotlib.pyplot as plt
 
+from src.feature_engineering import load_feature_pipeline
+from src.feature_store import load_features
+from src.imputation_stats import DEFAULT_STATS_PATH, load_stats
+
 # ============================================================================
 # Data Loading Functions
 # ============================================================================
@@ -26,21 +30,15 @@ def load_data():
 
 def load_ml_data():
     """Load ML-ready data - use randomized sample from full dataset"""
-    df = pd.read_parquet('data/processed/cleaned_spotify_data.parquet')
-
-    _, metadata, _ = load_model()
+    _, metadata, _, _ = load_model()
     feature_cols = metadata.get('feature_names', [])
 
     if not feature_cols:
         feature_cols = ['danceability', 'energy', 'loudness', 'speechiness',
                        'acousticness', 'instrumentalness', 'liveness', 'valence', 'tempo']
 
-    X = df[feature_cols].copy()
-    y = df['popularity'].copy()
-
-    # Remove NaN values
-    mask = ~(X.isnull().any(axis=1) | y.isnull())
-    X, y = X[mask], y[mask]
+    # Memory-mapped feature store (cleaned Parquet if absent), NaN rows already left out
+    X, y = load_features(feature_cols)
 
     # Use RANDOMIZED sample for performance (to avoid sorted data bias)
     # Dataset is sorted by popularity, so we must shuffle!
@@ -92,11 +90,12 @@ def load_model():
                 'importance': model.feature_importances_
             }).sort_values('importance', ascending=False)
 
-    return model, metadata, feature_importance
+    return model, metadata, feature_importance, latest_model
 
 # Load data globally
 df = load_data()
-model, metadata, feature_importance = load_model()
+model, metadata, feature_importance, model_path = load_model()
+feature_pipeline = load_feature_pipeline(model_path, model, load_stats(DEFAULT_STATS_PATH))
 X_test, y_test = load_ml_data()
 
 # ============================================================================
@@ -509,19 +508,7 @@ def predict_popularity(danceability, energy, key, loudness, mode, speechiness,
     duration_ms = float(duration_ms)
     time_signature = int(float(time_signature))
 
-    # Create feature dictionary matching training features
-    # Calculate derived features
     duration_min = duration_ms / 60000
-    energy_danceability = energy * danceability
-    valence_energy = valence * energy
-    acousticness_energy = acousticness * energy
-    energy_squared = energy ** 2
-    danceability_squared = danceability ** 2
-    valence_squared = valence ** 2
-    is_short_track = int(duration_min < 3)
-    is_long_track = int(duration_min > 5)
-    high_energy_happy = int((energy > 0.7) and (valence > 0.7))
-    low_energy_sad = int((energy < 0.3) and (valence < 0.3))
 
     # Mood/energy categorization
     if valence > 0.5 and energy > 0.5:
@@ -549,88 +536,25 @@ def predict_popularity(danceability, energy, key, loudness, mode, speechiness,
     else:
         tempo_category = "Very Fast"
 
-    # Create feature vector (need to match training feature order from X_test)
-    # This is simplified - in production, you'd need exact feature engineering pipeline
-    feature_vector = pd.DataFrame({
-        'duration_ms': [duration_ms],
-        'explicit': [0],  # Default
-        'danceability': [danceability],
-        'energy': [energy],
-        'key': [key],
-        'loudness': [loudness],
-        'speechiness': [speechiness],
-        'acousticness': [acousticness],
-        'instrumentalness': [instrumentalness],
-        'liveness': [liveness],
-        'valence': [valence],
-        'tempo': [tempo],
-        'duration_min': [duration_min],
-        'energy_danceability': [energy_danceability],
-        'valence_energy': [valence_energy],
-        'acousticness_energy': [acousticness_energy],
-        'energy_squared': [energy_squared],
-        'danceability_squared': [danceability_squared],
-        'valence_squared': [valence_squared],
-        'is_short_track': [is_short_track],
-        'is_long_track': [is_long_track],
-        'high_energy_happy': [high_energy_happy],
-        'low_energy_sad': [low_energy_sad],
-    })
-
-    # Add mode and time signature one-hot encoding
-    for mode_val in [0, 1]:
-        feature_vector[f'mode_{mode_val}'] = [int(mode == mode_val)]
-
-    for ts in [1, 3, 4, 5]:
-        feature_vector[f'time_signature_{ts}'] = [int(time_signature == ts)]
-
-    # Add mood/energy categories
-    for mood_val in ['Energetic/Sad', 'Happy/High Energy', 'Sad/Low Energy']:
-        feature_vector[f'mood_energy_{mood_val}'] = [int(mood == mood_val)]
-
-    # Add energy categories
-    for ec in ['Medium Energy', 'High Energy']:
-        feature_vector[f'energy_category_{ec}'] = [int(energy_category == ec)]
-
-    # Add tempo categories
-    for tc in ['Moderate', 'Fast', 'Very Fast']:
-        feature_vector[f'tempo_category_{tc}'] = [int(tempo_category == tc)]
-
-    # Add genre encoding (simplified - use mean encoding or label encoding)
-    # For now, use a simple hash
-    genre_encoded = hash(genre) % 100 / 100.0
-    feature_vector['track_genre_encoded'] = [genre_encoded]
-
-    # Use only the features that the model was trained on
-    # For the new model (9 features), we'll use a simplified approach
-    model_features = model.feature_names_in_
-
-    # Create a simple feature vector with just the 9 core features if that's what model expects
-    if len(model_features) == 9 and 'release_year' not in model_features:
-        # New model with 9 audio features only
-        feature_vector_model = pd.DataFrame({
-            'danceability': [danceability],
-            'energy': [energy],
-            'loudness': [loudness],
-            'speechiness': [speechiness],
-            'acousticness': [acousticness],
-            'instrumentalness': [instrumentalness],
-            'liveness': [liveness],
-            'valence': [valence],
-            'tempo': [tempo]
-        })
-    else:
-        # Old model with many engineered features
-        # Filter to only include features the model expects
-        feature_vector_model = feature_vector[[col for col in model_features if col in feature_vector.columns]].copy()
-
-        # Add missing features with appropriate default values
-        for col in model_features:
-            if col not in feature_vector_model.columns:
-                feature_vector_model[col] = [0]
-
-        # Ensure column order matches model's expectations
-        feature_vector_model = feature_vector_model[model_features]
+    # Raw track attributes; the model's fitted feature pipeline derives,
+    # encodes and orders the model inputs
+    track = pd.DataFrame([{
+        'danceability': danceability,
+        'energy': energy,
+        'key': key,
+        'loudness': loudness,
+        'mode': mode,
+        'speechiness': speechiness,
+        'acousticness': acousticness,
+        'instrumentalness': instrumentalness,
+        'liveness': liveness,
+        'valence': valence,
+        'tempo': tempo,
+        'time_signature': time_signature,
+        'duration_ms': duration_ms,
+        'track_genre': genre,
+    }])
+    feature_vector_model = feature_pipeline.transform(track)
 
     # Make prediction
     prediction = model.predict(feature_vector_model)[0]
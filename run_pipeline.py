@@ -82,7 +82,8 @@ def main():
 
         print("\n📁 Output files:")
         print("   • data/processed/cleaned_spotify_data.parquet")
-        print("   • data/processed/X_train.parquet, X_test.parquet")
+        print("   • data/processed/ml_feature_store/ (ML features and target)")
+        print("   • data/processed/splits/feature_engineering.json (train/test rows)")
         print("   • outputs/models/xgboost_popularity_model.joblib")
 
         print("\n🚀 Ready to launch dashboard!")
@@ -0,0 +1,149 @@
+"""
+One-Pass Column Statistics
+
+Computes missing count, mean, std, min, max and an approximate distinct
+count of every column of a numeric matrix in one vectorized pass, instead of
+separate isnull().sum(), mean(), std() and (expensive, sort-based) nunique()
+scans. The statistics are small enough to embed in file metadata (the feature
+store manifest, the cleaned Parquet files), so readers get them without
+scanning any data.
+
+StatisticsAccumulator merges batches (Chan et al. for mean and variance), so
+writers that stream rows record the same statistics as a single pass.
+Distinct counts use the profiler's HyperLogLog (src/data_profiler.py) with
+2**12 registers per column (about 1.6% standard error); small counts fall
+back to linear counting and are practically exact.
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.data_profiler import HyperLogLog  # noqa: E402
+
+# Parquet metadata key holding the statistics (JSON)
+STATS_METADATA_KEY = b'column_statistics'
+
+# HyperLogLog precision: 2**HLL_PRECISION registers per column
+HLL_PRECISION = 12
+
+
+def statistics_columns(df: pd.DataFrame) -> List[str]:
+    """Numeric and boolean columns of a dataframe, the ones statistics are recorded for"""
+    return [col for col in df.columns
+            if pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col])]
+
+
+class StatisticsAccumulator:
+    """Column statistics of a numeric matrix, updated one batch of rows at a time"""
+
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        n_columns = len(self.columns)
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.missing = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.low = np.full(n_columns, np.inf)
+        self.high = np.full(n_columns, -np.inf)
+        self.distinct = [HyperLogLog(HLL_PRECISION) for _ in self.columns]
+
+    def update(self, values: np.ndarray) -> "StatisticsAccumulator":
+        """
+        Add a batch of rows.
+
+        Args:
+            values: (n_rows, n_columns) numeric array (NaN = missing)
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.columns))
+        missing = np.isnan(values)
+        n = (~missing).sum(axis=0)
+
+        # Batch mean and squared deviations, then the parallel (Chan et al.) update
+        with np.errstate(invalid='ignore', divide='ignore'):
+            batch_mean = np.where(n > 0, np.where(missing, 0.0, values).sum(axis=0) / n, 0.0)
+        deviations = np.where(missing, 0.0, values - batch_mean)
+        batch_m2 = np.einsum('ij,ij->j', deviations, deviations)
+        total = self.count + n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, n / total, 0.0)
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + batch_m2 + delta * delta * self.count * weight
+        self.count = total
+        self.missing += missing.sum(axis=0)
+
+        self.low = np.minimum(self.low,
+                              np.where(missing, np.inf, values).min(axis=0, initial=np.inf))
+        self.high = np.maximum(self.high,
+                               np.where(missing, -np.inf, values).max(axis=0, initial=-np.inf))
+        # -0.0 and 0.0 are the same value; NaN is not a value
+        for i, sketch in enumerate(self.distinct):
+            sketch.update(pd.util.hash_array(values[~missing[:, i], i] + 0.0))
+        return self
+
+    def update_frame(self, df: pd.DataFrame) -> "StatisticsAccumulator":
+        """Add the accumulator's columns of a dataframe"""
+        return self.update(df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def to_dict(self) -> Dict[str, Dict[str, object]]:
+        """
+        Column -> {'missing', 'mean', 'std', 'min', 'max', 'distinct'};
+        mean/std/min/max are None for columns with no values
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+
+        def number(value, valid):
+            return float(value) if valid and np.isfinite(value) else None
+
+        return {
+            col: {
+                'missing': int(self.missing[i]),
+                'mean': number(self.mean[i], self.count[i] > 0),
+                'std': number(std[i], self.count[i] > 1),
+                'min': number(self.low[i], self.count[i] > 0),
+                'max': number(self.high[i], self.count[i] > 0),
+                'distinct': int(min(self.distinct[i].count(), self.count[i])),
+            }
+            for i, col in enumerate(self.columns)
+        }
+
+
+def column_statistics(values: np.ndarray, columns: List[str]) -> Dict[str, Dict[str, object]]:
+    """
+    Statistics of each column of a numeric matrix in one pass.
+
+    Args:
+        values: (n_rows, n_columns) numeric array (NaN = missing)
+        columns: Column names
+
+    Returns:
+        Column -> {'missing', 'mean', 'std', 'min', 'max', 'distinct'};
+        mean/std/min/max are None for columns with no values
+    """
+    return StatisticsAccumulator(columns).update(values).to_dict()
+
+
+def frame_statistics(df: pd.DataFrame) -> Dict[str, Dict[str, object]]:
+    """column_statistics() of the numeric and boolean columns of a dataframe"""
+    return StatisticsAccumulator(statistics_columns(df)).update_frame(df).to_dict()
+
+
+def statistics_frame(statistics: Dict[str, Dict[str, object]]) -> pd.DataFrame:
+    """Statistics as a dataframe with one row per column"""
+    return pd.DataFrame.from_dict(statistics, orient='index').rename_axis('feature').reset_index()
+
+
+def read_parquet_statistics(path: str) -> pd.DataFrame:
+    """Column statistics embedded in a Parquet file's key-value metadata (no data is read)"""
+    metadata = pq.read_metadata(path).metadata or {}
+    if STATS_METADATA_KEY not in metadata:
+        raise KeyError(f"{path} has no embedded column statistics")
+    return statistics_frame(json.loads(metadata[STATS_METADATA_KEY]))
@@ -0,0 +1,270 @@
+"""
+Single-Pass Data Quality Profiler
+
+Profiles a dataframe in one columnar pass using mergeable sketches:
+- Null and non-null counts per column
+- HyperLogLog distinct counts
+- Approximate quantiles (compactor sketch) plus exact min/max/mean/std
+
+Profiles of chunks or partitions can be merged, so a large dataset can be
+profiled piece by piece and combined into one data quality report.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch over 64-bit hashes"""
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        """Add an array of uint64 hashes"""
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+
+        # Rank = position of the leftmost 1-bit in the remaining 64 - p bits
+        rest_bits = 64 - self.p
+        rest = (hashes & np.uint64((1 << rest_bits) - 1)).astype(np.float64)
+        _, bit_length = np.frexp(rest)
+        rank = (rest_bits + 1 - bit_length).astype(np.uint8)
+
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Return the union of two sketches"""
+        if self.p != other.p:
+            raise ValueError(f"Cannot merge HyperLogLog sketches with p={self.p} and p={other.p}")
+        merged = HyperLogLog(self.p)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def count(self) -> int:
+        """Estimated number of distinct hashes"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+
+        # Small-range correction (linear counting)
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class QuantileSketch:
+    """
+    Mergeable approximate quantile sketch.
+
+    Values are kept in levels of bounded size; an item at level i stands for
+    2**i original values. When a level overflows it is sorted and every other
+    item is promoted to the next level, so memory grows with log(n) only.
+    """
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.levels: List[np.ndarray] = []
+        self._compactions = 0
+
+    def update(self, values: np.ndarray):
+        """Add an array of non-null numeric values"""
+        if len(values) == 0:
+            return
+        self._append(0, np.asarray(values, dtype=np.float64))
+        self._compress()
+
+    def _append(self, level: int, values: np.ndarray):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0, dtype=np.float64))
+        self.levels[level] = np.concatenate([self.levels[level], values])
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            buffer = self.levels[level]
+            if len(buffer) > self.k:
+                buffer = np.sort(buffer)
+                n = len(buffer) - (len(buffer) % 2)
+                offset = self._compactions % 2
+                self._compactions += 1
+                self.levels[level] = buffer[n:]
+                self._append(level + 1, buffer[offset:n:2])
+            level += 1
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Return a sketch summarizing both inputs"""
+        merged = QuantileSketch(self.k)
+        merged._compactions = self._compactions + other._compactions
+        for level in range(max(len(self.levels), len(other.levels))):
+            for sketch in (self, other):
+                if level < len(sketch.levels):
+                    merged._append(level, sketch.levels[level])
+        merged._compress()
+        return merged
+
+    def quantiles(self, qs: List[float]) -> List[float]:
+        """Approximate quantiles for the given fractions"""
+        if not self.levels or not any(len(level) for level in self.levels):
+            return [np.nan] * len(qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** i)
+                                  for i, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+        positions = np.searchsorted(cumulative, np.asarray(qs) * cumulative[-1], side='left')
+        return values[np.minimum(positions, len(values) - 1)].tolist()
+
+
+@dataclass
+class ColumnProfile:
+    """Mergeable summary of one column"""
+    dtype: str
+    count: int = 0
+    nulls: int = 0
+    memory_bytes: int = 0
+    distinct: HyperLogLog = field(default_factory=HyperLogLog)
+    quantiles: Optional[QuantileSketch] = None
+    min: float = np.nan
+    max: float = np.nan
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.quantiles is not None
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        """Combine two profiles of the same column"""
+        count = self.count + other.count
+        merged = ColumnProfile(
+            dtype=self.dtype if self.dtype == other.dtype else 'object',
+            count=count,
+            nulls=self.nulls + other.nulls,
+            memory_bytes=self.memory_bytes + other.memory_bytes,
+            distinct=self.distinct.merge(other.distinct),
+        )
+        if self.is_numeric and other.is_numeric:
+            # Chan et al. parallel update of mean and sum of squared deviations
+            delta = other.mean - self.mean
+            merged.quantiles = self.quantiles.merge(other.quantiles)
+            merged.min = np.nanmin([self.min, other.min]) if count else np.nan
+            merged.max = np.nanmax([self.max, other.max]) if count else np.nan
+            merged.mean = self.mean + delta * other.count / count if count else 0.0
+            merged.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / count \
+                if count else 0.0
+        return merged
+
+
+def _hash_column(series: pd.Series) -> np.ndarray:
+    return pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+
+
+@dataclass
+class DataProfile:
+    """Mergeable single-pass profile of a dataframe"""
+    rows: int
+    columns: Dict[str, ColumnProfile]
+    duplicates: int = 0
+    distinct_rows: HyperLogLog = field(default_factory=HyperLogLog)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DataProfile":
+        """
+        Profile a dataframe, visiting each column once.
+
+        Column hashes feed both the per-column distinct counts and a combined
+        row hash, which gives the exact number of duplicate rows in this frame.
+        """
+        columns = {}
+        row_hash = np.zeros(len(df), dtype=np.uint64)
+
+        for name in df.columns:
+            series = df[name]
+            null_mask = series.isna().to_numpy()
+            hashes = _hash_column(series)
+
+            profile = ColumnProfile(
+                dtype=str(series.dtype),
+                count=int(len(series) - null_mask.sum()),
+                nulls=int(null_mask.sum()),
+                memory_bytes=int(series.memory_usage(index=False, deep=True)),
+            )
+            profile.distinct.update(hashes[~null_mask])
+
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)[~null_mask]
+                profile.quantiles = QuantileSketch()
+                profile.quantiles.update(values)
+                if len(values):
+                    profile.min = float(values.min())
+                    profile.max = float(values.max())
+                    profile.mean = float(values.mean())
+                    profile.m2 = float(((values - profile.mean) ** 2).sum())
+
+            columns[name] = profile
+            row_hash = (row_hash * np.uint64(1_000_003)) ^ hashes
+
+        profile = cls(rows=len(df), columns=columns)
+        profile.distinct_rows.update(row_hash)
+        if len(row_hash):
+            profile.duplicates = int(len(row_hash) - len(np.unique(row_hash)))
+        return profile
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        """
+        Combine profiles of two chunks/partitions.
+
+        Duplicate rows are counted within each input; use distinct_rows for an
+        approximate count across inputs.
+        """
+        columns = dict(self.columns)
+        for name, profile in other.columns.items():
+            columns[name] = columns[name].merge(profile) if name in columns else profile
+        return DataProfile(
+            rows=self.rows + other.rows,
+            columns=columns,
+            duplicates=self.duplicates + other.duplicates,
+            distinct_rows=self.distinct_rows.merge(other.distinct_rows),
+        )
+
+    def to_report(self) -> dict:
+        """Data quality report in the format of SpotifyETL.data_quality_report()"""
+        numeric_stats = {}
+        for name, col in self.columns.items():
+            if not col.is_numeric:
+                continue
+            q25, q50, q75 = col.quantiles.quantiles([0.25, 0.5, 0.75])
+            numeric_stats[name] = {
+                'count': float(col.count),
+                'mean': col.mean if col.count else np.nan,
+                'std': math.sqrt(col.m2 / (col.count - 1)) if col.count > 1 else np.nan,
+                'min': col.min,
+                '25%': q25,
+                '50%': q50,
+                '75%': q75,
+                'max': col.max,
+            }
+
+        return {
+            'total_rows': self.rows,
+            'total_columns': len(self.columns),
+            'columns': list(self.columns),
+            'duplicates': self.duplicates,
+            'missing_values': {name: col.nulls for name, col in self.columns.items()},
+            'dtypes': {name: col.dtype for name, col in self.columns.items()},
+            'numeric_columns': [name for name, col in self.columns.items() if col.is_numeric],
+            'categorical_columns': [name for name, col in self.columns.items()
+                                    if col.dtype in ('object', 'string', 'category')],
+            'distinct_counts': {name: col.distinct.count() for name, col in self.columns.items()},
+            'numeric_stats': numeric_stats,
+            'memory_usage_mb': sum(col.memory_bytes for col in self.columns.values()) / 1024**2,
+        }
@@ -21,8 +21,12 @@ from pathlib import Path
 import time
 from tqdm import tqdm
 import json
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.feature_engineering import ARTIST_SEPARATORS  # noqa: E402
+
 # Load environment variables
 load_dotenv()
 
@@ -33,18 +37,18 @@ client_credentials_manager = SpotifyClientCredentials(
 )
 sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
 
-print("="*80)
+print("=" * 80)
 print("🎵 SPOTIFY ARTIST FEATURE ENRICHMENT")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print()
 
 # ============================================================================
 # STEP 1: Load Dataset
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📂 STEP 1: LOAD DATASET")
-print("="*80)
+print("=" * 80)
 
 df = pd.read_parquet('data/processed/cleaned_spotify_data.parquet')
 print(f"✓ Loaded {len(df):,} tracks")
@@ -54,9 +58,9 @@ print()
 # ============================================================================
 # STEP 2: Extract Unique Artists
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎤 STEP 2: EXTRACT UNIQUE ARTISTS")
-print("="*80)
+print("=" * 80)
 
 # Get unique artist names (handle multiple artists per track)
 all_artists = df['artists'].dropna().unique()
@@ -66,7 +70,7 @@ print(f"✓ Found {len(all_artists):,} unique artist names/combinations")
 unique_artists = set()
 for artist_combo in all_artists:
     # Handle various separators
-    for separator in [',', ';', '&', ' and ', ' feat. ', ' ft. ']:
+    for separator in ARTIST_SEPARATORS:
         artist_combo = artist_combo.replace(separator, ',')
 
     # Split and clean
@@ -81,9 +85,9 @@ print()
 # ============================================================================
 # STEP 3: Fetch Artist Metadata from Spotify API
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🌐 STEP 3: FETCH ARTIST METADATA FROM SPOTIFY API")
-print("="*80)
+print("=" * 80)
 
 # Check for existing cache
 cache_file = Path('data/processed/artist_metadata_cache.json')
@@ -171,9 +175,9 @@ print()
 # ============================================================================
 # STEP 4: Create Artist Features Dataframe
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 STEP 4: CREATE ARTIST FEATURES DATAFRAME")
-print("="*80)
+print("=" * 80)
 
 artist_df = pd.DataFrame(artist_metadata)
 
@@ -182,7 +186,8 @@ if len(artist_df) > 0:
     print(f"✓ Columns: {list(artist_df.columns)}")
     print()
     print("Summary statistics:")
-    print(artist_df[['artist_followers', 'artist_popularity', 'artist_genre_count', 'artist_album_count']].describe())
+    print(artist_df[['artist_followers', 'artist_popularity', 'artist_genre_count',
+                     'artist_album_count']].describe())
     print()
 else:
     print("❌ No artist data fetched!")
@@ -191,24 +196,27 @@ else:
 # ============================================================================
 # STEP 5: Enrich Original Dataset
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🔗 STEP 5: ENRICH ORIGINAL DATASET WITH ARTIST FEATURES")
-print("="*80)
+print("=" * 80)
 
 # Handle tracks with multiple artists - use primary artist (first one)
+
+
 def get_primary_artist(artist_combo):
     """Extract primary (first) artist from artist combination"""
     if pd.isna(artist_combo):
         return None
 
     # Handle various separators
-    for separator in [',', ';', '&', ' and ', ' feat. ', ' ft. ']:
+    for separator in ARTIST_SEPARATORS:
         artist_combo = artist_combo.replace(separator, ',')
 
     # Return first artist
     artists = [a.strip() for a in artist_combo.split(',')]
     return artists[0] if artists else None
 
+
 df['primary_artist'] = df['artists'].apply(get_primary_artist)
 
 # Merge artist features
@@ -219,7 +227,7 @@ df_enriched = df.merge(
     how='left'
 )
 
-print(f"✓ Merged artist features")
+print("✓ Merged artist features")
 print(f"✓ New dataframe shape: {df_enriched.shape}")
 print()
 
@@ -228,9 +236,9 @@ matched = df_enriched['artist_followers'].notna().sum()
 total = len(df_enriched)
 match_rate = matched / total * 100
 
-print(f"Match Statistics:")
+print("Match Statistics:")
 print(f"  Matched: {matched:,} / {total:,} ({match_rate:.1f}%)")
-print(f"  Unmatched: {total - matched:,} ({100-match_rate:.1f}%)")
+print(f"  Unmatched: {total - matched:,} ({100 - match_rate:.1f}%)")
 print()
 
 # Fill missing artist features with defaults
@@ -250,9 +258,9 @@ print()
 # ============================================================================
 # STEP 6: Feature Engineering
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🛠️  STEP 6: FEATURE ENGINEERING")
-print("="*80)
+print("=" * 80)
 
 # Log-transform followers (highly skewed)
 df_enriched['artist_followers_log'] = np.log1p(df_enriched['artist_followers'])
@@ -281,9 +289,9 @@ print()
 # ============================================================================
 # STEP 7: Save Enriched Dataset
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("💾 STEP 7: SAVE ENRICHED DATASET")
-print("="*80)
+print("=" * 80)
 
 output_file = 'data/processed/cleaned_spotify_data_with_artists.parquet'
 df_enriched.to_parquet(output_file, index=False)
@@ -296,9 +304,9 @@ print()
 # ============================================================================
 # STEP 8: Summary Report
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📈 SUMMARY REPORT")
-print("="*80)
+print("=" * 80)
 
 print(f"""
 Dataset Statistics:
@@ -331,6 +339,6 @@ Next Steps:
   4. Update dashboards with enriched model
 """)
 
-print("="*80)
+print("=" * 80)
 print(f"✅ ENRICHMENT COMPLETE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
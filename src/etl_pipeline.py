@@ -3,31 +3,270 @@ ETL Pipeline for Spotify Track Analytics
 Extracts, transforms, and loads Spotify dataset for analysis
 """
 
+import os
+import sys
+import io
+import ast
+import shutil
+import json
+import itertools
+import time
+import hashlib
+from contextlib import contextmanager
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import logging
 
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.fingerprint_index import AUDIO_FEATURES, FingerprintIndex, fingerprint  # noqa: E402
+from src.data_profiler import DataProfile  # noqa: E402
+from src.near_duplicates import near_duplicate_mask  # noqa: E402
+from src.imputation_stats import STATS_FILE, ImputationStats  # noqa: E402
+from src.feature_store import MANIFEST_FILE, STORE_DIR, build_feature_store  # noqa: E402
+from src.validation import DEFAULT_RULES, STRICT_RULES, ValidationRule, validate  # noqa: E402
+from src.column_stats import (STATS_METADATA_KEY, StatisticsAccumulator,  # noqa: E402
+                              frame_statistics, statistics_columns)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# Mood/energy labels, in the (alphabetical) category order one-hot encoding relies on
+MOOD_LABELS = ['Chill/Happy', 'Energetic/Sad', 'Happy/High Energy', 'Sad/Low Energy']
+
+# Default number of raw rows held in memory at once in streaming mode
+DEFAULT_CHUNKSIZE = 100_000
+
+# Declared types of the raw Kaggle export, used by the Arrow CSV reader so no
+# type inference is needed. Columns not listed are inferred.
+RAW_SCHEMA = {
+    'Unnamed: 0': pa.int64(),
+    'track_id': pa.string(),
+    'artists': pa.string(),
+    'album_name': pa.string(),
+    'track_name': pa.string(),
+    'popularity': pa.int64(),
+    'duration_ms': pa.int64(),
+    'explicit': pa.bool_(),
+    'danceability': pa.float64(),
+    'energy': pa.float64(),
+    'key': pa.int64(),
+    'loudness': pa.float64(),
+    'mode': pa.int64(),
+    'speechiness': pa.float64(),
+    'acousticness': pa.float64(),
+    'instrumentalness': pa.float64(),
+    'liveness': pa.float64(),
+    'valence': pa.float64(),
+    'tempo': pa.float64(),
+    'time_signature': pa.int64(),
+    'track_genre': pa.string(),
+}
+
+# Raw files picked up when the raw path is a directory (compressed files are
+# decompressed transparently by the Arrow reader)
+RAW_FILE_PATTERNS = ["*.csv", "*.csv.gz", "*.csv.zst"]
+
+# Declared storage dtypes of the cleaned dataset, enforced in the load step.
+# Columns not listed keep their inferred dtype.
+CLEANED_SCHEMA = {
+    'Unnamed: 0': 'int32',
+    'popularity': 'int8',
+    'duration_ms': 'int32',
+    'explicit': 'bool',
+    'danceability': 'float32',
+    'energy': 'float32',
+    'key': 'int8',
+    'loudness': 'float32',
+    'mode': 'int8',
+    'speechiness': 'float32',
+    'acousticness': 'float32',
+    'instrumentalness': 'float32',
+    'liveness': 'float32',
+    'valence': 'float32',
+    'tempo': 'float32',
+    'time_signature': 'int8',
+    'duration_min': 'float32',
+    'track_genre': 'category',
+    'artists': 'category',
+    'album_name': 'category',
+    'mood_energy': 'category',
+}
+
+# Row-group bounds for the genre-partitioned dataset: large enough for efficient
+# scans, small enough that popularity statistics let readers skip groups
+PARTITION_MAX_ROWS_PER_GROUP = 64 * 1024
+PARTITION_MIN_ROWS_PER_GROUP = 8 * 1024
+
+# Per-stage timing/memory records of each run are appended here (JSON Lines),
+# next to data_quality_report.txt
+RUN_LOG_FILE = "etl_run_log.jsonl"
+
+# Delta-mode bookkeeping files inside the partitioned dataset directory.
+# The leading underscore makes Parquet dataset readers skip them.
+DELTA_STATE_FILE = "_etl_state.json"
+DELTA_FINGERPRINT_FILE = "_audio_fingerprints.parquet"
+
+# Bytes before a watermark that are hashed to detect rewritten raw files
+WATERMARK_TAIL_BYTES = 64 * 1024
+
+# Rows failing validation are written here (next to the outputs) instead of
+# aborting the run; delta runs write parts under <dataset>/_quarantine/
+QUARANTINE_FILE = "quarantine.parquet"
+
+# Batch runs whose raw input, configuration and code are unchanged reuse the
+# outputs recorded in this file (next to the outputs)
+CACHE_FILE = "_etl_cache.json"
+
+
 class SpotifyETL:
     """ETL pipeline for Spotify track analytics"""
 
-    def __init__(self, raw_data_path: str = "data/raw/dataset.csv"):
+    def __init__(self, raw_data_path: str = "data/raw/dataset.csv",
+                 fingerprint_index_path: str = None, stats_path: str = None):
         self.raw_data_path = Path(raw_data_path)
+        self.fingerprint_index_path = Path(fingerprint_index_path) \
+            if fingerprint_index_path else None
+        self.fingerprint_index = None
+        # Imputation stats artifact (default: imputation_stats.json next to the outputs)
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.imputation_stats = None
+        self.profile = None
+        self.schema_memory = None
+        self.stage_metrics = {}
+        # Validation rules, and the rows that failed them in this run
+        self.validation_rules = list(DEFAULT_RULES)
+        self.quarantine = []
         self.df = None
 
-    def extract(self) -> pd.DataFrame:
-        """Extract data from CSV file"""
+    @contextmanager
+    def _stage(self, name: str, rows_in: int = None):
+        """
+        Record wall time, CPU time, memory and rows in/out of a pipeline stage.
+
+        Memory is recorded as rss_growth_mb, the change in this process's
+        current RSS over the stage (the largest change for repeated stages),
+        and as the high-water marks at the end of the stage:
+        process_peak_rss_mb for this process and workers_peak_rss_mb for the
+        largest finished worker process (e.g. of transform_parallel), both
+        over the process lifetime rather than the stage.
+
+        Rows are read from self.df before and after the stage unless rows_in is
+        given. Repeated stages (e.g. one per chunk in streaming mode) are
+        accumulated under the same name.
+        """
+        if rows_in is None:
+            rows_in = len(self.df) if self.df is not None else 0
+        rss_start = _current_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            rows_out = len(self.df) if self.df is not None else 0
+            rss_end = _current_rss_mb()
+
+            metrics = self.stage_metrics.setdefault(name, {
+                'stage': name, 'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rss_growth_mb': None,
+                'process_peak_rss_mb': None, 'workers_peak_rss_mb': None,
+                'rows_in': 0, 'rows_out': 0,
+            })
+            metrics['calls'] += 1
+            metrics['wall_s'] += wall
+            metrics['cpu_s'] += cpu
+            if rss_start is not None and rss_end is not None:
+                metrics['rss_growth_mb'] = max(rss_end - rss_start, metrics['rss_growth_mb'] or 0.0)
+            metrics['process_peak_rss_mb'] = _peak_rss_mb()
+            metrics['workers_peak_rss_mb'] = _peak_rss_mb(children=True)
+            metrics['rows_in'] += rows_in
+            metrics['rows_out'] += rows_out
+            logger.debug(f"Stage {name}: {wall:.3f}s wall, {cpu:.3f}s CPU, "
+                         f"{rows_in:,} -> {rows_out:,} rows")
+
+    def _save_run_log(self, log_dir: Path, mode: str, quarantined_rows: int = None) -> Path:
+        """
+        Append this run's stage metrics as one JSON line to RUN_LOG_FILE.
+
+        quarantined_rows defaults to the rows held in self.quarantine (runs
+        that write them out as they go pass their count).
+        """
+        log_path = Path(log_dir) / RUN_LOG_FILE
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'mode': mode,
+            'raw_data_path': str(self.raw_data_path),
+            'total_wall_s': sum(m['wall_s'] for m in self.stage_metrics.values()),
+            'process_peak_rss_mb': _peak_rss_mb(),
+            'workers_peak_rss_mb': _peak_rss_mb(children=True),
+            'quarantined_rows': quarantined_rows if quarantined_rows is not None
+            else sum(len(q) for q in self.quarantine),
+            'stages': list(self.stage_metrics.values()),
+        }
+        with open(log_path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+
+        slowest = max(self.stage_metrics.values(), key=lambda m: m['wall_s'], default=None)
+        if slowest:
+            logger.info(f"Run log appended to {log_path} (slowest stage: {slowest['stage']}, "
+                        f"{slowest['wall_s']:.2f}s)")
+        return log_path
+
+    def extract(self, columns: List[str] = None, engine: str = 'arrow') -> pd.DataFrame:
+        """
+        Extract data from the raw CSV file(s).
+
+        The default 'arrow' engine uses pyarrow's multithreaded CSV parser with
+        the declared RAW_SCHEMA, reads only the requested columns, transparently
+        decompresses .gz/.zst files and, when the raw path is a directory,
+        decodes all raw files in parallel. Missing values come back as NaN, as
+        with pd.read_csv, and requested columns a raw file lacks are read as
+        all-missing (with a warning). engine='pandas' keeps the original
+        pd.read_csv path for single files.
+
+        Args:
+            columns: Only read these columns (default: all)
+            engine: 'arrow' or 'pandas'
+        """
+        if engine not in ('arrow', 'pandas'):
+            raise ValueError(f"engine must be 'arrow' or 'pandas', got {engine!r}")
         logger.info(f"Extracting data from {self.raw_data_path}")
 
         try:
-            self.df = pd.read_csv(self.raw_data_path)
-            logger.info(f"Successfully loaded {len(self.df):,} records with {len(self.df.columns)} columns")
+            if engine == 'pandas':
+                self.df = pd.read_csv(self.raw_data_path, usecols=columns)
+            else:
+                files = self._raw_files(RAW_FILE_PATTERNS)
+                if not files:
+                    raise FileNotFoundError(f"No raw CSV files found in {self.raw_data_path}")
+                with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as pool:
+                    tables = list(pool.map(lambda path: self._read_csv_arrow(path, columns), files))
+                table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+                self.df = table.to_pandas()
+                # Arrow gives None for missing strings; use NaN like pd.read_csv
+                text = self.df.select_dtypes('object').columns
+                self.df[text] = self.df[text].where(self.df[text].notna(), np.nan)
+                if len(files) > 1:
+                    logger.info(f"Decoded {len(files)} raw files in parallel")
+            self.profile = None
+            logger.info(f"Successfully loaded {len(self.df):,} records "
+                        f"with {len(self.df.columns)} columns")
             return self.df
         except FileNotFoundError:
             logger.error(f"File not found: {self.raw_data_path}")
@@ -36,78 +275,314 @@ class SpotifyETL:
             logger.error(f"Error loading data: {e}")
             raise
 
+    @staticmethod
+    def _read_csv_arrow(path: Path, columns: List[str] = None) -> pa.Table:
+        """Read one raw CSV with the multithreaded Arrow parser and declared types"""
+        convert_options = pv.ConvertOptions(
+            column_types=RAW_SCHEMA,
+            include_columns=columns,
+            include_missing_columns=True,
+            strings_can_be_null=True,
+        )
+        if columns:
+            with pv.open_csv(path) as reader:
+                missing = [col for col in columns if col not in reader.schema.names]
+            if missing:
+                logger.warning(f"{path.name} has no column(s) {missing} - reading them as missing")
+        return pv.read_csv(path, read_options=pv.ReadOptions(use_threads=True),
+                           convert_options=convert_options)
+
+    def extract_chunks(self, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+        """Extract data from CSV file in bounded-size chunks"""
+        logger.info(f"Streaming data from {self.raw_data_path} in chunks of {chunksize:,} rows")
+
+        if not self.raw_data_path.exists():
+            logger.error(f"File not found: {self.raw_data_path}")
+            raise FileNotFoundError(self.raw_data_path)
+
+        with pd.read_csv(self.raw_data_path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+
     def data_quality_report(self) -> dict:
-        """Generate comprehensive data quality report"""
-        logger.info("Generating data quality report...")
-
-        report = {
-            'total_rows': len(self.df),
-            'total_columns': len(self.df.columns),
-            'columns': list(self.df.columns),
-            'duplicates': self.df.duplicated().sum(),
-            'missing_values': self.df.isnull().sum().to_dict(),
-            'dtypes': self.df.dtypes.astype(str).to_dict(),
-            'numeric_columns': self.df.select_dtypes(include=[np.number]).columns.tolist(),
-            'categorical_columns': self.df.select_dtypes(include=['object']).columns.tolist(),
-        }
+        """
+        Generate comprehensive data quality report.
 
-        # Basic statistics
-        report['numeric_stats'] = self.df.describe().to_dict()
+        The report comes from a single-pass DataProfile of self.df, cached in
+        self.profile until the data changes (extract/transform reset it).
+        """
+        if self.profile is None:
+            logger.info("Generating data quality report...")
+            self.profile = DataProfile.from_frame(self.df)
 
-        # Memory usage
-        report['memory_usage_mb'] = self.df.memory_usage(deep=True).sum() / 1024**2
+        report = self.profile.to_report()
+        if self.schema_memory:
+            report['memory_before_schema_mb'] = self.schema_memory['before_mb']
 
         logger.info(f"Found {report['duplicates']} duplicate rows")
         logger.info(f"Total missing values: {sum(report['missing_values'].values())}")
 
         return report
 
-    def transform(self) -> pd.DataFrame:
-        """Transform and clean the dataset"""
+    def transform(self, fill_values: Dict[str, object] = None,
+                  copy_free: bool = True) -> pd.DataFrame:
+        """
+        Transform and clean the dataset.
+
+        Args:
+            fill_values: Imputation value per column; taken from the loaded
+                imputation stats, or computed from the data (median/mode)
+                when there are none
+            copy_free: Compute one keep-mask for all row filters and
+                materialize the cleaned frame once (see _filter_rows). With
+                False each filter step builds its own intermediate frame.
+        """
         logger.info("Starting data transformation...")
+        self.profile = None
+        initial_rows = len(self.df)
+        if fill_values is None and self.imputation_stats is not None:
+            fill_values = self.imputation_stats.fill_values
+
+        if copy_free:
+            # 1-4. Duplicates, zero popularity and imputation in one materialization
+            with self._stage('transform.filter'):
+                exact_dups_removed, audio_dups_removed, zero_pop_removed = \
+                    self._filter_rows(fill_values)
+        else:
+            # 1. Remove exact duplicates (all columns identical)
+            with self._stage('transform.exact_duplicates'):
+                self.df = self.df.drop_duplicates()
+            exact_dups_removed = initial_rows - len(self.df)
+            logger.info(f"Removed {exact_dups_removed:,} exact duplicate rows")
+
+            # 2. Remove audio feature duplicates (same track, different metadata)
+            with self._stage('transform.audio_duplicates'):
+                audio_dups_removed = self._remove_audio_feature_duplicates()
+
+            # 3. Remove zero-popularity tracks (catalog artifacts)
+            with self._stage('transform.zero_popularity'):
+                zero_pop_removed = self._remove_zero_popularity_tracks()
+
+            # 4. Handle missing values
+            with self._stage('transform.impute'):
+                self._impute_missing(fill_values)
+
+        # 5. Feature engineering
+        with self._stage('transform.features'):
+            self._engineer_features()
+
+        # 6. Data validation (failing rows are quarantined)
+        with self._stage('validate'):
+            quarantined = self._validate_data()
+
+        # 7. Summary of cleaning
+        total_removed = exact_dups_removed + audio_dups_removed + zero_pop_removed + quarantined
+        logger.info(f"Total rows removed: {total_removed:,} "
+                    f"({total_removed / initial_rows * 100:.2f}%)")
+        logger.info(f"Final dataset: {len(self.df):,} tracks")
+        logger.info("Data transformation complete")
+        return self.df
+
+    def transform_parallel(self, n_workers: int = None, shard_by: str = 'track_id',
+                           n_shards: int = None) -> pd.DataFrame:
+        """
+        Transform and clean the dataset in a process pool.
+
+        The data is sharded by genre or by a hash of track_id, so exact
+        duplicates always land in the same shard. The work runs in two passes
+        so the result matches transform():
+
+        1. Each shard removes its exact/audio duplicates and zero-popularity
+           tracks without filling missing values. The shards are merged in the
+           original row order and a global dedup over audio fingerprints
+           removes duplicates that crossed shards, keeping the most popular
+           version.
+        2. Imputation values are computed once from the deduplicated rows (or
+           taken from the imputation stats), then contiguous slices of the
+           popularity-sorted rows are filled, feature-engineered and
+           validated in the pool and concatenated in order.
+
+        Args:
+            n_workers: Number of worker processes (default: CPU count)
+            shard_by: 'track_id' (hash shards) or 'track_genre'
+            n_shards: Number of hash shards (default: 4 per worker)
 
-        # 1. Remove exact duplicates (all columns identical)
+        Returns:
+            Transformed dataframe, sorted by popularity (descending)
+        """
+        if shard_by not in ('track_id', 'track_genre'):
+            raise ValueError(f"shard_by must be 'track_id' or 'track_genre', got {shard_by!r}")
+
+        n_workers = n_workers or os.cpu_count()
+        n_shards = n_shards or n_workers * 4
+        logger.info(f"Starting parallel data transformation ({n_workers} workers, "
+                    f"sharded by {shard_by})...")
+        self.profile = None
         initial_rows = len(self.df)
-        self.df = self.df.drop_duplicates()
-        exact_dups_removed = initial_rows - len(self.df)
+
+        if shard_by == 'track_genre':
+            shard_keys = pd.factorize(self.df['track_genre'], sort=True)[0]
+        else:
+            track_hashes = pd.util.hash_pandas_object(self.df['track_id'], index=False).to_numpy()
+            shard_keys = track_hashes % np.uint64(n_shards)
+        shards = [shard for _, shard in self.df.groupby(shard_keys, sort=True)]
+        self.df = None
+        logger.info(f"Split {initial_rows:,} rows into {len(shards)} shards")
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            # Pass 1: per-shard row filters, then the global audio-feature dedup
+            merged = pd.concat(pool.map(_filter_shard, shards)).sort_index(kind='stable')
+            del shards
+            available_features = [f for f in AUDIO_FEATURES if f in merged.columns]
+            shard_rows = len(merged)
+            if available_features:
+                fingerprints = FingerprintIndex(features=available_features)
+                merged, _ = fingerprints.deduplicate(merged, keep='popular')
+            logger.info(f"Removed {shard_rows - len(merged):,} audio feature duplicates "
+                        "across shards")
+            if 'popularity' in merged.columns:
+                merged = merged.sort_values('popularity', ascending=False, kind='stable')
+
+            # Pass 2: imputation values of the deduplicated rows, as transform() computes them
+            if self.imputation_stats is not None:
+                fill_values = self.imputation_stats.fill_values
+            else:
+                fill_values = self._compute_fill_values(
+                    merged, merged.columns[merged.isnull().any()].tolist())
+            slices = [merged.iloc[rows] for rows in
+                      np.array_split(np.arange(len(merged)), max(1, min(n_shards, len(merged))))]
+            del merged
+            results = list(pool.map(_transform_shard, slices, [fill_values] * len(slices),
+                                    [self.validation_rules] * len(slices)))
+        self.df = pd.concat([df for df, _ in results])
+        for _, quarantine in results:
+            self.quarantine.extend(quarantine)
+        del slices, results
+
+        total_removed = initial_rows - len(self.df)
+        logger.info(f"Total rows removed: {total_removed:,} "
+                    f"({total_removed / initial_rows * 100:.2f}%)")
+        logger.info(f"Final dataset: {len(self.df):,} tracks")
+        logger.info("Parallel data transformation complete")
+        return self.df
+
+    def _filter_rows(self, fill_values: Dict[str, object] = None) -> Tuple[int, int, int]:
+        """
+        Remove duplicates and zero-popularity tracks and fill missing values,
+        copying the frame once.
+
+        Exact duplicates, audio feature duplicates (most popular version kept,
+        as in _remove_audio_feature_duplicates) and zero-popularity tracks are
+        combined into one keep-mask over the raw rows. Rows are then taken once,
+        sorted by popularity, and only the columns with nulls are filled from a
+        single imputation mapping.
+
+        Args:
+            fill_values: Imputation value per column; defaults to the median/mode
+                of the kept rows
+
+        Returns:
+            Tuple of (exact duplicates, audio duplicates, zero-popularity tracks) removed
+        """
+        df = self.df
+        popularity = df['popularity'].to_numpy() if 'popularity' in df.columns else None
+
+        # 1. Exact duplicates (first occurrence kept)
+        keep = ~df.duplicated().to_numpy()
+        exact_dups_removed = len(df) - int(keep.sum())
         logger.info(f"Removed {exact_dups_removed:,} exact duplicate rows")
 
-        # 2. Remove audio feature duplicates (same track, different metadata)
-        audio_dups_removed = self._remove_audio_feature_duplicates()
+        # 2. Audio feature duplicates: most popular first, then first occurrence
+        audio_dups_removed = 0
+        available_features = [f for f in AUDIO_FEATURES if f in df.columns]
+        if available_features:
+            # Same fingerprint as the cross-shard dedup of transform_parallel()
+            audio_hash = fingerprint(df, available_features)
+
+            candidates = np.flatnonzero(keep)
+            if popularity is not None:
+                candidates = candidates[np.argsort(-popularity[candidates], kind='stable')]
+            _, first = np.unique(audio_hash[candidates], return_index=True)
+            audio_keep = np.zeros(len(df), dtype=bool)
+            audio_keep[candidates[first]] = True
+            audio_dups_removed = int(keep.sum() - audio_keep.sum())
+            keep = audio_keep
+            logger.info(f"Removed {audio_dups_removed:,} audio feature duplicates")
+        else:
+            logger.warning("No audio features found for duplicate detection")
 
-        # 3. Remove zero-popularity tracks (catalog artifacts)
-        zero_pop_removed = self._remove_zero_popularity_tracks()
+        # 3. Zero-popularity tracks (catalog artifacts)
+        zero_pop_removed = 0
+        if popularity is not None:
+            zero_pop_removed = int((keep & ~(popularity > 0)).sum())
+            keep &= popularity > 0
+            logger.info(f"Removed {zero_pop_removed:,} zero-popularity tracks")
+
+        positions = np.flatnonzero(keep)
+        if popularity is not None:
+            positions = positions[np.argsort(-popularity[positions], kind='stable')]
+
+        # 4. One imputation mapping for the columns with nulls among kept rows
+        null_columns = [col for col in df.columns if df[col].isna().to_numpy()[positions].any()]
+        if fill_values is None:
+            fill_values = self._compute_fill_values(df[null_columns].take(positions)) \
+                if null_columns else {}
+        fill_values = {col: fill_values[col] for col in null_columns if col in fill_values}
+
+        self.df = df.take(positions)
+        filled = 0
+        for col, value in fill_values.items():
+            filled += int(self.df[col].isna().sum())
+            self.df[col] = self.df[col].fillna(value)
+        logger.info(f"Filled {filled} missing values")
+
+        return exact_dups_removed, audio_dups_removed, zero_pop_removed
 
-        # 4. Handle missing values
-        missing_before = self.df.isnull().sum().sum()
+    @staticmethod
+    def _compute_fill_values(df: pd.DataFrame, columns: List[str] = None) -> Dict[str, object]:
+        """Median of numeric columns and mode of categorical columns, for imputation"""
+        columns = columns if columns is not None else list(df.columns)
+        fill_values = {}
 
         # Fill numeric columns with median
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            if self.df[col].isnull().sum() > 0:
-                self.df[col].fillna(self.df[col].median(), inplace=True)
+        for col in df[columns].select_dtypes(include=[np.number]).columns:
+            fill_values[col] = df[col].median()
 
         # Fill categorical columns with mode
-        cat_cols = self.df.select_dtypes(include=['object']).columns
-        for col in cat_cols:
-            if self.df[col].isnull().sum() > 0:
-                self.df[col].fillna(self.df[col].mode()[0], inplace=True)
+        for col in df[columns].select_dtypes(include=['object']).columns:
+            mode = df[col].mode()
+            if not mode.empty:
+                fill_values[col] = mode[0]
 
-        missing_after = self.df.isnull().sum().sum()
-        logger.info(f"Filled {missing_before - missing_after} missing values")
+        return fill_values
 
-        # 5. Feature engineering
-        self._engineer_features()
+    def _impute_missing(self, fill_values: Dict[str, object] = None) -> int:
+        """
+        Fill missing values with one fillna mapping.
 
-        # 6. Data validation
-        self._validate_data()
+        Args:
+            fill_values: Imputation value per column; defaults to the median/mode
+                of the columns that contain nulls
 
-        # 7. Summary of cleaning
-        total_removed = exact_dups_removed + audio_dups_removed + zero_pop_removed
-        logger.info(f"Total rows removed: {total_removed:,} ({total_removed/initial_rows*100:.2f}%)")
-        logger.info(f"Final dataset: {len(self.df):,} tracks")
-        logger.info("Data transformation complete")
-        return self.df
+        Returns:
+            Number of values filled
+        """
+        null_counts = self.df.isnull().sum()
+        missing_before = int(null_counts.sum())
+        if missing_before == 0:
+            logger.info("Filled 0 missing values")
+            return 0
+
+        if fill_values is None:
+            fill_values = self._compute_fill_values(self.df,
+                                                    null_counts[null_counts > 0].index.tolist())
+        fill_values = {col: value for col, value in fill_values.items()
+                       if col in self.df.columns and null_counts[col] > 0}
+        self.df = self.df.fillna(fill_values)
+
+        filled = missing_before - int(self.df.isnull().sum().sum())
+        logger.info(f"Filled {filled} missing values")
+        return filled
 
     def _engineer_features(self):
         """Create derived features"""
@@ -120,7 +595,8 @@ class SpotifyETL:
 
         # Mood/Energy classification
         if all(col in self.df.columns for col in ['valence', 'energy']):
-            self.df['mood_energy'] = self.df.apply(self._classify_mood, axis=1)
+            self.df['mood_energy'] = self._classify_mood_vectorized(self.df['valence'],
+                                                                    self.df['energy'])
             logger.info("Created 'mood_energy' classification")
 
         # Energy level categories
@@ -172,6 +648,32 @@ class SpotifyETL:
         else:
             return "Sad/Low Energy"
 
+    @staticmethod
+    def _classify_mood_vectorized(valence: pd.Series, energy: pd.Series) -> pd.Categorical:
+        """
+        Vectorized equivalent of _classify_mood over whole columns.
+
+        Clips both features to [0, 1] and assigns the valence/energy quadrant
+        with array operations, returning a categorical with MOOD_LABELS as
+        categories. Produces the same labels as _classify_mood, including its
+        handling of NaN (min/max leave NaN as 1, i.e. the high side).
+
+        Args:
+            valence: Valence column
+            energy: Energy column
+
+        Returns:
+            Categorical of mood/energy labels aligned with the inputs
+        """
+        valence = np.clip(np.nan_to_num(valence.to_numpy(dtype=float), nan=1.0), 0, 1)
+        energy = np.clip(np.nan_to_num(energy.to_numpy(dtype=float), nan=1.0), 0, 1)
+
+        # Quadrant 0-3 from (high valence, high energy) -> index into MOOD_LABELS
+        quadrant = (valence > 0.5).astype(np.int8) + 2 * (energy > 0.5).astype(np.int8)
+        quadrant_to_code = np.array([3, 0, 1, 2], dtype=np.int8)
+
+        return pd.Categorical.from_codes(quadrant_to_code[quadrant], categories=MOOD_LABELS)
+
     def _remove_audio_feature_duplicates(self) -> int:
         """
         Remove tracks with identical audio features (catalog duplicates).
@@ -182,14 +684,8 @@ class SpotifyETL:
         """
         logger.info("Identifying audio feature duplicates...")
 
-        # Define audio features to check for duplicates
-        audio_features = [
-            'danceability', 'energy', 'loudness', 'speechiness',
-            'acousticness', 'instrumentalness', 'liveness', 'valence', 'tempo'
-        ]
-
-        # Only use features that exist in the dataset
-        available_features = [f for f in audio_features if f in self.df.columns]
+        # Only use audio features that exist in the dataset
+        available_features = [f for f in AUDIO_FEATURES if f in self.df.columns]
 
         if not available_features:
             logger.warning("No audio features found for duplicate detection")
@@ -197,24 +693,84 @@ class SpotifyETL:
 
         initial_rows = len(self.df)
 
-        # Sort by popularity (descending) to keep most popular version
+        # Sort by popularity (descending, ties in row order) to keep most popular version
         if 'popularity' in self.df.columns:
-            self.df = self.df.sort_values('popularity', ascending=False)
+            self.df = self.df.sort_values('popularity', ascending=False, kind='stable')
 
-        # Remove duplicates based on audio features, keeping first (most popular)
-        self.df = self.df.drop_duplicates(subset=available_features, keep='first')
+        # Remove duplicates based on audio features, keeping first (most popular);
+        # compared by fingerprint(), as in _filter_rows and the fingerprint index
+        self.df = self.df[~pd.Series(fingerprint(self.df, available_features)).duplicated()
+                          .to_numpy()]
 
         duplicates_removed = initial_rows - len(self.df)
 
         if duplicates_removed > 0:
             logger.info(f"Removed {duplicates_removed:,} audio feature duplicates "
-                       f"({duplicates_removed/initial_rows*100:.2f}%)")
+                        f"({duplicates_removed / initial_rows * 100:.2f}%)")
             logger.info(f"  Features checked: {', '.join(available_features)}")
         else:
             logger.info("No audio feature duplicates found")
 
         return duplicates_removed
 
+    def _remove_near_duplicates(self, tolerance: float) -> int:
+        """
+        Remove tracks whose audio features match another track within tolerance.
+
+        Catches re-releases whose features differ only by float noise, which
+        the exact audio feature dedup misses. Keeps the most popular track of
+        each near-duplicate group (see src/near_duplicates.py).
+
+        Args:
+            tolerance: Maximum per-feature difference, as a fraction of the
+                feature's range
+
+        Returns:
+            Number of near duplicates removed
+        """
+        logger.info(f"Identifying near-duplicate tracks (tolerance {tolerance})...")
+        initial_rows = len(self.df)
+        self.profile = None
+        self.df = self.df[near_duplicate_mask(self.df, tolerance)]
+
+        duplicates_removed = initial_rows - len(self.df)
+        logger.info(f"Removed {duplicates_removed:,} near-duplicate tracks")
+        return duplicates_removed
+
+    def deduplicate_against_index(self, keep: str = 'first') -> int:
+        """
+        Remove audio feature duplicates of the already-cleaned corpus.
+
+        Uses the persistent fingerprint index instead of sorting and scanning
+        the corpus, so the cost is proportional to the size of self.df (plus
+        a linear merge of the new fingerprints into the index).
+
+        Args:
+            keep: 'first' to always keep the indexed track, 'popular' to let
+                more popular new versions replace indexed tracks in the index
+                (the replaced corpus rows are not removed; use
+                FingerprintIndex.deduplicate for their ids)
+
+        Returns:
+            Number of duplicates removed
+        """
+        if self.fingerprint_index is None:
+            if self.fingerprint_index_path and self.fingerprint_index_path.exists():
+                self.fingerprint_index = FingerprintIndex.load(self.fingerprint_index_path)
+            else:
+                self.fingerprint_index = FingerprintIndex(
+                    features=[f for f in AUDIO_FEATURES if f in self.df.columns]
+                )
+
+        initial_rows = len(self.df)
+        self.profile = None
+        self.df, superseded = self.fingerprint_index.deduplicate(self.df, keep=keep)
+
+        duplicates_removed = initial_rows - len(self.df)
+        logger.info(f"Removed {duplicates_removed:,} duplicates of indexed tracks "
+                    f"({len(superseded):,} indexed tracks superseded)")
+        return duplicates_removed
+
     def _remove_zero_popularity_tracks(self) -> int:
         """
         Remove tracks with zero popularity (catalog artifacts with no listener data).
@@ -263,14 +819,24 @@ class SpotifyETL:
 
             logger.info(f"Removed {tracks_removed:,} zero-popularity tracks")
             logger.info(f"  New popularity stats: mean={new_mean:.2f}, "
-                       f"median={new_median:.2f}, std={new_std:.2f}")
-            logger.info(f"  Rationale: Zero-popularity represents catalog artifacts, "
-                       f"not legitimate listener preferences")
+                        f"median={new_median:.2f}, std={new_std:.2f}")
+            logger.info("  Rationale: Zero-popularity represents catalog artifacts, "
+                        "not legitimate listener preferences")
 
         return tracks_removed
 
-    def _validate_data(self):
-        """Validate data quality after transformation"""
+    def _validate_data(self) -> int:
+        """
+        Validate data quality after transformation.
+
+        All rules in self.validation_rules are evaluated in one pass (see
+        src/validation.py). Rows that break any rule are moved to
+        self.quarantine, with a bitmask of the violated rules, and the run
+        continues with the clean rows.
+
+        Returns:
+            Number of rows quarantined
+        """
         logger.info("Validating transformed data...")
 
         # Check for remaining nulls
@@ -279,44 +845,192 @@ class SpotifyETL:
             logger.warning(f"Data still contains {null_counts.sum()} null values")
             logger.warning(f"Columns with nulls: {null_counts[null_counts > 0].to_dict()}")
 
-        # Validate numeric ranges
-        if 'popularity' in self.df.columns:
-            assert self.df['popularity'].between(1, 100).all(), "Popularity out of range [1-100] or contains zeros"
-            assert (self.df['popularity'] == 0).sum() == 0, "Dataset should not contain zero-popularity tracks"
+        result = validate(self.df, self.validation_rules)
+        if result.n_invalid == 0:
+            logger.info("Data validation passed")
+            return 0
 
-        if 'danceability' in self.df.columns:
-            assert self.df['danceability'].between(0, 1).all(), "Danceability out of range [0-1]"
+        invalid = result.invalid
+        bitmask = result.bitmask[invalid]
+        self.quarantine.append(self.df[invalid].assign(
+            violations=bitmask,
+            violated_rules=result.describe(bitmask),
+        ))
+        self.df = self.df[~invalid]
+        self.profile = None
 
-        if 'energy' in self.df.columns:
-            assert self.df['energy'].between(0, 1).all(), "Energy out of range [0-1]"
+        logger.warning(f"Quarantined {result.n_invalid:,} rows failing validation: "
+                       f"{result.counts()}")
+        return result.n_invalid
+
+    def _save_quarantine(self, path: Path) -> Optional[Path]:
+        """
+        Write the quarantined rows of this run to a Parquet file.
+
+        A stale file from an earlier run is removed when nothing was quarantined.
+        """
+        path = Path(path)
+        if not self.quarantine:
+            if path.exists():
+                path.unlink()
+            return None
+
+        quarantine = pd.concat(self.quarantine)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        quarantine.to_parquet(path, index=False)
+        logger.warning(f"Saved {len(quarantine):,} quarantined rows to {path}")
+        return path
+
+    def enforce_schema(self) -> dict:
+        """
+        Cast the cleaned dataset to the compact CLEANED_SCHEMA dtypes.
+
+        Integer casts are checked first (no nulls, no fractional values and
+        within the target range), so a value that does not fit raises instead
+        of silently wrapping. Boolean casts are checked the same way (no nulls,
+        only True/False/0/1), as astype('bool') would turn a missing value into
+        True.
+
+        Returns:
+            Dictionary with memory usage before/after in MB
+        """
+        before_mb = self.df.memory_usage(deep=True).sum() / 1024**2
+
+        for col, dtype in CLEANED_SCHEMA.items():
+            if col not in self.df.columns or str(self.df[col].dtype) == dtype:
+                continue
+            series = self.df[col]
+            if dtype.startswith('int'):
+                info = np.iinfo(dtype)
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+                if np.isnan(values).any() or (values % 1 != 0).any() \
+                        or values.min() < info.min or values.max() > info.max:
+                    raise ValueError(f"Column '{col}' does not fit declared dtype {dtype}")
+            elif dtype == 'bool':
+                if series.isna().any() or not series.isin([True, False]).all():
+                    raise ValueError(f"Column '{col}' does not fit declared dtype {dtype}")
+            self.df[col] = series.astype(dtype)
+
+        after_mb = self.df.memory_usage(deep=True).sum() / 1024**2
+        self.profile = None
+        self.schema_memory = {'before_mb': before_mb, 'after_mb': after_mb}
+
+        logger.info(f"Applied compact schema: {before_mb:.2f} MB -> {after_mb:.2f} MB "
+                    f"({(1 - after_mb / before_mb) * 100:.1f}% smaller)")
+        return self.schema_memory
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame, schema: pa.Schema = None) -> pa.Table:
+        """
+        Convert to an Arrow table for incremental writers.
+
+        Dictionary (categorical) columns use int32 indices so every chunk or
+        part shares one schema regardless of its number of categories.
+        """
+        if schema is not None:
+            return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        fields = [
+            pa.field(f.name, pa.dictionary(pa.int32(), f.type.value_type, f.type.ordered))
+            if pa.types.is_dictionary(f.type) else f
+            for f in table.schema
+        ]
+        return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+    def load(self, output_path: str = "data/processed/cleaned_spotify_data.csv",
+             write_csv: bool = True, partition_by_genre: bool = False):
+        """
+        Save cleaned dataset as CSV and Parquet.
 
-        logger.info("Data validation passed")
+        Args:
+            output_path: Path of the cleaned CSV; Parquet is written alongside
+            write_csv: Also write the CSV copy
+            partition_by_genre: Also write a hive-partitioned dataset by
+                track_genre (directory <name>_by_genre/, see genre_dataset_path)
+                next to the single Parquet file, which every consumer reads
 
-    def load(self, output_path: str = "data/processed/cleaned_spotify_data.csv"):
-        """Save cleaned dataset in both CSV and Parquet formats"""
+        Returns:
+            Tuple of (CSV path or None, Parquet file)
+        """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        self.enforce_schema()
+
         # Save as CSV
-        logger.info(f"Saving cleaned dataset to {output_path}")
-        self.df.to_csv(output_path, index=False)
-        logger.info(f"Successfully saved CSV: {len(self.df):,} records")
+        csv_path = None
+        if write_csv:
+            logger.info(f"Saving cleaned dataset to {output_path}")
+            self.df.to_csv(output_path, index=False)
+            logger.info(f"Successfully saved CSV: {len(self.df):,} records")
+            csv_path = output_path
 
         # Save as Parquet
         parquet_path = output_path.with_suffix('.parquet')
         logger.info(f"Saving Parquet format to {parquet_path}")
-        self.df.to_parquet(parquet_path, index=False, compression='snappy')
+        # Column statistics go into the schema metadata (see read_parquet_statistics)
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            STATS_METADATA_KEY: json.dumps(frame_statistics(self.df)),
+        })
+        pq.write_table(table, parquet_path, compression='snappy')
         logger.info(f"Successfully saved Parquet: {len(self.df):,} records")
 
+        # Genre partitions for readers that filter by genre (read_cleaned_data)
+        if partition_by_genre:
+            self._write_genre_partitions(genre_dataset_path(parquet_path))
+
+        # Rebuild the fingerprint index for the freshly written corpus
+        if self.fingerprint_index_path:
+            self.fingerprint_index = FingerprintIndex.from_frame(self.df)
+            self.fingerprint_index.save(self.fingerprint_index_path)
+
         # Save data quality report
         report_path = output_path.parent / "data_quality_report.txt"
         self._save_quality_report(report_path)
 
-        return output_path, parquet_path
+        return csv_path, parquet_path
+
+    def _write_genre_partitions(self, dataset_dir: Path):
+        """
+        Write a hive-partitioned Parquet dataset (track_genre=<genre>/).
 
-    def _save_quality_report(self, report_path: Path):
+        Rows are sorted by popularity within each genre and written in bounded
+        row groups with column statistics, so readers filtering on genre skip
+        whole directories and popularity filters skip row groups.
+        """
+        if 'track_genre' not in self.df.columns:
+            raise ValueError("Cannot partition by genre: 'track_genre' column not found")
+
+        logger.info(f"Saving genre-partitioned Parquet dataset to {dataset_dir}")
+        if dataset_dir.exists():
+            shutil.rmtree(dataset_dir)
+
+        sort_keys = ['track_genre', 'popularity'] if 'popularity' in self.df.columns \
+            else ['track_genre']
+        table = self._to_arrow(self.df.sort_values(sort_keys, kind='stable'))
+        ds.write_dataset(
+            table,
+            dataset_dir,
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([table.schema.field('track_genre')]),
+                                         flavor='hive'),
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression='snappy', write_statistics=True
+            ),
+            max_rows_per_group=PARTITION_MAX_ROWS_PER_GROUP,
+            min_rows_per_group=PARTITION_MIN_ROWS_PER_GROUP,
+            basename_template='part-{i}.parquet',
+        )
+        n_genres = self.df['track_genre'].nunique()
+        logger.info(f"Successfully saved {len(self.df):,} records in {n_genres} genre partitions")
+
+    def _save_quality_report(self, report_path: Path, report: dict = None):
         """Save data quality report to file"""
-        report = self.data_quality_report()
+        if report is None:
+            report = self.data_quality_report()
 
         with open(report_path, 'w') as f:
             f.write("=" * 80 + "\n")
@@ -326,6 +1040,9 @@ class SpotifyETL:
             f.write(f"Total Rows: {report['total_rows']:,}\n")
             f.write(f"Total Columns: {report['total_columns']}\n")
             f.write(f"Memory Usage: {report['memory_usage_mb']:.2f} MB\n")
+            if 'memory_before_schema_mb' in report:
+                f.write("Memory Usage (before compact schema): "
+                        f"{report['memory_before_schema_mb']:.2f} MB\n")
             f.write(f"Duplicate Rows: {report['duplicates']}\n\n")
 
             f.write("COLUMNS:\n")
@@ -347,25 +1064,175 @@ class SpotifyETL:
             for col, dtype in report['dtypes'].items():
                 f.write(f"  {col}: {dtype}\n")
 
+            if 'distinct_counts' in report:
+                f.write("\n\nDISTINCT VALUES (approx.):\n")
+                f.write("-" * 80 + "\n")
+                for col, count in report['distinct_counts'].items():
+                    f.write(f"  {col}: {count:,}\n")
+
         logger.info(f"Data quality report saved to {report_path}")
 
-    def run(self, output_path: str = "data/processed/cleaned_spotify_data.csv") -> Tuple[pd.DataFrame, Path, Path]:
-        """Run complete ETL pipeline"""
+    def _load_imputation_stats(self, default_dir: Path) -> Optional[ImputationStats]:
+        """Load the imputation stats artifact from stats_path or default_dir, if present"""
+        stats_path = self.stats_path or Path(default_dir) / STATS_FILE
+        self.imputation_stats = ImputationStats.load(stats_path) if stats_path.exists() else None
+        if self.imputation_stats is None:
+            logger.info(f"No imputation stats at {stats_path} - imputing from the data")
+        return self.imputation_stats
+
+    def _cache_key(self, config: dict) -> str:
+        """
+        Content hash of the raw input files, the ETL configuration and the
+        source of the ETL modules (this file and every src module it imports,
+        directly or indirectly).
+        """
+        digest = hashlib.sha256()
+        for path in self._raw_files(RAW_FILE_PATTERNS):
+            digest.update(path.name.encode())
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+
+        for path in _source_modules(Path(__file__).resolve()):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _cached_outputs(cache_path: Path, parquet_path: Path, key: str) -> Optional[dict]:
+        """Outputs recorded under key for parquet_path, if they all still exist"""
+        if not cache_path.exists():
+            return None
+        entry = json.loads(cache_path.read_text()).get(str(parquet_path))
+        if not entry or entry['key'] != key:
+            return None
+        if not all(Path(p).exists() for p in entry['outputs'] if p):
+            return None
+        return entry
+
+    def run(self, output_path: str = "data/processed/cleaned_spotify_data.csv",
+            write_csv: bool = True, partition_by_genre: bool = False,
+            n_workers: int = None, shard_by: str = 'track_id',
+            engine: str = 'arrow', use_cache: bool = True,
+            near_duplicate_tolerance: float = None) -> Tuple[pd.DataFrame, Path, Path]:
+        """
+        Run complete ETL pipeline.
+
+        With n_workers > 1 the transform step runs in a process pool
+        (see transform_parallel).
+
+        If the raw files, the output-relevant options and the ETL code are
+        unchanged since a previous run with the same output path, and its
+        outputs still exist, the pipeline is not rerun: the cleaned Parquet
+        output is read back into self.df (and the saved imputation stats into
+        self.imputation_stats) and returned as usual. engine, n_workers
+        and shard_by are part of the key, as the CSV parser and the sharding
+        can change missing values and fills. Pass use_cache=False to force a
+        rerun.
+
+        With near_duplicate_tolerance set, tracks whose audio features match a
+        more popular track within that tolerance are removed after the
+        transform (see _remove_near_duplicates).
+
+        The batch run is where imputation statistics are fitted: values are
+        computed from the data, then fitted on the cleaned dataset and saved
+        as imputation_stats.json next to the outputs (or to stats_path) for
+        streaming/delta runs, training and the dashboards. The numeric model
+        inputs are also materialized as a memory-mapped feature store
+        (src/feature_store.py) in feature_store/ next to the outputs.
+        """
         logger.info("=" * 80)
         logger.info("STARTING ETL PIPELINE")
         logger.info("=" * 80)
+        self.stage_metrics = {}
+
+        output_path = Path(output_path)
+        parquet_path = output_path.with_suffix('.parquet')
+        cache_path = output_path.parent / CACHE_FILE
+        stats_path = self.stats_path or output_path.parent / STATS_FILE
+        config = {
+            'output_path': output_path,
+            'write_csv': write_csv,
+            'partition_by_genre': partition_by_genre,
+            'fingerprint_index_path': self.fingerprint_index_path,
+            'near_duplicate_tolerance': near_duplicate_tolerance,
+            'stats_path': stats_path,
+            'engine': engine,
+            'n_workers': n_workers if n_workers and n_workers > 1 else None,
+            'shard_by': shard_by if n_workers and n_workers > 1 else None,
+            'validation_rules': [asdict(rule) for rule in self.validation_rules],
+        }
+
+        with self._stage('cache_lookup', rows_in=0):
+            cache_key = self._cache_key(config)
+            cached = self._cached_outputs(cache_path, parquet_path, cache_key) \
+                if use_cache else None
+            if cached:
+                self.df = pd.read_parquet(parquet_path)
+                self.imputation_stats = ImputationStats.load(stats_path) \
+                    if stats_path.exists() else None
+                self.profile = None
+
+        if cached:
+            logger.info(f"Raw data, configuration and code unchanged since {cached['created']} - "
+                        f"reusing {parquet_path}")
+            self._save_run_log(output_path.parent, mode='cached')
+            csv_path = Path(cached['outputs'][0]) if cached['outputs'][0] else None
+            return self.df, csv_path, parquet_path
 
         # Extract
-        self.extract()
+        with self._stage('extract', rows_in=0):
+            self.extract(engine=engine)
 
         # Generate initial quality report
-        initial_report = self.data_quality_report()
+        with self._stage('profile_raw'):
+            self.data_quality_report()
 
         # Transform
-        self.transform()
+        self.imputation_stats = None
+        self.quarantine = []
+        if n_workers and n_workers > 1:
+            with self._stage('transform.parallel'):
+                self.transform_parallel(n_workers, shard_by=shard_by)
+        else:
+            self.transform()
+
+        if near_duplicate_tolerance:
+            with self._stage('transform.near_duplicates'):
+                self._remove_near_duplicates(near_duplicate_tolerance)
+
+        # Fit imputation/validation stats before the compact schema cast
+        with self._stage('fit_stats'):
+            self.imputation_stats = ImputationStats.fit(self.df)
 
         # Load
-        csv_path, parquet_path = self.load(output_path)
+        with self._stage('load'):
+            csv_path, parquet_path = self.load(output_path, write_csv=write_csv,
+                                               partition_by_genre=partition_by_genre)
+            self.imputation_stats.save(stats_path)
+            self._save_quarantine(output_path.parent / QUARANTINE_FILE)
+
+        # Memory-mapped feature matrix for training and the dashboards
+        store_path = output_path.parent / STORE_DIR
+        with self._stage('feature_store'):
+            build_feature_store(self.df, store_path, stats=self.imputation_stats,
+                                source_path=parquet_path)
+        self._save_run_log(output_path.parent,
+                           mode='parallel' if n_workers and n_workers > 1 else 'batch')
+
+        # Record the outputs for the skip cache
+        cache = json.loads(cache_path.read_text()) if cache_path.exists() else {}
+        cache[str(parquet_path)] = {
+            'key': cache_key,
+            'created': datetime.now().isoformat(),
+            'outputs': [str(csv_path) if csv_path else None, str(parquet_path), str(stats_path),
+                        str(self.fingerprint_index_path) if self.fingerprint_index_path else None,
+                        str(store_path / MANIFEST_FILE),
+                        str(genre_dataset_path(parquet_path)) if partition_by_genre else None],
+        }
+        cache_path.write_text(json.dumps(cache, indent=2))
 
         logger.info("=" * 80)
         logger.info("ETL PIPELINE COMPLETE")
@@ -373,23 +1240,602 @@ class SpotifyETL:
 
         return self.df, csv_path, parquet_path
 
+    def run_streaming(self, output_path: str = "data/processed/cleaned_spotify_data.csv",
+                      chunksize: int = DEFAULT_CHUNKSIZE,
+                      write_csv: bool = True) -> Tuple[int, Path, Path]:
+        """
+        Run ETL pipeline out-of-core, one chunk at a time.
+
+        Each raw chunk is transformed independently and appended to the CSV and
+        Parquet outputs, so peak memory depends on chunksize rather than on the
+        total number of rows. Audio feature duplicates are also removed across
+        chunks; a duplicate is kept from the chunk where it was first seen, so
+        only duplicates within a chunk are guaranteed to keep the most popular
+        version. Missing values are filled from the imputation stats of the
+        last batch run if present, else with per-chunk medians/modes.
+
+        Memory is not fully independent of the input size: cross-chunk
+        deduplication keeps one in-memory fingerprint index entry (64-bit
+        fingerprint, track_id and popularity, about 90 bytes) per unique
+        recording written so far, i.e. roughly 1 GB per 10 million unique
+        tracks on top of the chunk itself. Rows failing validation are appended
+        to the quarantine file after each chunk rather than kept in memory.
+
+        Args:
+            output_path: Path of the cleaned CSV (Parquet is written alongside)
+            chunksize: Number of raw rows read per chunk
+            write_csv: Also write the CSV copy
 
-if __name__ == "__main__":
-    # Run ETL pipeline
+        Returns:
+            Tuple of (rows written, CSV path or None, Parquet path)
+        """
+        logger.info("=" * 80)
+        logger.info("STARTING STREAMING ETL PIPELINE")
+        logger.info("=" * 80)
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        parquet_path = output_path.with_suffix('.parquet')
+        quarantine_path = output_path.parent / QUARANTINE_FILE
+
+        self.fingerprint_index = None
+        self.stage_metrics = {}
+        self.quarantine = []
+        self._load_imputation_stats(output_path.parent)
+        writer = None
+        quarantine_writer = None
+        quarantined_rows = 0
+        statistics = None
+        rows_in = 0
+        rows_out = 0
+        profile = None
+        memory_before_mb = 0.0
+        memory_after_mb = 0.0
+        chunks = self.extract_chunks(chunksize)
+
+        try:
+            for i in itertools.count(1):
+                with self._stage('extract', rows_in=0):
+                    self.df = next(chunks, None)
+                if self.df is None:
+                    break
+                logger.info(f"Processing chunk {i} ({len(self.df):,} rows)")
+                rows_in += len(self.df)
+                self.transform()
+
+                # Write this chunk's quarantined rows out instead of keeping them
+                for rows in self.quarantine:
+                    table = self._to_arrow(rows, quarantine_writer.schema
+                                           if quarantine_writer else None)
+                    if quarantine_writer is None:
+                        quarantine_writer = pq.ParquetWriter(quarantine_path, table.schema)
+                    quarantine_writer.write_table(table)
+                    quarantined_rows += len(rows)
+                self.quarantine = []
+
+                # Drop duplicates of recordings already written by earlier chunks
+                if self.fingerprint_index is None:
+                    self.fingerprint_index = FingerprintIndex(
+                        features=[f for f in AUDIO_FEATURES if f in self.df.columns]
+                    )
+                with self._stage('transform.index_duplicates'):
+                    self.deduplicate_against_index(keep='first')
+
+                if self.df.empty:
+                    continue
+
+                with self._stage('load'):
+                    chunk_memory = self.enforce_schema()
+                    memory_before_mb += chunk_memory['before_mb']
+                    memory_after_mb += chunk_memory['after_mb']
+
+                    table = self._to_arrow(self.df, writer.schema if writer else None)
+                    if writer is None:
+                        writer = pq.ParquetWriter(parquet_path, table.schema, compression='snappy')
+                        statistics = StatisticsAccumulator(statistics_columns(self.df))
+                    writer.write_table(table)
+                    statistics.update_frame(self.df)
+                    if write_csv:
+                        self.df.to_csv(output_path, mode='w' if rows_out == 0 else 'a',
+                                       header=rows_out == 0, index=False)
+
+                rows_out += len(self.df)
+                with self._stage('profile_output'):
+                    chunk_profile = DataProfile.from_frame(self.df)
+                    profile = chunk_profile if profile is None else profile.merge(chunk_profile)
+
+            # Column statistics of all chunks go into the footer (see read_parquet_statistics)
+            if writer is not None:
+                writer.add_key_value_metadata(
+                    {STATS_METADATA_KEY: json.dumps(statistics.to_dict())})
+        finally:
+            if writer is not None:
+                writer.close()
+            if quarantine_writer is not None:
+                quarantine_writer.close()
+
+        if rows_out == 0:
+            raise ValueError(f"No records left after cleaning {self.raw_data_path}")
+
+        if self.fingerprint_index_path:
+            self.fingerprint_index.save(self.fingerprint_index_path)
+
+        if write_csv:
+            logger.info(f"Successfully saved CSV: {rows_out:,} records")
+        logger.info(f"Successfully saved Parquet: {rows_out:,} records")
+        logger.info(f"Total rows removed: {rows_in - rows_out:,} "
+                    f"({(rows_in - rows_out) / rows_in * 100:.2f}%)")
+
+        # Quality report of the streamed output, merged from per-chunk profiles
+        self.profile = profile
+        self.schema_memory = {'before_mb': memory_before_mb, 'after_mb': memory_after_mb}
+        report = self.data_quality_report()
+        self._save_quality_report(output_path.parent / "data_quality_report.txt", report)
+        if quarantined_rows:
+            logger.warning(f"Saved {quarantined_rows:,} quarantined rows to {quarantine_path}")
+        else:
+            # Stale file from an earlier run
+            quarantine_path.unlink(missing_ok=True)
+        self._save_run_log(output_path.parent, mode='streaming',
+                           quarantined_rows=quarantined_rows)
+
+        logger.info("=" * 80)
+        logger.info("STREAMING ETL PIPELINE COMPLETE")
+        logger.info("=" * 80)
+
+        return rows_out, output_path if write_csv else None, parquet_path
+
+    def _raw_files(self, patterns: List[str] = None) -> List[Path]:
+        """Raw files: the raw path itself, or if it is a directory every file matching patterns"""
+        if self.raw_data_path.is_dir():
+            patterns = patterns or ["*.csv"]
+            return sorted({path for pattern in patterns
+                           for path in self.raw_data_path.glob(pattern)})
+        if not self.raw_data_path.exists():
+            logger.error(f"File not found: {self.raw_data_path}")
+            raise FileNotFoundError(self.raw_data_path)
+        return [self.raw_data_path]
+
+    @staticmethod
+    def _tail_hash(path: Path, offset: int) -> str:
+        """Hash of the bytes just before offset, used to validate a watermark"""
+        with open(path, 'rb') as f:
+            start = max(0, offset - WATERMARK_TAIL_BYTES)
+            f.seek(start)
+            return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def _read_new_rows(self, path: Path,
+                       watermark: Optional[dict]) -> Tuple[Optional[pd.DataFrame], dict]:
+        """
+        Read the rows of a raw CSV appended after its watermark.
+
+        The watermark records the byte offset of the last complete line that
+        was processed, a hash of the bytes just before it and the header. If
+        the file shrank or that hash no longer matches, the file was rewritten
+        and is read again from the start.
+
+        Returns:
+            Tuple of (new rows or None, updated watermark)
+        """
+        size = path.stat().st_size
+        if watermark and (size < watermark['offset']
+                          or self._tail_hash(path, watermark['offset']) != watermark['tail_hash']):
+            logger.warning(f"{path} was rewritten since the last run - "
+                           "reprocessing it from the start")
+            watermark = None
+
+        offset = watermark['offset'] if watermark else 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read(size - offset)
+
+        # Only consume complete records; a partially written last record waits for the next run
+        end = _last_record_end(data)
+        data = data[:end]
+
+        if watermark:
+            columns = watermark['columns']
+            df = pd.read_csv(io.BytesIO(data), header=None, names=columns) if data else None
+        else:
+            df = pd.read_csv(io.BytesIO(data)) if data else None
+            columns = list(df.columns) if df is not None else []
+            if df is not None and df.empty:
+                df = None
+
+        new_offset = offset + end
+        new_watermark = {
+            'offset': new_offset,
+            'tail_hash': self._tail_hash(path, new_offset),
+            'columns': columns,
+            'rows': (watermark['rows'] if watermark else 0) + (len(df) if df is not None else 0),
+        }
+        return df, new_watermark
+
+    def _recover_staged_parts(self, dataset_dir: Path):
+        """
+        Publish or discard delta parts left staged by an interrupted run.
+
+        A part is staged before the fingerprint index is saved. If the index
+        was saved after the part was written, the index already holds its
+        rows and the part is published; otherwise it is discarded, and its
+        rows are read again because the watermarks were not advanced.
+        """
+        index_path = self.fingerprint_index_path
+        index_mtime = index_path.stat().st_mtime_ns if index_path.exists() else None
+        for staged_path in sorted(dataset_dir.glob("ingest_date=*/.part-*.parquet.tmp")):
+            if index_mtime is not None and index_mtime >= staged_path.stat().st_mtime_ns:
+                part_path = staged_path.with_name(staged_path.name[1:-len('.tmp')])
+                staged_path.rename(part_path)
+                logger.warning(f"Published part {part_path} staged by an interrupted run")
+            else:
+                staged_path.unlink()
+                logger.warning(f"Discarded part {staged_path} staged by an interrupted run")
+
+    def run_delta(self, dataset_dir: str = "data/processed/cleaned_spotify_data"
+                  ) -> Tuple[int, Optional[Path]]:
+        """
+        Run ETL only on raw rows added since the last successful delta run.
+
+        Raw files are tracked with byte-offset watermarks stored next to the
+        cleaned dataset, so a refresh reads, transforms and writes only the new
+        rows. They are deduplicated against the fingerprint index of the
+        existing corpus (keeping the already published track, as parts are
+        append-only) and appended as a new Parquet part under an
+        ingest_date=YYYY-MM-DD partition. The part is staged under a hidden
+        name, then the fingerprint index is saved, then the part is renamed
+        into place and the watermarks are committed, so an interrupted run
+        neither skips nor duplicates rows (see _recover_staged_parts).
+
+        Args:
+            dataset_dir: Directory of the partitioned cleaned dataset
+
+        Returns:
+            Tuple of (rows appended, path of the new part or None)
+        """
+        logger.info("=" * 80)
+        logger.info("STARTING DELTA ETL PIPELINE")
+        logger.info("=" * 80)
+
+        dataset_dir = Path(dataset_dir)
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        state_path = dataset_dir / DELTA_STATE_FILE
+        state = json.loads(state_path.read_text()) if state_path.exists() else {'files': {}}
+        if self.fingerprint_index_path is None:
+            self.fingerprint_index_path = dataset_dir / DELTA_FINGERPRINT_FILE
+        self._recover_staged_parts(dataset_dir)
+        self.quarantine = []
+        self._load_imputation_stats(dataset_dir.parent)
+
+        # Extract only the new rows of each raw file
+        self.stage_metrics = {}
+        frames = []
+        watermarks = {}
+        with self._stage('extract', rows_in=0):
+            for path in self._raw_files():
+                df, watermarks[str(path)] = self._read_new_rows(path, state['files'].get(str(path)))
+                if df is not None:
+                    logger.info(f"Found {len(df):,} new rows in {path}")
+                    frames.append(df)
+            if frames:
+                self.df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+        if not frames:
+            logger.info("No new raw rows since the last run - nothing to do")
+            return 0, None
+
+        rows_in = len(self.df)
+        self.transform()
+        if self.imputation_stats is not None:
+            out_of_range = self.imputation_stats.out_of_range(self.df)
+            if out_of_range:
+                logger.warning(f"New rows outside the fitted value ranges: {out_of_range}")
+
+        # Deduplicate against everything already in the cleaned dataset
+        with self._stage('transform.index_duplicates'):
+            self.deduplicate_against_index(keep='first')
+
+        part_path = None
+        if not self.df.empty:
+            with self._stage('load'):
+                self.enforce_schema()
+                existing_parts = sorted(dataset_dir.glob("ingest_date=*/*.parquet"))
+                schema = pq.read_schema(existing_parts[0]) if existing_parts else None
+                table = self._to_arrow(self.df, schema)
+                table = table.replace_schema_metadata({
+                    **(table.schema.metadata or {}),
+                    STATS_METADATA_KEY: json.dumps(frame_statistics(self.df)),
+                })
+
+                now = datetime.now()
+                part_dir = dataset_dir / f"ingest_date={now.strftime('%Y-%m-%d')}"
+                part_dir.mkdir(parents=True, exist_ok=True)
+                part_path = part_dir / f"part-{now.strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+                staged_path = part_dir / f".{part_path.name}.tmp"
+                pq.write_table(table, staged_path, compression='snappy')
+
+        if self.quarantine:
+            self._save_quarantine(dataset_dir / "_quarantine"
+                                  / f"part-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet")
+
+        # Commit: fingerprints, then the part, then watermarks
+        self.fingerprint_index.save(self.fingerprint_index_path)
+        if part_path:
+            staged_path.rename(part_path)
+            logger.info(f"Appended {len(self.df):,} records to {part_path}")
+        state['files'].update(watermarks)
+        state['last_run'] = datetime.now().isoformat()
+        state_path.write_text(json.dumps(state, indent=2))
+        self._save_run_log(dataset_dir.parent, mode='delta')
+
+        logger.info(f"Delta run: {rows_in:,} new raw rows -> {len(self.df):,} new cleaned records")
+        logger.info("=" * 80)
+        logger.info("DELTA ETL PIPELINE COMPLETE")
+        logger.info("=" * 80)
+
+        return len(self.df), part_path
+
+
+def _last_record_end(data: bytes) -> int:
+    """
+    Offset just past the last complete CSV record in data (0 if there is none).
+
+    A newline ends a record only outside a quoted field, i.e. when an even
+    number of quote characters precedes it (escaped quotes are doubled), so
+    a quoted value containing a newline is never cut in half.
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buffer == ord('\n'))
+    quotes = np.flatnonzero(buffer == ord('"'))
+    boundaries = newlines[np.searchsorted(quotes, newlines) % 2 == 0]
+    return int(boundaries[-1]) + 1 if len(boundaries) else 0
+
+
+def _peak_rss_mb(children: bool = False) -> Optional[float]:
+    """
+    Peak resident set size so far, in MB (None if unavailable).
+
+    Of this process, or with children=True of the largest terminated child
+    process (process-pool workers once the pool has shut down).
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Current resident set size of this process, in MB (None where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1024**2
+
+
+def _source_modules(entry: Path) -> List[Path]:
+    """Source file of a module and of every src module it imports, directly or indirectly"""
+    src_dir = entry.parent
+    seen, pending = set(), [entry]
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                names = [node.module]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            pending.extend(src_dir / f"{name.split('.')[1]}.py" for name in names
+                           if name.startswith('src.') and name.count('.') == 1)
+    return sorted(seen)
+
+
+def _filter_shard(shard: pd.DataFrame) -> pd.DataFrame:
+    """Process-pool worker: drop duplicates and zero-popularity tracks of a shard, no imputing"""
     etl = SpotifyETL()
-    df_clean, csv_path, parquet_path = etl.run()
-
-    print("\n" + "=" * 80)
-    print("ETL PIPELINE SUMMARY")
-    print("=" * 80)
-    print(f"CSV dataset: {csv_path}")
-    print(f"Parquet dataset: {parquet_path}")
-    print(f"Total records: {len(df_clean):,}")
-    print(f"Total features: {len(df_clean.columns)}")
-    print(f"\nNew features created:")
-    new_features = ['duration_min', 'mood_energy', 'energy_category', 'popularity_category', 'tempo_category']
-    for feat in new_features:
-        if feat in df_clean.columns:
-            print(f"  ✓ {feat}")
-    print("\nFirst few records:")
-    print(df_clean.head())
+    etl.df = shard
+    etl._filter_rows(fill_values={})
+    return etl.df
+
+
+def _transform_shard(shard: pd.DataFrame, fill_values: Dict[str, object],
+                     validation_rules: List[ValidationRule] = None
+                     ) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+    """Process-pool worker: run the serial transform on one shard"""
+    etl = SpotifyETL()
+    if validation_rules is not None:
+        etl.validation_rules = validation_rules
+    etl.df = shard
+    return etl.transform(fill_values), etl.quarantine
+
+
+def genre_dataset_path(parquet_path: Path) -> Path:
+    """Directory of the genre-partitioned copy of a cleaned Parquet file (<name>_by_genre/)"""
+    parquet_path = Path(parquet_path)
+    return parquet_path.with_name(f"{parquet_path.stem}_by_genre")
+
+
+def read_cleaned_data(path: str = "data/processed/cleaned_spotify_data.parquet",
+                      genres: List[str] = None, columns: List[str] = None,
+                      filters: list = None) -> pd.DataFrame:
+    """
+    Read the cleaned dataset, pruning partitions and row groups where possible.
+
+    Works with the single Parquet file and with the genre-partitioned dataset
+    directory. Genre and other filters are pushed down to the Parquet reader,
+    so only matching partitions/row groups are read. When genres are given
+    for the single file and its genre-partitioned copy exists (written with
+    partition_by_genre), the partitions are read instead.
+
+    Args:
+        path: Parquet file or dataset directory
+        genres: Only read these track genres
+        columns: Only read these columns
+        filters: Extra pyarrow filters, e.g. [('popularity', '>=', 50)]
+
+    Returns:
+        Dataframe of the matching tracks
+    """
+    filters = list(filters or [])
+    if genres:
+        filters.append(('track_genre', 'in', list(genres)))
+        if Path(path).is_file() and genre_dataset_path(path).is_dir():
+            path = genre_dataset_path(path)
+    return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ETL pipeline for Spotify track analytics")
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="data/raw/dataset.csv",
+        help="Path to the raw CSV, or a directory of raw CSV files (default: data/raw/dataset.csv)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="data/processed/cleaned_spotify_data.csv",
+        help="Path of the cleaned CSV; Parquet is written alongside"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["arrow", "pandas"],
+        default="arrow",
+        help="CSV parser for batch runs (default: arrow)"
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the raw file in chunks of this many rows (default: load all at once)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Run the transform step in this many worker processes (default: serial)"
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=["track_id", "track_genre"],
+        default="track_id",
+        help="Partition key for parallel transform (default: track_id)"
+    )
+    parser.add_argument(
+        "--partition-by-genre",
+        action="store_true",
+        help="Also write a hive-partitioned Parquet dataset by track_genre next to the single file "
+             "(batch mode only)"
+    )
+    parser.add_argument(
+        "--no-csv",
+        action="store_true",
+        help="Skip the CSV copy of the cleaned dataset"
+    )
+    parser.add_argument(
+        "--fingerprint-index",
+        type=str,
+        default=None,
+        help="Save the audio fingerprint index of the cleaned corpus to this path"
+    )
+    parser.add_argument(
+        "--stats-path",
+        type=str,
+        default=None,
+        help="Imputation stats artifact, written by batch runs and read by streaming/delta runs "
+             "(default: imputation_stats.json next to the outputs)"
+    )
+    parser.add_argument(
+        "--delta",
+        type=str,
+        default=None,
+        metavar="DATASET_DIR",
+        help="Only process raw rows added since the last delta run and append them "
+             "to this partitioned dataset directory"
+    )
+    parser.add_argument(
+        "--near-duplicate-tolerance",
+        type=float,
+        default=None,
+        help="Also remove tracks whose audio features all match a more popular track within "
+             "this fraction of each feature's range, e.g. 0.002 (batch mode only)"
+    )
+    parser.add_argument(
+        "--strict-validation",
+        action="store_true",
+        help="Also quarantine rows outside the ranges of the other audio features, key, mode, "
+             "time signature and duration, or without a track_id (drops rows a default run keeps)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun the batch pipeline even if raw data, options and code are unchanged"
+    )
+    args = parser.parse_args()
+    if args.delta or args.chunksize:
+        batch_only = [flag for flag, value in [
+            ('--partition-by-genre', args.partition_by_genre),
+            ('--near-duplicate-tolerance', args.near_duplicate_tolerance),
+        ] if value]
+        if batch_only:
+            parser.error(f"{', '.join(batch_only)} only apply to batch runs, "
+                         "not --delta or --chunksize")
+
+    etl = SpotifyETL(args.input, fingerprint_index_path=args.fingerprint_index,
+                     stats_path=args.stats_path)
+    if args.strict_validation:
+        etl.validation_rules = list(STRICT_RULES)
+
+    if args.delta:
+        n_rows, part_path = etl.run_delta(args.delta)
+
+        print("\n" + "=" * 80)
+        print("DELTA ETL PIPELINE SUMMARY")
+        print("=" * 80)
+        print(f"Dataset: {args.delta}")
+        print(f"New records: {n_rows:,}")
+        if part_path:
+            print(f"New part: {part_path}")
+    elif args.chunksize:
+        n_rows, csv_path, parquet_path = etl.run_streaming(args.output, chunksize=args.chunksize,
+                                                           write_csv=not args.no_csv)
+
+        print("\n" + "=" * 80)
+        print("STREAMING ETL PIPELINE SUMMARY")
+        print("=" * 80)
+        if csv_path:
+            print(f"CSV dataset: {csv_path}")
+        print(f"Parquet dataset: {parquet_path}")
+        print(f"Total records: {n_rows:,}")
+        print(f"Chunk size: {args.chunksize:,}")
+    else:
+        df_clean, csv_path, parquet_path = etl.run(
+            args.output, write_csv=not args.no_csv, partition_by_genre=args.partition_by_genre,
+            n_workers=args.workers, shard_by=args.shard_by, engine=args.engine,
+            use_cache=not args.force, near_duplicate_tolerance=args.near_duplicate_tolerance)
+
+        print("\n" + "=" * 80)
+        print("ETL PIPELINE SUMMARY")
+        print("=" * 80)
+        if csv_path:
+            print(f"CSV dataset: {csv_path}")
+        print(f"Parquet dataset: {parquet_path}")
+        print(f"Total records: {len(df_clean):,}")
+        print(f"Total features: {len(df_clean.columns)}")
+        print("\nNew features created:")
+        new_features = ['duration_min', 'mood_energy', 'energy_category', 'popularity_category',
+                        'tempo_category']
+        for feat in new_features:
+            if feat in df_clean.columns:
+                print(f"  ✓ {feat}")
+        print("\nFirst few records:")
+        print(df_clean.head())
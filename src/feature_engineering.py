@@ -3,25 +3,623 @@ Feature Engineering Pipeline for ML
 Prepares cleaned data for machine learning modeling
 """
 
+import os
+import re
+import shutil
+import sys
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
+import joblib
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from scipy import sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import LabelEncoder, StandardScaler
 from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
 import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.imputation_stats import (FALLBACK_DEFAULTS, STATS_FILE, ImputationStats,  # noqa: E402
+                                  load_stats)
+from src.feature_store import FeatureStore, build_feature_store  # noqa: E402
+from src.splits import SplitManifest  # noqa: E402
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# One-hot encoded (first category dropped)
+LOW_CARDINALITY_FEATURES = ['mode', 'time_signature', 'mood_energy', 'energy_category',
+                            'tempo_category']
+
+# Passed to the model as pandas categoricals with FeaturePipeline(categorical=True)
+CATEGORICAL_FEATURES = ['track_genre', 'key'] + LOW_CARDINALITY_FEATURES
+
+# Standardized after encoding
+SCALED_FEATURES = ['duration_ms', 'loudness', 'tempo', 'duration_min', 'track_genre_encoded', 'key']
+
+# Identifiers and target-derived columns that are never model inputs
+EXCLUDED_FEATURES = ['Unnamed: 0', 'track_id', 'track_name', 'album_name', 'artists',
+                     'popularity_category']
+
+# Columns derived by the ETL (SpotifyETL._engineer_features) from raw inputs
+ETL_DERIVED_FEATURES = ['duration_min', 'mood_energy', 'energy_category', 'tempo_category']
+
+# High-cardinality text columns hashed into a fixed-width block (FeaturePipeline(hash_features=...))
+HASHED_FEATURES = ['artists', 'album_name', 'track_genre']
+
+# Separators between the names in a multi-artist string (also used by enrich_artist_features.py)
+ARTIST_SEPARATORS = [',', ';', '&', ' and ', ' feat. ', ' ft. ']
+
+# Fitted pipeline saved by FeatureEngineer next to the ML-ready data
+PIPELINE_FILE = "feature_pipeline.joblib"
+
+# ML-ready features (FeatureEngineer output) and their train/test split
+ML_STORE_DIR = "ml_feature_store"
+SPLITS_DIR = "splits"
+SPLIT_NAME = "feature_engineering"
+
+# Streaming mode (FeatureEngineer.run_streaming): output file, rows per batch
+# and the most rows the fit pre-pass keeps in memory
+ML_DATASET_FILE = "ml_ready_data.parquet"
+DEFAULT_BATCH_SIZE = 50_000
+FIT_SAMPLE_ROWS = 500_000
+
+
+@dataclass(frozen=True)
+class DerivedFeature:
+    """A feature computed from other columns by an arithmetic expression"""
+    name: str
+    expression: str
+    inputs: Tuple[str, ...]
+
+
+# Declarative registry of computed features. Expressions use arithmetic,
+# comparisons, & and where(), which both numpy and numexpr evaluate.
+FEATURE_REGISTRY: Dict[str, DerivedFeature] = {feature.name: feature for feature in [
+    DerivedFeature('duration_min', 'duration_ms / 60000', ('duration_ms',)),
+    # Feature interactions
+    DerivedFeature('energy_danceability', 'energy * danceability', ('energy', 'danceability')),
+    DerivedFeature('valence_energy', 'valence * energy', ('valence', 'energy')),
+    DerivedFeature('acousticness_energy', 'acousticness * energy', ('acousticness', 'energy')),
+    # Polynomial features
+    DerivedFeature('energy_squared', 'energy ** 2', ('energy',)),
+    DerivedFeature('danceability_squared', 'danceability ** 2', ('danceability',)),
+    DerivedFeature('valence_squared', 'valence ** 2', ('valence',)),
+    # Duration categories
+    DerivedFeature('is_short_track', 'where(duration_min < 3, 1, 0)', ('duration_min',)),
+    DerivedFeature('is_long_track', 'where(duration_min > 5, 1, 0)', ('duration_min',)),
+    # Mood indicators
+    DerivedFeature('high_energy_happy', 'where((energy > 0.7) & (valence > 0.7), 1, 0)',
+                   ('energy', 'valence')),
+    DerivedFeature('low_energy_sad', 'where((energy < 0.3) & (valence < 0.3), 1, 0)',
+                   ('energy', 'valence')),
+]}
+
+INTERACTION_FEATURES = [name for name in FEATURE_REGISTRY if name != 'duration_min']
+
+# Raw inputs of the categorical ETL features (computed by SpotifyETL._engineer_features)
+ETL_CATEGORY_INPUTS = {
+    'mood_energy': ['valence', 'energy'],
+    'energy_category': ['energy'],
+    'tempo_category': ['tempo'],
+}
+
+
+def resolve_features(names: List[str], available: Set[str] = frozenset()) -> List[DerivedFeature]:
+    """
+    Registry features needed to produce names, in dependency order.
+
+    Features already available (and names not in the registry) are skipped,
+    as are their own inputs.
+    """
+    order, seen = [], set()
+
+    def visit(name: str):
+        if name in seen or name in available or name not in FEATURE_REGISTRY:
+            return
+        seen.add(name)
+        feature = FEATURE_REGISTRY[name]
+        for dependency in feature.inputs:
+            visit(dependency)
+        order.append(feature)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+@lru_cache(maxsize=None)
+def _compiled(expression: str):
+    return compile(expression, expression, 'eval')
+
+
+def _evaluate(expression: str, namespace: Dict[str, np.ndarray]) -> np.ndarray:
+    """Evaluate a registry expression on arrays (fused into one pass by numexpr if installed)"""
+    if numexpr is not None:
+        result = numexpr.evaluate(expression, local_dict=namespace)
+        # numexpr evaluates integer literals as int32; match numpy's int64
+        return result.astype(np.int64) if result.dtype.kind == 'i' else result
+    return eval(_compiled(expression), {'__builtins__': {}, 'where': np.where}, namespace)
+
+
+def compute_features(df: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+    """
+    Add the registry features in names to df (in place), computing nothing else.
+
+    Features df already has are kept, and only the registry features the
+    requested ones depend on are computed. Each input column is read once.
+
+    Args:
+        df: Dataframe with the input columns
+        names: Wanted feature names (names not in the registry are ignored)
+
+    Returns:
+        df with the computed columns added
+    """
+    features = resolve_features(names, set(df.columns))
+    namespace: Dict[str, np.ndarray] = {}
+    for feature in features:
+        for col in feature.inputs:
+            if col not in namespace:
+                namespace[col] = df[col].to_numpy()
+        namespace[feature.name] = _evaluate(feature.expression, namespace)
+    for feature in features:
+        df[feature.name] = namespace[feature.name]
+    return df
+
+
+def add_interaction_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Add interaction, polynomial and indicator features to df (in place)"""
+    return compute_features(df, INTERACTION_FEATURES)
+
+
+def one_hot_encode(df: pd.DataFrame, categories: Dict[str, list], drop_first: bool = True,
+                   sparse: bool = False) -> Tuple[object, List[str]]:
+    """
+    One-hot encode several columns into a single uint8 block.
+
+    All vocabularies are known up front, so the width of the block is fixed
+    and each column only writes the positions of its ones, instead of
+    allocating (and concatenating) one indicator column at a time.
+
+    Args:
+        df: Dataframe containing the columns to encode
+        categories: Column -> ordered categories
+        drop_first: Drop the indicator of each column's first category
+        sparse: Return a scipy CSR matrix instead of a dense array
+
+    Returns:
+        Tuple of ((n_rows, n_indicators) uint8 array or CSR matrix, indicator names).
+        Nulls and categories not in the vocabulary get no indicator.
+    """
+    skip = 1 if drop_first else 0
+    codes = {col: pd.Categorical(df[col], categories=cats).codes
+             for col, cats in categories.items()}
+    names = [f"{col}_{category}" for col, cats in categories.items() for category in cats[skip:]]
+    shape = (len(df), len(names))
+
+    if sparse:
+        rows, cols, offset = [], [], 0
+        for col, cats in categories.items():
+            col_codes = codes[col].astype(np.int32) - skip
+            hit = np.flatnonzero(col_codes >= 0).astype(np.int32)
+            rows.append(hit)
+            cols.append(col_codes[hit] + offset)
+            offset += len(cats) - skip
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int32)
+        return sp.csr_matrix((np.ones(len(rows), dtype=np.uint8), (rows, cols)), shape=shape), names
+
+    # Each indicator is compared straight into its column of the block
+    block = np.zeros(shape, dtype=np.uint8)
+    indicators = block.view(bool)
+    offset = 0
+    for col, cats in categories.items():
+        for code in range(skip, len(cats)):
+            np.equal(codes[col], code, out=indicators[:, offset])
+            offset += 1
+    return block, names
+
+
+def split_artists(artists: str) -> List[str]:
+    """Individual names of a multi-artist string ("A; B feat. C" -> ["A", "B", "C"])"""
+    names = re.split('|'.join(map(re.escape, ARTIST_SEPARATORS)), artists)
+    return [name.strip() for name in names if name.strip()]
+
+
+def hash_encode(df: pd.DataFrame, columns: List[str] = HASHED_FEATURES,
+                n_features: int = 2 ** 12) -> Tuple[sp.csr_matrix, List[str]]:
+    """
+    Hash the tokens of high-cardinality text columns into one fixed-width sparse block.
+
+    Each value contributes "<column>=<token>" tokens (one per artist for
+    multi-artist strings), hashed with signed MurmurHash3 (FeatureHasher) into
+    n_features columns. Nothing is learned, so the width and the encoding of
+    known values stay the same however many new artists or albums appear.
+    Each distinct value is tokenized and hashed once.
+
+    Args:
+        df: Dataframe containing the columns (absent columns are skipped)
+        columns: Text columns to hash; 'artists' is split into names
+        n_features: Width of the block
+
+    Returns:
+        Tuple of ((n_rows, n_features) float32 CSR matrix, column names).
+        Nulls contribute no tokens.
+    """
+    hasher = FeatureHasher(n_features=n_features, input_type='string', dtype=np.float32)
+    block = sp.csr_matrix((len(df), n_features), dtype=np.float32)
+    for col in columns:
+        if col not in df.columns:
+            continue
+        codes, values = pd.factorize(df[col])
+        tokenize = split_artists if col == 'artists' else (lambda value: [value])
+        hashed = hasher.transform([f"{col}={token}" for token in tokenize(str(value))]
+                                  for value in values)
+        # Null rows (code -1) take the trailing empty row
+        hashed = sp.vstack([hashed, sp.csr_matrix((1, n_features), dtype=np.float32)], format='csr')
+        block = block + hashed[np.where(codes < 0, len(values), codes)]
+    return block.tocsr(), [f"hash_{i}" for i in range(n_features)]
+
+
+class FeaturePipeline(BaseEstimator, TransformerMixin):
+    """
+    Fitted, serializable feature transform from cleaned tracks to model inputs.
+
+    fit() learns the one-hot categories, the genre label encoding, the scaler
+    and fill values for missing inputs; transform() applies them to any
+    number of rows with column operations and returns the model's feature
+    columns in training order. Inputs may be raw track attributes only: the
+    ETL-derived columns (duration_min, mood_energy, ...) are computed if absent.
+
+    transform() only reads, derives, encodes and scales what the output
+    features need (see FEATURE_REGISTRY), so a pipeline for a model on nine
+    raw audio features computes no interactions or encodings.
+
+    With hash_features, artists, album and genre are also encoded into a
+    fixed-width block of hashed tokens (hash_encode), which replaces the
+    label-encoded genre; the block's width does not grow with the catalog.
+
+    With categorical, CATEGORICAL_FEATURES are neither one-hot, label-encoded
+    nor scaled but returned as pandas categoricals with the fitted categories,
+    for models that split on categories natively (XGBoost enable_categorical).
+
+    Args:
+        features: Output columns (default: every engineered feature). Inputs
+            absent from the fitted data take their fill value (or FALLBACK_DEFAULTS
+            entry) and the dropped first indicator of a one-hot column is 0;
+            fit() raises ValueError for any other name it cannot produce.
+        target: Target column, excluded from the features
+        scale: Standardize SCALED_FEATURES (False for models trained on raw values)
+        sparse: Return a scipy CSR matrix (columns in feature order) instead of a
+            dataframe, keeping the one-hot indicators and hashed tokens sparse
+        hash_features: Width of the hashed HASHED_FEATURES block (0 = no hashing,
+            the columns are dropped and the genre is label-encoded)
+        categorical: Return CATEGORICAL_FEATURES as pandas categoricals (categories
+            not seen during fit become missing); not possible with sparse
+        stats_path: Persisted imputation statistics (src/imputation_stats.py) to take
+            the fill values and defaults from; only columns they lack are fitted
+    """
+
+    def __init__(self, features: List[str] = None, target: str = 'popularity', scale: bool = True,
+                 sparse: bool = False, hash_features: int = 0, categorical: bool = False,
+                 stats_path: str = None):
+        self.features = features
+        self.target = target
+        self.scale = scale
+        self.sparse = sparse
+        self.hash_features = hash_features
+        self.categorical = categorical
+        self.stats_path = stats_path
+
+    @classmethod
+    def from_stats(cls, features: List[str], stats: ImputationStats = None) -> "FeaturePipeline":
+        """
+        Pipeline for a model on raw and registry features, built without fitting.
+
+        For models saved without a pipeline: missing inputs are filled from the
+        persisted imputation statistics and nothing is encoded or scaled.
+        Features in FALLBACK_DEFAULTS that the statistics lack take that default.
+
+        Raises:
+            ValueError: If a feature needs fitted encodings (one-hot indicators,
+                the label-encoded genre, hashed tokens)
+        """
+        stats = stats if stats is not None else ImputationStats(fill_values={}, ranges={})
+        encoded = [f for f in features if f == 'track_genre_encoded' or f.startswith('hash_')
+                   or any(f.startswith(f"{col}_") for col in CATEGORICAL_FEATURES)]
+        if encoded:
+            raise ValueError(f"{encoded} need a fitted feature pipeline - "
+                             f"retrain the model to save one with it")
+
+        pipeline = cls(features=list(features), scale=False)
+        defaulted = [f for f in features if f in FALLBACK_DEFAULTS and f not in stats.fill_values]
+        needed = [f for f in features if f not in defaulted]
+        for feature in resolve_features(needed):
+            needed += [col for col in feature.inputs if col not in needed]
+        pipeline.input_columns_ = [c for c in needed if c not in FEATURE_REGISTRY]
+        pipeline.required_inputs_ = list(pipeline.input_columns_)
+        pipeline.stats_ = stats
+        pipeline.hashed_columns_, pipeline.hash_names_, pipeline.hash_ = [], [], False
+        pipeline.categories_, pipeline.onehot_categories_ = {}, {}
+        pipeline.genre_classes_, pipeline.encode_genre_ = None, False
+        pipeline.scaled_features_, pipeline.scaler_ = [], None
+        pipeline.features_ = list(features)
+        pipeline.feature_names_ = [f for f in features if f not in defaulted]
+        pipeline.defaults_ = stats.defaults(defaulted)
+        return pipeline
+
+    def fit(self, df: pd.DataFrame, y=None) -> "FeaturePipeline":
+        """Learn encodings, scaling and defaults from a cleaned dataframe"""
+        if self.categorical and self.sparse:
+            raise ValueError("A sparse matrix cannot hold categorical columns - use sparse=False")
+        self.input_columns_ = [c for c in df.columns
+                               if c not in EXCLUDED_FEATURES and c != self.target]
+        self.stats_ = self._fit_stats(df)
+        self.hashed_columns_ = [c for c in HASHED_FEATURES if c in df.columns] \
+            if self.hash_features else []
+
+        if self.features is None:
+            X = self._prepare(df.copy())
+        else:
+            # Derive only what the requested features need, so their input columns are enough
+            X = self._prepare(df.copy(), list(self.features), self._etl_features_for(self.features))
+        self.categories_: Dict[str, list] = {}
+        for col in CATEGORICAL_FEATURES if self.categorical else LOW_CARDINALITY_FEATURES:
+            if col in X.columns and col not in self.hashed_columns_:
+                values = X[col]
+                self.categories_[col] = list(values.cat.categories) \
+                    if isinstance(values.dtype, pd.CategoricalDtype) \
+                    else sorted(values.dropna().unique().tolist())
+        if 'track_genre' in X.columns and 'track_genre' not in self.hashed_columns_ \
+                and not self.categorical:
+            self.genre_classes_ = np.array(sorted(X['track_genre'].dropna().astype(str).unique()))
+            logger.info(f"Encoded {len(self.genre_classes_)} unique genres")
+        else:
+            self.genre_classes_ = None
+
+        X, onehot, onehot_names = self._encode(X, fitted=False)
+        X = pd.concat([X, pd.DataFrame(onehot, columns=onehot_names, index=X.index)], axis=1)
+        # Keep the label-encoded genre after the indicators
+        if 'track_genre_encoded' in X.columns:
+            X = X[[c for c in X.columns if c != 'track_genre_encoded'] + ['track_genre_encoded']]
+        self.scaled_features_ = [f for f in SCALED_FEATURES
+                                 if f in X.columns and f not in self.categories_] \
+            if self.scale else []
+        self.scaler_ = StandardScaler().fit(X[self.scaled_features_]) \
+            if self.scaled_features_ else None
+
+        self.feature_names_ = [c for c in X.columns if c not in EXCLUDED_FEATURES
+                               and c != self.target and c not in self.hashed_columns_]
+        self.hash_names_ = [f"hash_{i}" for i in range(self.hash_features)] \
+            if self.hashed_columns_ else []
+        self.feature_names_ += self.hash_names_
+        self.features_ = list(self.features) if self.features is not None \
+            else list(self.feature_names_)
+        dropped_first = set() if self.categorical else \
+            {f"{col}_{categories[0]}" for col, categories in self.categories_.items() if categories}
+        unknown = [col for col in self.features_ if col not in self.feature_names_
+                   and col not in dropped_first and col not in self.stats_.fill_values
+                   and col not in FALLBACK_DEFAULTS]
+        if unknown:
+            raise ValueError(f"Cannot produce features {unknown} from the fitted data")
+        self.defaults_ = self.stats_.defaults([col for col in self.features_
+                                               if col not in self.feature_names_])
+
+        # What the output features depend on; transform() computes nothing else
+        self.onehot_categories_ = {
+            col: categories for col, categories in self.categories_.items()
+            if (col in self.features_ if self.categorical
+                else any(f"{col}_{c}" in self.features_ for c in categories[1:]))}
+        self.encode_genre_ = self.genre_classes_ is not None \
+            and 'track_genre_encoded' in self.features_
+        self.hash_ = not set(self.hash_names_).isdisjoint(self.features_)
+        needed = set(self.features_) | set(self.onehot_categories_)
+        if self.encode_genre_:
+            needed.add('track_genre')
+        for col in self.onehot_categories_:
+            needed.update(ETL_CATEGORY_INPUTS.get(col, []))
+        for feature in resolve_features(list(needed)):
+            needed.update(feature.inputs)
+        self.required_inputs_ = [c for c in self.input_columns_ if c in needed]
+        logger.info(f"Fitted feature pipeline with {len(self.features_)} output features")
+        return self
+
+    def transform(self, df: pd.DataFrame):
+        """Engineer model features for one or many tracks (a CSR matrix if sparse)"""
+        X = df[[c for c in self.required_inputs_ if c in df.columns]].copy()
+
+        # Missing or null inputs take the fitted fill values (derived ones are recomputed)
+        missing = [c for c in self.required_inputs_ if c not in X.columns
+                   and c not in ETL_DERIVED_FEATURES and c not in FEATURE_REGISTRY]
+        if missing:
+            X = X.assign(**self.stats_.defaults(missing, fallback=np.nan))
+        X = self.stats_.fill(X)
+
+        X = self._prepare(X, self.features_,
+                          [c for c in self.onehot_categories_ if c in ETL_DERIVED_FEATURES])
+        X, onehot, onehot_names = self._encode(X, sparse=self.sparse)
+        if self.scaler_ is not None:
+            # Same arithmetic as StandardScaler.transform, on the output features only
+            for i, col in enumerate(self.scaled_features_):
+                if col in self.features_:
+                    values = X[col].to_numpy(dtype=np.float64)
+                    X[col] = (values - self.scaler_.mean_[i]) / self.scaler_.scale_[i]
+        for col, value in self.defaults_.items():
+            X[col] = value
+
+        blocks = [(onehot, onehot_names)]
+        if self.hash_:
+            blocks.append(hash_encode(df, self.hashed_columns_, self.hash_features))
+        if self.sparse:
+            return self._to_sparse(X, blocks)
+        blocks = [pd.DataFrame(block.toarray() if sp.issparse(block) else block,
+                               columns=names, index=X.index)
+                  for block, names in blocks]
+        return pd.concat([X] + blocks, axis=1)[self.features_]
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        return np.asarray(self.features_, dtype=object)
+
+    def _fit_stats(self, df: pd.DataFrame) -> ImputationStats:
+        """The persisted imputation statistics if any, completed with the columns they lack"""
+        stats = load_stats(self.stats_path) if self.stats_path else None
+        if stats is None:
+            return ImputationStats.fit(df, self.input_columns_)
+        missing = [c for c in self.input_columns_ if c not in stats.fill_values]
+        if not missing:
+            return stats
+        fitted = ImputationStats.fit(df, missing)
+        return ImputationStats(fill_values={**stats.fill_values, **fitted.fill_values},
+                               ranges={**stats.ranges, **fitted.ranges},
+                               n_rows=stats.n_rows, created=stats.created)
+
+    @staticmethod
+    def _etl_features_for(features: List[str]) -> List[str]:
+        """ETL-derived features that features (or their registry inputs and indicators) use"""
+        needed = set(features)
+        for feature in resolve_features(list(features)):
+            needed.update(feature.inputs)
+        return [c for c in ETL_DERIVED_FEATURES
+                if c in needed or any(name.startswith(f"{c}_") for name in needed)]
+
+    @staticmethod
+    def _prepare(X: pd.DataFrame, features: List[str] = None,
+                 categories: List[str] = None) -> pd.DataFrame:
+        """
+        Derive the ETL features if absent and add the registry features.
+
+        Args:
+            X: Input dataframe (modified in place)
+            features: Registry features to compute (default: all)
+            categories: Categorical ETL features needed (default: all)
+        """
+        categories = ETL_DERIVED_FEATURES if categories is None else categories
+        if any(col not in X.columns for col in categories):
+            from src.etl_pipeline import SpotifyETL
+
+            etl = SpotifyETL()
+            etl.df = X
+            etl._engineer_features()
+            X = etl.df
+        return compute_features(X, list(FEATURE_REGISTRY) if features is None else features)
+
+    def _encode(self, X: pd.DataFrame, sparse: bool = False,
+                fitted: bool = True) -> Tuple[pd.DataFrame, object, List[str]]:
+        """
+        Binary, one-hot and label encoding with the fitted categories.
+
+        Only the encodings the output features use are applied, unless
+        fitted is False (during fit, when every encoding is produced). In
+        categorical mode the categorical columns are set to the fitted
+        categories instead of being one-hot or label encoded.
+
+        Returns:
+            Tuple of (X without the one-hot source columns, one-hot block, indicator names)
+        """
+        categories = self.onehot_categories_ if fitted else self.categories_
+        if 'explicit' in X.columns:
+            X['explicit'] = X['explicit'].astype(int)
+
+        if self.categorical:
+            for col, cats in categories.items():
+                X[col] = pd.Categorical(X[col], categories=cats)
+            return X, np.zeros((len(X), 0), dtype=np.uint8), []
+
+        onehot, names = one_hot_encode(X, categories, sparse=sparse)
+        for col in categories:
+            del X[col]
+
+        encode_genre = self.encode_genre_ if fitted else self.genre_classes_ is not None
+        if encode_genre and 'track_genre' in X.columns:
+            genres = X.pop('track_genre').astype(str)
+            # Genres not seen during fit are encoded as -1
+            X['track_genre_encoded'] = pd.Categorical(genres, categories=self.genre_classes_) \
+                .codes.astype(np.int64)
+
+        return X, onehot, names
+
+    def _to_sparse(self, X: pd.DataFrame,
+                   blocks: List[Tuple[sp.csr_matrix, List[str]]]) -> sp.csr_matrix:
+        """Stack dense features and sparse blocks (indicators, hashed tokens) in feature order"""
+        sparse_names = [name for _, names in blocks for name in names]
+        sparse_set = set(sparse_names)
+        dense = [f for f in self.features_ if f not in sparse_set]
+        stacked = sp.hstack([sp.csr_matrix(X[dense].to_numpy(dtype=np.float64))]
+                            + [block.astype(np.float64) for block, _ in blocks], format='csr')
+        position = {name: i for i, name in enumerate(dense + sparse_names)}
+        return stacked[:, [position[f] for f in self.features_]]
+
+
+def pipeline_path_for(model_path: str) -> Path:
+    """Path of the feature pipeline saved next to a model (xgb_model_X -> xgb_feature_pipeline_X)"""
+    model_path = Path(model_path)
+    stem = model_path.stem.replace('_model', '_feature_pipeline', 1)
+    return model_path.with_name(stem + '.joblib')
+
+
+def load_feature_pipeline(model_path: str, model=None,
+                          stats: ImputationStats = None) -> FeaturePipeline:
+    """
+    Load the feature pipeline saved with a model.
+
+    Nothing is fitted here. Models trained before pipelines were saved get
+    FeaturePipeline.from_stats() for model.feature_names_in_, which fills
+    missing inputs from stats (the persisted imputation statistics) and does
+    not encode or scale.
+    """
+    path = pipeline_path_for(model_path)
+    if path.exists():
+        return joblib.load(path)
+    if model is None:
+        raise FileNotFoundError(f"No feature pipeline at {path}")
+    logger.warning(f"No feature pipeline at {path} - using the imputation stats")
+    return FeaturePipeline.from_stats(list(model.feature_names_in_), stats)
+
+
+def load_ml_data(data_dir: str = "data/processed",
+                 target: str = 'popularity') -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    ML-ready features and target, indexed by track_id.
+
+    Reads the ML feature store written by FeatureEngineer.run(), or the
+    Parquet file written by FeatureEngineer.run_streaming() (which removes
+    the store it supersedes).
+    """
+    data_dir = Path(data_dir)
+    if FeatureStore.exists(data_dir / ML_STORE_DIR):
+        return FeatureStore.open(data_dir / ML_STORE_DIR).frame()
+    streamed_path = data_dir / ML_DATASET_FILE
+    if not streamed_path.exists():
+        raise FileNotFoundError(f"No {ML_STORE_DIR}/ or {ML_DATASET_FILE} in {data_dir} - "
+                                f"run src/feature_engineering.py first")
+    logger.info(f"Reading streamed ML-ready data from {streamed_path}")
+    data = pd.read_parquet(streamed_path)
+    if 'track_id' in data.columns:
+        data = data.set_index('track_id')
+    return data.drop(columns=[target]), data[target]
+
 
 class FeatureEngineer:
     """Feature engineering pipeline for Spotify ML"""
 
-    def __init__(self, input_path: str = "data/processed/cleaned_spotify_data.parquet"):
+    def __init__(self, input_path: str = "data/processed/cleaned_spotify_data.parquet",
+                 categorical: bool = False):
         self.input_path = Path(input_path)
         self.df = None
-        self.scaler = StandardScaler()
-        self.le_genre = LabelEncoder()
+        # categorical: keep genre, key, mode, ... as categoricals for XGBoost enable_categorical
+        self.pipeline = FeaturePipeline(categorical=categorical,
+                                        stats_path=self.input_path.parent / STATS_FILE)
         self.target_variable = 'popularity'
 
     def load_data(self):
@@ -31,151 +629,261 @@ class FeatureEngineer:
         logger.info(f"Loaded {len(self.df):,} records with {len(self.df.columns)} features")
         return self
 
+    def _dataset(self) -> ds.Dataset:
+        """The input as a pyarrow dataset (a Parquet file or a hive-partitioned directory)"""
+        return ds.dataset(self.input_path, format='parquet', partitioning='hive')
+
+    def iter_batches(self, columns: List[str] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+        """Read the input in bounded batches (row groups / partitions), only the given columns"""
+        for batch in self._dataset().to_batches(columns=columns, batch_size=batch_size):
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def load_fit_sample(self, max_rows: int = FIT_SAMPLE_ROWS, batch_size: int = DEFAULT_BATCH_SIZE,
+                        random_state: int = 42):
+        """
+        Light pre-pass for fitting the pipeline out-of-core.
+
+        Reads only the columns fit() uses (no identifiers, names or target),
+        batch by batch, keeping a uniform random sample of about max_rows
+        rows. Inputs with at most max_rows rows are read whole, so the fit is
+        the same as after load_data().
+        """
+        dataset = self._dataset()
+        skipped = set(EXCLUDED_FEATURES) - (set(HASHED_FEATURES) if self.pipeline.hash_features
+                                            else set())
+        columns = [c for c in dataset.schema.names
+                   if c not in skipped and c != self.target_variable]
+        n_rows = dataset.count_rows()
+        fraction = min(1.0, max_rows / max(n_rows, 1))
+        logger.info(f"Fit pre-pass over {self.input_path}: {len(columns)} columns, "
+                    f"keeping {fraction:.1%} of {n_rows:,} rows")
+
+        rng = np.random.default_rng(random_state)
+        batches = []
+        for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+            if fraction < 1.0:
+                batch = batch.filter(pa.array(rng.random(batch.num_rows) < fraction))
+            batches.append(batch)
+        if not batches:
+            raise ValueError(f"No rows in {self.input_path}")
+        self.df = pa.Table.from_batches(batches).to_pandas()
+        return self
+
     def create_interaction_features(self):
         """Create interaction and polynomial features"""
         logger.info("Creating interaction features...")
-
-        # Feature interactions
-        self.df['energy_danceability'] = self.df['energy'] * self.df['danceability']
-        self.df['valence_energy'] = self.df['valence'] * self.df['energy']
-        self.df['acousticness_energy'] = self.df['acousticness'] * self.df['energy']
-
-        # Polynomial features
-        self.df['energy_squared'] = self.df['energy'] ** 2
-        self.df['danceability_squared'] = self.df['danceability'] ** 2
-        self.df['valence_squared'] = self.df['valence'] ** 2
-
-        # Duration categories
-        self.df['is_short_track'] = (self.df['duration_min'] < 3).astype(int)
-        self.df['is_long_track'] = (self.df['duration_min'] > 5).astype(int)
-
-        # Mood indicators
-        self.df['high_energy_happy'] = ((self.df['energy'] > 0.7) & (self.df['valence'] > 0.7)).astype(int)
-        self.df['low_energy_sad'] = ((self.df['energy'] < 0.3) & (self.df['valence'] < 0.3)).astype(int)
-
+        add_interaction_features(self.df)
         logger.info("Created 10 interaction features")
         return self
 
-    def encode_features(self):
-        """Encode categorical variables"""
-        logger.info("Encoding categorical features...")
-
-        # Binary encoding
-        self.df['explicit'] = self.df['explicit'].astype(int)
-
-        # One-hot encode low-cardinality categoricals
-        low_cardinality = ['mode', 'time_signature', 'mood_energy', 'energy_category', 'tempo_category']
-
-        for col in low_cardinality:
-            if col in self.df.columns:
-                dummies = pd.get_dummies(self.df[col], prefix=col, drop_first=True)
-                self.df = pd.concat([self.df, dummies], axis=1)
-                self.df.drop(col, axis=1, inplace=True)
-
-        # Label encode track_genre
-        if 'track_genre' in self.df.columns:
-            self.df['track_genre_encoded'] = self.le_genre.fit_transform(self.df['track_genre'])
-            self.df.drop('track_genre', axis=1, inplace=True)
-            logger.info(f"Encoded {len(self.le_genre.classes_)} unique genres")
+    def fit_pipeline(self):
+        """Fit the encoders and scaler of the feature pipeline on the loaded data"""
+        logger.info("Fitting feature pipeline (encoding and scaling)...")
+        self.pipeline.fit(self.df)
+        return self
 
-        logger.info(f"Total features after encoding: {len(self.df.columns)}")
+    def encode_features(self):
+        """
+        Fit the categorical encodings (fits the pipeline if not fitted yet).
+
+        Kept for the step-by-step API: self.df is no longer encoded in place,
+        prepare_for_ml() applies the fitted pipeline.
+        """
+        if not hasattr(self.pipeline, 'features_'):
+            self.fit_pipeline()
+        logger.info(f"Encoding {len(self.pipeline.categories_)} categorical features")
         return self
 
     def scale_features(self):
-        """Scale numeric features"""
-        logger.info("Scaling numeric features...")
+        """Fit the scaler (fits the pipeline if not fitted yet); applied by prepare_for_ml()"""
+        if not hasattr(self.pipeline, 'features_'):
+            self.fit_pipeline()
+        logger.info(f"Scaling {len(self.pipeline.scaled_features_)} features")
+        return self
 
-        features_to_scale = ['duration_ms', 'loudness', 'tempo', 'duration_min', 'track_genre_encoded', 'key']
-        features_to_scale = [f for f in features_to_scale if f in self.df.columns]
+    @property
+    def le_genre(self) -> LabelEncoder:
+        """Genre label encoder with the fitted pipeline's classes"""
+        encoder = LabelEncoder()
+        if getattr(self.pipeline, 'genre_classes_', None) is not None:
+            encoder.classes_ = self.pipeline.genre_classes_
+        return encoder
 
-        self.df[features_to_scale] = self.scaler.fit_transform(self.df[features_to_scale])
-        logger.info(f"Scaled {len(features_to_scale)} features")
-        return self
+    @property
+    def scaler(self) -> StandardScaler:
+        """The fitted pipeline's scaler (None before fitting or without scaling)"""
+        return getattr(self.pipeline, 'scaler_', None)
 
     def prepare_for_ml(self):
         """Prepare final dataset for ML"""
         logger.info("Preparing data for ML...")
 
-        # Features to exclude
-        exclude_features = [
-            'Unnamed: 0', 'track_id', 'track_name', 'album_name', 'artists',
-            'popularity_category'
-        ]
-
-        features_to_drop = [col for col in exclude_features if col in self.df.columns]
-        self.df.drop(columns=features_to_drop, inplace=True)
-
-        # Separate features and target
+        # Interaction features, encoding and scaling with the fitted pipeline
+        X = self.pipeline.transform(self.df)
         y = self.df[self.target_variable]
-        X = self.df.drop(self.target_variable, axis=1)
 
         logger.info(f"Features (X): {X.shape}")
         logger.info(f"Target (y): {y.shape}")
 
         return X, y
 
-    def split_data(self, X, y, test_size=0.2, random_state=42):
-        """Split data into train and test sets"""
+    def split_data(self, X, y, test_size=0.2, random_state=42, output_dir="data/processed"):
+        """
+        Split data into train and test sets.
+
+        Rows are assigned from a hash of their track_id (X's index), so a track
+        keeps its split when tracks are added. The split is saved as a manifest
+        of row indices (splits/feature_engineering.json) and reused while X and
+        y are unchanged.
+        """
         logger.info(f"Splitting data (test_size={test_size})...")
 
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            test_size=test_size,
-            random_state=random_state
-        )
+        split = SplitManifest.load_or_create(SPLIT_NAME, X, y,
+                                             splits_dir=Path(output_dir) / SPLITS_DIR,
+                                             test_size=test_size, random_state=random_state,
+                                             method='hash')
+        X_train, y_train = split.take('train', X, y)
+        X_test, y_test = split.take('test', X, y)
 
         logger.info(f"Train: {X_train.shape}, Test: {X_test.shape}")
         return X_train, X_test, y_train, y_test
 
-    def save_data(self, X_train, X_test, y_train, y_test, X, y, output_dir="data/processed"):
-        """Save processed data"""
+    def save_data(self, X, y, output_dir="data/processed") -> FeatureStore:
+        """
+        Save processed data as a memory-mapped feature store (train/test splits index into it).
+
+        Per-feature statistics are kept in the store manifest (FeatureStore.statistics()).
+        """
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"Saving processed data to {output_dir}")
 
-        # Save splits
-        X_train.to_parquet(output_dir / 'X_train.parquet', index=False)
-        X_test.to_parquet(output_dir / 'X_test.parquet', index=False)
-        y_train.to_frame().to_parquet(output_dir / 'y_train.parquet', index=False)
-        y_test.to_frame().to_parquet(output_dir / 'y_test.parquet', index=False)
-
         # Save full dataset
-        df_ml_full = pd.concat([X, y], axis=1)
-        df_ml_full.to_parquet(output_dir / 'ml_ready_data.parquet', index=False)
-
-        # Save feature info
-        feature_info = pd.DataFrame({
-            'feature': X.columns,
-            'dtype': X.dtypes.astype(str).values,
-            'missing': X.isnull().sum().values,
-            'unique': X.nunique().values,
-            'mean': X.mean().values,
-            'std': X.std().values
-        })
-        feature_info.to_csv(output_dir / 'feature_info.csv', index=False)
+        data = X.assign(track_id=self.df['track_id'].to_numpy(), **{y.name: y.to_numpy()})
+        store = build_feature_store(data, output_dir / ML_STORE_DIR, columns=list(X.columns),
+                                    target=y.name)
+        # Output of an earlier streaming run, superseded by the store
+        (output_dir / ML_DATASET_FILE).unlink(missing_ok=True)
+
+        # Save the fitted pipeline so the same transform can be applied at inference
+        joblib.dump(self.pipeline, output_dir / PIPELINE_FILE)
 
         logger.info("Saved all files successfully")
-        return output_dir
+        return store
+
+    def transform_batches(self, output_path: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Apply the fitted pipeline batch by batch and append each batch to a Parquet file.
+
+        Only the columns the pipeline reads are loaded. As in save_data(), rows
+        missing the target or a feature are left out.
+
+        Returns:
+            Number of rows written
+        """
+        from src.etl_pipeline import SpotifyETL
+
+        if self.pipeline.sparse:
+            raise ValueError("Streaming writes dense Parquet batches - "
+                             "use a pipeline with sparse=False")
+        wanted = set(self.pipeline.required_inputs_) | {'track_id', self.target_variable}
+        if self.pipeline.hash_:
+            wanted.update(self.pipeline.hashed_columns_)
+        columns = [c for c in self._dataset().schema.names if c in wanted]
+
+        writer = None
+        rows_written = 0
+        try:
+            for i, batch in enumerate(self.iter_batches(columns, batch_size), 1):
+                X = self.pipeline.transform(batch)
+                y = batch[self.target_variable]
+                valid = (y.notna() & X.notnull().all(axis=1)).to_numpy()
+                data = X[valid].assign(**{self.target_variable: y[valid]})
+                if 'track_id' in batch.columns:
+                    data.insert(0, 'track_id', batch.loc[valid, 'track_id'].astype(str))
+
+                table = SpotifyETL._to_arrow(data, writer.schema if writer else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, compression='snappy')
+                writer.write_table(table)
+                rows_written += len(data)
+                logger.info(f"Batch {i}: wrote {len(data):,} of {len(batch):,} rows")
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows_written
+
+    def run_streaming(self, output_dir: str = "data/processed",
+                      batch_size: int = DEFAULT_BATCH_SIZE,
+                      fit_sample_rows: int = FIT_SAMPLE_ROWS) -> Tuple[int, Path]:
+        """
+        Run feature engineering out-of-core.
+
+        The pipeline is fitted on a column-projected sample (load_fit_sample),
+        then the input is read one batch of row groups / partitions at a time,
+        transformed with the fitted encoders and scaler and appended to
+        <output_dir>/ml_ready_data.parquet, so peak memory depends on
+        batch_size and fit_sample_rows rather than on the dataset size.
+
+        No feature store or split is written, as both need all rows in
+        memory. The store and split of an earlier batch run are removed,
+        since they no longer match the saved pipeline; load_ml_data() then
+        reads the streamed file and ModelTrainer draws the split from it.
+
+        Returns:
+            Tuple of (rows written, Parquet path)
+        """
+        logger.info("=" * 80)
+        logger.info("STARTING STREAMING FEATURE ENGINEERING")
+        logger.info("=" * 80)
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = output_dir / ML_DATASET_FILE
+
+        self.load_fit_sample(fit_sample_rows, batch_size)
+        self.fit_pipeline()
+        self.df = None
+
+        # The batch outputs would pair stale features with the new pipeline
+        split_path = output_dir / SPLITS_DIR / f"{SPLIT_NAME}.json"
+        for stale_path in (split_path, split_path.with_suffix('.npz')):
+            stale_path.unlink(missing_ok=True)
+        if (output_dir / ML_STORE_DIR).exists():
+            logger.info("Removing the feature store of the last batch run in "
+                        f"{output_dir / ML_STORE_DIR}")
+            shutil.rmtree(output_dir / ML_STORE_DIR)
+
+        rows_written = self.transform_batches(output_path, batch_size)
+        joblib.dump(self.pipeline, output_dir / PIPELINE_FILE)
+        logger.info(f"Saved {rows_written:,} rows to {output_path}")
+
+        logger.info("=" * 80)
+        logger.info("STREAMING FEATURE ENGINEERING COMPLETE")
+        logger.info("=" * 80)
+
+        return rows_written, output_path
 
-    def run(self):
+    def run(self, output_dir: str = "data/processed"):
         """Run complete feature engineering pipeline"""
         logger.info("=" * 80)
         logger.info("STARTING FEATURE ENGINEERING PIPELINE")
         logger.info("=" * 80)
 
-        # Load and process
+        # Load and fit
         self.load_data()
-        self.create_interaction_features()
-        self.encode_features()
-        self.scale_features()
+        self.fit_pipeline()
 
-        # Prepare and split
+        # Prepare and save
         X, y = self.prepare_for_ml()
-        X_train, X_test, y_train, y_test = self.split_data(X, y)
+        store = self.save_data(X, y, output_dir)
 
-        # Save
-        output_dir = self.save_data(X_train, X_test, y_train, y_test, X, y)
+        # Split the stored rows
+        X, y = store.frame()
+        X_train, X_test, y_train, y_test = self.split_data(X, y, output_dir=output_dir)
 
         logger.info("=" * 80)
         logger.info("FEATURE ENGINEERING COMPLETE")
@@ -185,8 +893,35 @@ class FeatureEngineer:
 
 
 if __name__ == "__main__":
-    engineer = FeatureEngineer()
-    X_train, X_test, y_train, y_test = engineer.run()
+    import argparse
+
+    # Use the importable module's classes, so the saved pipeline unpickles as
+    # src.feature_engineering.FeaturePipeline rather than __main__.FeaturePipeline
+    from src.feature_engineering import FeatureEngineer  # noqa: F811
+
+    parser = argparse.ArgumentParser(description='Feature engineering for the popularity model')
+    parser.add_argument('--input', default='data/processed/cleaned_spotify_data.parquet',
+                        help='Cleaned Parquet file or partitioned dataset directory')
+    parser.add_argument('--output-dir', default='data/processed',
+                        help='Directory for the ML-ready outputs')
+    parser.add_argument('--categorical', action='store_true',
+                        help='Keep genre, key, mode, ... as native categoricals '
+                             'instead of one-hot/label encoding')
+    parser.add_argument('--streaming', action='store_true',
+                        help=f'Process the input in batches and write {ML_DATASET_FILE} '
+                             '(out-of-core)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows per batch in streaming mode')
+    args = parser.parse_args()
+
+    engineer = FeatureEngineer(args.input, categorical=args.categorical)
+    if args.streaming:
+        rows_written, output_path = engineer.run_streaming(args.output_dir,
+                                                           batch_size=args.batch_size)
+        print(f"\nStreamed {rows_written:,} rows with {len(engineer.pipeline.features_)} features "
+              f"to {output_path}")
+        sys.exit(0)
+    X_train, X_test, y_train, y_test = engineer.run(args.output_dir)
 
     print("\n" + "=" * 80)
     print("FEATURE ENGINEERING SUMMARY")
@@ -194,11 +929,8 @@ if __name__ == "__main__":
     print(f"Training samples: {len(X_train):,}")
     print(f"Test samples: {len(X_test):,}")
     print(f"Number of features: {X_train.shape[1]}")
-    print(f"Target variable: popularity (regression)")
-    print("\nFiles saved to data/processed/:")
-    print("  ✓ X_train.parquet")
-    print("  ✓ X_test.parquet")
-    print("  ✓ y_train.parquet")
-    print("  ✓ y_test.parquet")
-    print("  ✓ ml_ready_data.parquet")
-    print("  ✓ feature_info.csv")
+    print("Target variable: popularity (regression)")
+    print(f"\nFiles saved to {args.output_dir}/:")
+    print(f"  ✓ {ML_STORE_DIR}/")
+    print(f"  ✓ {SPLITS_DIR}/{SPLIT_NAME}.json")
+    print(f"  ✓ {PIPELINE_FILE}")
@@ -0,0 +1,327 @@
+"""
+Memory-Mapped Feature Store
+
+Materializes the numeric model inputs of the cleaned dataset once, as a
+contiguous float32 matrix in .npy files with a track_id index and a JSON
+manifest. Training scripts and dashboards open it with np.load(mmap_mode='r'),
+so loading features takes milliseconds instead of re-reading the Parquet file,
+re-selecting columns and re-dropping NaNs, and every process reading the store
+shares the same page-cache pages.
+
+Each build writes its arrays to a new v<version>/ directory and then replaces
+manifest.json, so readers never see a half-written store. The previous
+version is kept for processes that still read it and removed by the next
+build.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.fingerprint_index import AUDIO_FEATURES  # noqa: E402
+from src.imputation_stats import DEFAULT_STATS_PATH, ImputationStats, load_stats  # noqa: E402
+from src.column_stats import column_statistics, statistics_frame  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Store directory written by the ETL next to the cleaned dataset
+STORE_DIR = "feature_store"
+DEFAULT_STORE_PATH = f"data/processed/{STORE_DIR}"
+DEFAULT_DATA_PATH = "data/processed/cleaned_spotify_data.parquet"
+MANIFEST_FILE = "manifest.json"
+
+# Format version of the store; bump when the layout changes
+STORE_FORMAT_VERSION = 1
+
+# Numeric columns materialized by default, audio features first so the
+# models' nine-feature input is a zero-copy slice of the matrix
+STORE_COLUMNS = AUDIO_FEATURES + ['duration_ms', 'duration_min', 'key', 'mode', 'time_signature',
+                                  'explicit']
+
+
+def _source_signature(path: Optional[str]) -> Optional[Dict[str, object]]:
+    """Path, size and modification time of the source file"""
+    if path is None or not Path(path).exists():
+        return None
+    stat = Path(path).stat()
+    return {'path': str(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class FeatureStore:
+    """Read-only view of a materialized feature matrix"""
+
+    def __init__(self, path: Path, manifest: Dict[str, object], features: np.ndarray,
+                 target: np.ndarray, track_ids: np.ndarray, id_order: np.ndarray):
+        self.path = Path(path)
+        self.manifest = manifest
+        self.columns: List[str] = list(manifest['columns'])
+        self.target_name: str = manifest['target']
+        self.categories: Dict[str, list] = manifest.get('categories', {})
+        self._features = features
+        self._target = target
+        self._track_ids = track_ids
+        self._id_order = id_order
+        self._sorted_ids = None
+        self._positions = {col: i for i, col in enumerate(self.columns)}
+
+    def __len__(self) -> int:
+        return int(self.manifest['n_rows'])
+
+    @property
+    def version(self) -> str:
+        return self.manifest['version']
+
+    @classmethod
+    def exists(cls, path: str = DEFAULT_STORE_PATH) -> bool:
+        return (Path(path) / MANIFEST_FILE).exists()
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_STORE_PATH, mmap_mode: Optional[str] = 'r') -> "FeatureStore":
+        """
+        Open a store built with build_feature_store().
+
+        Args:
+            path: Store directory
+            mmap_mode: np.load mmap mode ('r' shares pages between processes,
+                None reads the arrays into memory)
+        """
+        path = Path(path)
+        manifest = json.loads((path / MANIFEST_FILE).read_text())
+        if manifest.get('format_version', 1) > STORE_FORMAT_VERSION:
+            raise ValueError(f"{path} has format version {manifest['format_version']}, "
+                             f"this code reads up to {STORE_FORMAT_VERSION}")
+
+        data_dir = path / manifest['data_dir']
+        arrays = {name: np.load(data_dir / file, mmap_mode=mmap_mode)
+                  for name, file in manifest['files'].items()}
+        store = cls(path, manifest, arrays['features'], arrays['target'],
+                    arrays['track_ids'], arrays['id_order'])
+        logger.info(f"Opened feature store {store.version} ({len(store):,} rows x "
+                    f"{len(store.columns)} features) from {path}")
+        return store
+
+    def column_indices(self, columns: List[str] = None) -> object:
+        """Positions of columns in the matrix, as a slice when they are adjacent"""
+        if columns is None:
+            return slice(None)
+        missing = [col for col in columns if col not in self._positions]
+        if missing:
+            raise KeyError(f"Feature store has no columns {missing}")
+        indices = [self._positions[col] for col in columns]
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return slice(indices[0], indices[0] + len(indices))
+        return indices
+
+    def features(self, columns: List[str] = None, rows: np.ndarray = None) -> np.ndarray:
+        """
+        Feature matrix for the given columns and rows.
+
+        Without rows, adjacent columns (e.g. the audio features) are returned
+        as a view of the memory map; other selections are gathered into a new
+        array. Categorical columns hold their category codes (NaN = missing).
+        """
+        matrix = self._features[:, self.column_indices(columns)]
+        return matrix if rows is None else matrix[rows]
+
+    def statistics(self) -> pd.DataFrame:
+        """Per-column statistics recorded at build time (missing, mean, std, min, max, distinct)"""
+        return statistics_frame(self.manifest.get('statistics', {}))
+
+    def target(self, rows: np.ndarray = None) -> np.ndarray:
+        return self._target if rows is None else self._target[rows]
+
+    def frame(self, columns: List[str] = None,
+              rows: np.ndarray = None) -> Tuple[pd.DataFrame, pd.Series]:
+        """Features and target as a dataframe and series by track_id (categoricals restored)"""
+        columns = columns if columns is not None else self.columns
+        index = pd.Index(self.track_ids(rows), name='track_id')
+        X = pd.DataFrame(self.features(columns, rows), columns=columns, index=index, copy=False)
+        for col in [col for col in columns if col in self.categories]:
+            codes = np.nan_to_num(X[col].to_numpy(), nan=-1).astype(np.int32)
+            X[col] = pd.Categorical.from_codes(codes, categories=self.categories[col])
+        y = pd.Series(self.target(rows), index=index, name=self.target_name, copy=False)
+        return X, y
+
+    def track_ids(self, rows: np.ndarray = None) -> np.ndarray:
+        return self._track_ids if rows is None else self._track_ids[rows]
+
+    def rows_for(self, track_ids) -> np.ndarray:
+        """Row of each track_id (-1 if not in the store), by binary search on the sorted index"""
+        if len(self) == 0:
+            return np.full(np.shape(track_ids), -1, dtype=np.int64)
+        if self._sorted_ids is None:
+            self._sorted_ids = self._track_ids[self._id_order]
+        sorted_ids = self._sorted_ids
+        track_ids = np.asarray(track_ids, dtype=sorted_ids.dtype)
+        positions = np.minimum(np.searchsorted(sorted_ids, track_ids), len(self) - 1)
+        found = sorted_ids[positions] == track_ids
+        return np.where(found, self._id_order[positions], -1)
+
+    def is_stale(self, source_path: str = None) -> bool:
+        """True if the source file changed (or disappeared) since the store was built"""
+        source = self.manifest.get('source')
+        if source is None:
+            return False
+        current = _source_signature(source_path or source['path'])
+        return current is None \
+            or (current['size'], current['mtime_ns']) != (source['size'], source['mtime_ns'])
+
+
+def build_feature_store(df: pd.DataFrame, path: str = DEFAULT_STORE_PATH, columns: List[str] = None,
+                        target: str = 'popularity', stats: ImputationStats = None,
+                        source_path: str = None) -> FeatureStore:
+    """
+    Materialize the numeric features of a cleaned dataframe.
+
+    Missing values are filled from the imputation stats; rows still missing a
+    feature or the target are left out, so consumers get the same rows they
+    would after dropping NaNs. Rows keep the dataframe's order. Categorical
+    columns are stored as their codes, with the categories in the manifest.
+
+    Args:
+        df: Cleaned dataframe
+        path: Store directory
+        columns: Feature columns (default: STORE_COLUMNS present in df)
+        target: Target column
+        stats: Imputation statistics used to fill missing values
+        source_path: File df was read from, recorded to detect a stale store
+
+    Returns:
+        The store, opened with memory mapping
+    """
+    path = Path(path)
+    columns = columns or [col for col in STORE_COLUMNS if col in df.columns]
+
+    X = df[columns]
+    if stats is not None:
+        X = stats.fill(X)
+    categories = {col: X[col].cat.categories.tolist() for col in columns
+                  if isinstance(X[col].dtype, pd.CategoricalDtype)}
+    if categories:
+        X = X.assign(**{col: X[col].cat.codes.astype(np.float32).where(X[col].notna())
+                        for col in categories})
+    features = np.ascontiguousarray(X.to_numpy(dtype=np.float32, na_value=np.nan))
+    target_values = df[target].to_numpy(dtype=np.float32, na_value=np.nan)
+    valid = ~(np.isnan(features).any(axis=1) | np.isnan(target_values))
+    if not valid.all():
+        logger.info(f"Leaving out {int((~valid).sum()):,} rows with missing features or target")
+        features, target_values = features[valid], target_values[valid]
+
+    track_ids = df['track_id'].to_numpy(dtype=str)[valid] if 'track_id' in df.columns \
+        else np.arange(len(features)).astype(str)
+    id_order = np.argsort(track_ids, kind='stable')
+
+    digest = hashlib.sha256(json.dumps([columns, target, categories]).encode())
+    for array in (features, target_values, track_ids):
+        digest.update(array.tobytes())
+    version = digest.hexdigest()[:12]
+
+    # Arrays go to a fresh version directory; the manifest switch is atomic
+    data_dir = path / f"v{version}"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    arrays = {'features': features, 'target': target_values, 'track_ids': track_ids,
+              'id_order': id_order}
+    files = {}
+    for name, array in arrays.items():
+        files[name] = f"{name}.npy"
+        np.save(data_dir / files[name], array)
+
+    manifest = {
+        'format_version': STORE_FORMAT_VERSION,
+        'version': version,
+        'created': datetime.now().isoformat(),
+        'data_dir': data_dir.name,
+        'files': files,
+        'columns': columns,
+        'target': target,
+        'dtype': 'float32',
+        'categories': categories,
+        'n_rows': int(len(features)),
+        'source': _source_signature(source_path),
+        'imputation_stats_version': stats.version if stats is not None else None,
+        'statistics': column_statistics(features, columns),
+    }
+    manifest_path = path / MANIFEST_FILE
+    previous_dir = path / json.loads(manifest_path.read_text())['data_dir'] \
+        if manifest_path.exists() else None
+    tmp_path = path / f"{MANIFEST_FILE}.tmp"
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, manifest_path)
+
+    # Keep the version the manifest pointed to until now (readers that opened
+    # it before the switch may still load its files); prune anything older
+    for old_dir in path.glob('v*'):
+        if old_dir.is_dir() and old_dir not in (data_dir, previous_dir):
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    logger.info(f"Saved feature store {version} ({len(features):,} rows x {len(columns)} features) "
+                f"to {path}")
+    return FeatureStore.open(path)
+
+
+def load_features(columns: List[str], store_path: str = DEFAULT_STORE_PATH,
+                  data_path: str = DEFAULT_DATA_PATH,
+                  stats_path: str = DEFAULT_STATS_PATH) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Features and target for training or analysis, from the feature store.
+
+    Falls back to reading the cleaned Parquet file (filling from the
+    imputation stats and dropping rows with NaNs) if the store is missing,
+    out of date or lacks a column.
+
+    Args:
+        columns: Feature columns
+        store_path: Feature store directory
+        data_path: Cleaned dataset the store was built from
+        stats_path: Imputation statistics for the fallback
+
+    Returns:
+        Tuple of (X, y) indexed by track_id
+    """
+    if FeatureStore.exists(store_path):
+        store = FeatureStore.open(store_path)
+        if store.is_stale(data_path):
+            logger.warning(f"Feature store {store_path} is older than {data_path} - rebuild it")
+        elif not set(columns) <= set(store.columns):
+            missing = sorted(set(columns) - set(store.columns))
+            logger.warning(f"Feature store {store_path} lacks {missing}")
+        else:
+            return store.frame(columns)
+    else:
+        logger.warning(f"No feature store at {store_path} - reading {data_path}")
+
+    df = pd.read_parquet(data_path)
+    X = df[columns]
+    stats = load_stats(stats_path)
+    if stats is not None:
+        X = stats.fill(X)
+    y = df['popularity']
+    mask = ~(X.isnull().any(axis=1) | y.isnull())
+    index = pd.Index(df.loc[mask, 'track_id'].astype(str), name='track_id')
+    return X[mask].set_axis(index), y[mask].set_axis(index)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Build the memory-mapped feature store')
+    parser.add_argument('--input', default=DEFAULT_DATA_PATH, help='Cleaned Parquet dataset')
+    parser.add_argument('--output', default=DEFAULT_STORE_PATH, help='Feature store directory')
+    parser.add_argument('--stats-path', default=DEFAULT_STATS_PATH, help='Imputation stats JSON')
+    args = parser.parse_args()
+
+    store = build_feature_store(pd.read_parquet(args.input), args.output,
+                                stats=load_stats(args.stats_path), source_path=args.input)
+    print(f"Feature store {store.version}: {len(store):,} rows x {len(store.columns)} features")
@@ -0,0 +1,184 @@
+"""
+Audio Fingerprint Index for Incremental Deduplication
+
+Maps a 64-bit hash of a track's audio features to the canonical track
+(track_id) and its popularity, so new batches can be deduplicated against an
+already-cleaned corpus without re-sorting or re-scanning it.
+
+The index is a set of arrays sorted by fingerprint. Batches are looked up
+with np.searchsorted and their new entries merged in with one stable sort
+(linear on the already sorted arrays), so no per-row Python work is done.
+Every entry stays in memory: 18 bytes plus the track_id string per unique
+recording.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+# Audio features that identify the same recording across catalog entries
+AUDIO_FEATURES = [
+    'danceability', 'energy', 'loudness', 'speechiness',
+    'acousticness', 'instrumentalness', 'liveness', 'valence', 'tempo'
+]
+
+
+def fingerprint(df: pd.DataFrame, features: List[str] = None) -> np.ndarray:
+    """
+    Compute a 64-bit fingerprint of each row's audio features.
+
+    Features are cast to float32, the storage dtype of the cleaned dataset,
+    before hashing. Every audio dedup hashes through this function: the
+    in-run dedup of transform() and transform_parallel(), which runs on raw
+    float64 values before enforce_schema(), and the persistent index built
+    from the stored corpus. A raw row and its stored copy therefore get the
+    same fingerprint, and rows that become equal once stored are duplicates.
+
+    Args:
+        df: Dataframe containing the audio feature columns
+        features: Columns to hash (default: AUDIO_FEATURES)
+
+    Returns:
+        uint64 array with one fingerprint per row
+    """
+    features = features or AUDIO_FEATURES
+    return pd.util.hash_pandas_object(
+        df[features].astype('float32'), index=False
+    ).to_numpy(dtype=np.uint64)
+
+
+class FingerprintIndex:
+    """Persistent fingerprint -> (track_id, popularity) index"""
+
+    def __init__(self, fingerprints: np.ndarray = None, track_ids: np.ndarray = None,
+                 popularity: np.ndarray = None, features: List[str] = None):
+        self.features = list(features or AUDIO_FEATURES)
+
+        fingerprints = np.asarray(fingerprints if fingerprints is not None else [], dtype=np.uint64)
+        order = np.argsort(fingerprints, kind='stable')
+        self._fingerprints = fingerprints[order]
+        track_ids = track_ids if track_ids is not None else []
+        popularity = popularity if popularity is not None else []
+        self._track_ids = np.asarray(track_ids, dtype=object)[order]
+        self._popularity = np.asarray(popularity, dtype=np.int16)[order]
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, features: List[str] = None) -> "FingerprintIndex":
+        """Build an index from an already deduplicated dataframe"""
+        features = features or [f for f in AUDIO_FEATURES if f in df.columns]
+        popularity = df['popularity'].to_numpy() if 'popularity' in df.columns \
+            else np.zeros(len(df))
+        track_ids = df['track_id'].to_numpy(dtype=object) if 'track_id' in df.columns \
+            else np.arange(len(df)).astype(str).astype(object)
+        return cls(fingerprint(df, features), track_ids, popularity, features)
+
+    @classmethod
+    def load(cls, path: str) -> "FingerprintIndex":
+        """Load an index saved with save()"""
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        features = json.loads(metadata[b'features']) if b'features' in metadata else None
+        index = cls(
+            table.column('fingerprint').to_numpy(),
+            table.column('track_id').to_numpy(zero_copy_only=False),
+            table.column('popularity').to_numpy(),
+            features
+        )
+        logger.info(f"Loaded fingerprint index with {len(index):,} entries from {path}")
+        return index
+
+    def save(self, path: str) -> Path:
+        """Save the index as a compact Parquet file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        table = pa.table({
+            'fingerprint': pa.array(self._fingerprints, type=pa.uint64()),
+            'track_id': pa.array(self._track_ids, type=pa.string()),
+            'popularity': pa.array(self._popularity, type=pa.int16()),
+        }).replace_schema_metadata({'features': json.dumps(self.features)})
+        pq.write_table(table, path, compression='zstd')
+
+        logger.info(f"Saved fingerprint index with {len(self):,} entries to {path}")
+        return path
+
+    def _insert(self, fingerprints: np.ndarray, track_ids: np.ndarray, popularity: np.ndarray):
+        """Merge entries with fingerprints not yet in the index into the sorted arrays"""
+        if not len(fingerprints):
+            return
+        fingerprints = np.concatenate([self._fingerprints, fingerprints])
+        order = np.argsort(fingerprints, kind='stable')
+        self._fingerprints = fingerprints[order]
+        self._track_ids = np.concatenate([self._track_ids, track_ids])[order]
+        self._popularity = np.concatenate([self._popularity, popularity])[order]
+
+    def deduplicate(self, df: pd.DataFrame,
+                    keep: str = 'popular') -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Remove rows of a batch that duplicate each other or the indexed corpus.
+
+        Within the batch the most popular version of each recording is kept.
+        Against the index, keep='popular' keeps a batch row only if it is more
+        popular than the indexed canonical track (which is then superseded),
+        while keep='first' always keeps the indexed track. The index is updated
+        with the surviving rows.
+
+        Args:
+            df: Batch of cleaned tracks
+            keep: 'popular' or 'first'
+
+        Returns:
+            Tuple of (deduplicated batch in original order, superseded track_ids)
+        """
+        if keep not in ('popular', 'first'):
+            raise ValueError(f"keep must be 'popular' or 'first', got {keep!r}")
+        if df.empty:
+            return df, []
+
+        fingerprints = fingerprint(df, self.features)
+        popularity = df['popularity'].to_numpy(dtype=np.int16) if 'popularity' in df.columns \
+            else np.zeros(len(df), dtype=np.int16)
+        track_ids = df['track_id'].to_numpy(dtype=object) if 'track_id' in df.columns \
+            else np.arange(len(df)).astype(str).astype(object)
+
+        # Within-batch: most popular first, then first occurrence of each fingerprint
+        order = np.argsort(-popularity.astype(np.int32), kind='stable')
+        _, first = np.unique(fingerprints[order], return_index=True)
+        candidates = np.sort(order[first])
+
+        keep_mask = np.zeros(len(df), dtype=bool)
+        superseded = []
+
+        # Against the index
+        n_base = len(self._fingerprints)
+        in_base = np.zeros(len(candidates), dtype=bool)
+        if n_base:
+            positions = np.minimum(np.searchsorted(self._fingerprints, fingerprints[candidates]),
+                                   n_base - 1)
+            in_base = self._fingerprints[positions] == fingerprints[candidates]
+            if keep == 'popular':
+                rows, positions = candidates[in_base], positions[in_base]
+                wins = popularity[rows] > self._popularity[positions]
+                rows, positions = rows[wins], positions[wins]
+                superseded.extend(self._track_ids[positions].tolist())
+                self._track_ids[positions] = track_ids[rows]
+                self._popularity[positions] = popularity[rows]
+                keep_mask[rows] = True
+
+        # New recordings
+        new = candidates[~in_base]
+        keep_mask[new] = True
+        self._insert(fingerprints[new], track_ids[new], popularity[new])
+
+        return df[keep_mask], superseded
@@ -12,7 +12,6 @@ This script implements all Phase 1 and Phase 2 improvements from the specificati
 
 import os
 import sys
-import json
 import warnings
 from datetime import datetime
 
@@ -29,7 +28,7 @@ import shap
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.ml_utils import (
+from src.ml_utils import (  # noqa: E402
     validate_train_test_features,
     check_missing_values,
     adjusted_r2,
@@ -68,9 +67,9 @@ sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (10, 6)
 plt.rcParams['font.size'] = 10
 
-print("="*80)
+print("=" * 80)
 print("🎵 IMPROVED ML PIPELINE - SPOTIFY TRACK POPULARITY PREDICTION")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
 
@@ -78,9 +77,9 @@ print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 # STEP 1: LOAD DATA
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📂 STEP 1: LOAD DATA")
-print("="*80)
+print("=" * 80)
 
 if not os.path.exists(DATA_PATH):
     print(f"❌ Error: Cleaned data not found at {DATA_PATH}")
@@ -91,16 +90,17 @@ df = pd.read_csv(DATA_PATH)
 print(f"✅ Loaded data: {df.shape[0]:,} rows, {df.shape[1]} columns")
 
 # Display basic info
-print(f"\nColumns: {list(df.columns)[:10]}..." if len(df.columns) > 10 else f"\nColumns: {list(df.columns)}")
+print(f"\nColumns: {list(df.columns)[:10]}..." if len(df.columns) > 10
+      else f"\nColumns: {list(df.columns)}")
 
 
 # ============================================================================
 # STEP 2: FEATURE SELECTION & PREPARATION
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔧 STEP 2: FEATURE SELECTION & PREPARATION")
-print("="*80)
+print("=" * 80)
 
 # Define target and features
 target_col = 'popularity'
@@ -137,9 +137,9 @@ print(f"\n✅ Clean dataset: {len(X):,} samples, {len(audio_features)} features"
 # STEP 3: DATA SPLITTING (WITH SEPARATE VALIDATION SET)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✂️  STEP 3: DATA SPLITTING (Phase 1 Improvement)")
-print("="*80)
+print("=" * 80)
 
 # Split into train+val (80%) and test (20%)
 X_train_full, X_test, y_train_full, y_test = train_test_split(
@@ -166,13 +166,13 @@ check_missing_values(X_train, X_test)
 # STEP 4: LOAD MODEL CONFIGURATION
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("⚙️  STEP 4: LOAD MODEL CONFIGURATION (Phase 2 Improvement)")
-print("="*80)
+print("=" * 80)
 
 # PHASE 2: Load from JSON config
 params = load_config(CONFIG_PATH)
-print(f"\nModel Parameters:")
+print("\nModel Parameters:")
 for key, value in params.items():
     print(f"  {key}: {value}")
 
@@ -181,9 +181,9 @@ for key, value in params.items():
 # STEP 5: TRAIN MODEL WITH LEARNING CURVES
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🤖 STEP 5: TRAIN XGBOOST MODEL")
-print("="*80)
+print("=" * 80)
 
 # Initialize model
 model = XGBRegressor(**params)
@@ -198,7 +198,7 @@ model.fit(
     verbose=False
 )
 
-print(f"✅ Model trained successfully!")
+print("✅ Model trained successfully!")
 print(f"Best iteration: {model.best_iteration if hasattr(model, 'best_iteration') else 'N/A'}")
 
 
@@ -226,9 +226,9 @@ plt.close()
 # STEP 6: PREDICTIONS & EVALUATION
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📊 STEP 6: PREDICTIONS & EVALUATION")
-print("="*80)
+print("=" * 80)
 
 # Make predictions
 y_train_pred = model.predict(X_train)
@@ -283,9 +283,9 @@ metrics = {
 # STEP 7: VISUALIZATIONS
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📊 STEP 7: VISUALIZATIONS")
-print("="*80)
+print("=" * 80)
 
 # 7.1: Actual vs Predicted (Test Set)
 plt.figure(figsize=(10, 6))
@@ -300,7 +300,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 actual_pred_path = os.path.join(PLOTS_DIR, 'actual_vs_predicted.png')
 plt.savefig(actual_pred_path, dpi=300, bbox_inches='tight')
-print(f"✅ Actual vs Predicted plot saved")
+print("✅ Actual vs Predicted plot saved")
 plt.close()
 
 # PHASE 2: 7.2 Scatter Density Plot
@@ -317,7 +317,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 density_path = os.path.join(PLOTS_DIR, 'prediction_density.png')
 plt.savefig(density_path, dpi=300, bbox_inches='tight')
-print(f"✅ Density plot saved")
+print("✅ Density plot saved")
 plt.close()
 
 # 7.3: Residuals Plot
@@ -333,7 +333,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 residuals_path = os.path.join(PLOTS_DIR, 'residuals_plot.png')
 plt.savefig(residuals_path, dpi=300, bbox_inches='tight')
-print(f"✅ Residuals plot saved")
+print("✅ Residuals plot saved")
 plt.close()
 
 # PHASE 2: 7.4 QQ Plot for Residuals
@@ -345,7 +345,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 qq_path = os.path.join(PLOTS_DIR, 'qq_plot_residuals.png')
 plt.savefig(qq_path, dpi=300, bbox_inches='tight')
-print(f"✅ QQ plot saved")
+print("✅ QQ plot saved")
 plt.close()
 
 # PHASE 2: 7.5 Correlation Heatmap (Features + Target)
@@ -363,7 +363,7 @@ plt.title('Feature Correlation Heatmap (with Target)')
 plt.tight_layout()
 corr_path = os.path.join(PLOTS_DIR, 'correlation_heatmap.png')
 plt.savefig(corr_path, dpi=300, bbox_inches='tight')
-print(f"✅ Correlation heatmap saved")
+print("✅ Correlation heatmap saved")
 plt.close()
 
 
@@ -371,9 +371,9 @@ plt.close()
 # STEP 8: FEATURE IMPORTANCE (STANDARD)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔍 STEP 8: FEATURE IMPORTANCE (Standard)")
-print("="*80)
+print("=" * 80)
 
 # Standard feature importance
 feature_importance = pd.DataFrame({
@@ -393,7 +393,7 @@ plt.ylabel('Feature')
 plt.tight_layout()
 feature_imp_path = os.path.join(PLOTS_DIR, 'feature_importance.png')
 plt.savefig(feature_imp_path, dpi=300, bbox_inches='tight')
-print(f"✅ Feature importance plot saved")
+print("✅ Feature importance plot saved")
 plt.close()
 
 
@@ -401,9 +401,9 @@ plt.close()
 # STEP 9: SHAP VALUES (CRITICAL - PHASE 1)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔬 STEP 9: SHAP VALUES - MODEL EXPLAINABILITY (Phase 1 CRITICAL)")
-print("="*80)
+print("=" * 80)
 
 print("Computing SHAP values (this may take a few minutes for large datasets)...")
 
@@ -426,7 +426,7 @@ shap.summary_plot(shap_values, X_test_shap, plot_type="bar", show=False)
 plt.tight_layout()
 shap_bar_path = os.path.join(PLOTS_DIR, 'xgboost_shap_summary_bar.png')
 plt.savefig(shap_bar_path, dpi=300, bbox_inches='tight')
-print(f"✅ SHAP summary bar plot saved")
+print("✅ SHAP summary bar plot saved")
 plt.close()
 
 # 9.2: SHAP Summary Plot (Beeswarm)
@@ -436,7 +436,7 @@ shap.summary_plot(shap_values, X_test_shap, show=False)
 plt.tight_layout()
 shap_beeswarm_path = os.path.join(PLOTS_DIR, 'xgboost_shap_beeswarm.png')
 plt.savefig(shap_beeswarm_path, dpi=300, bbox_inches='tight')
-print(f"✅ SHAP beeswarm plot saved")
+print("✅ SHAP beeswarm plot saved")
 plt.close()
 
 # 9.3: Export SHAP values (optional - for dashboard)
@@ -452,9 +452,9 @@ print(f"✅ SHAP values exported to: {shap_export_path}")
 # STEP 10: SAVE MODEL & METADATA (PHASE 1)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("💾 STEP 10: SAVE MODEL & METADATA (Phase 1 Improvement)")
-print("="*80)
+print("=" * 80)
 
 # Create comprehensive metadata
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -477,9 +477,9 @@ save_model_with_metadata(model, metadata, model_path, metadata_path)
 # SUMMARY
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✨ PIPELINE COMPLETE!")
-print("="*80)
+print("=" * 80)
 
 print("\n📊 Final Test Set Performance:")
 print(f"  RMSE: {test_rmse:.4f}")
@@ -502,4 +502,4 @@ print("  ✅ Phase 2: Adjusted R² metric")
 print("  ✅ Phase 2: Correlation heatmap & QQ plots")
 
 print(f"\n⏰ End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
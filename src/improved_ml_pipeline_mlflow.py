@@ -14,7 +14,6 @@ with full MLflow experiment tracking integration (Phase 3):
 
 import os
 import sys
-import json
 import warnings
 from datetime import datetime
 
@@ -24,7 +23,6 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import scipy.stats as stats
 import mlflow
-from mlflow.data.pandas_dataset import PandasDataset
 
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
@@ -33,7 +31,7 @@ import shap
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.ml_utils import (
+from src.ml_utils import (  # noqa: E402
     validate_train_test_features,
     check_missing_values,
     adjusted_r2,
@@ -42,7 +40,7 @@ from src.ml_utils import (
     load_config,
     log_data_split_info
 )
-from src.mlflow_tracker import MLflowTracker
+from src.mlflow_tracker import MLflowTracker  # noqa: E402
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
@@ -73,18 +71,18 @@ sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (10, 6)
 plt.rcParams['font.size'] = 10
 
-print("="*80)
+print("=" * 80)
 print("🎵 IMPROVED ML PIPELINE WITH MLFLOW - SPOTIFY TRACK POPULARITY PREDICTION")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
 # ============================================================================
 # INITIALIZE MLFLOW TRACKING
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔬 INITIALIZE MLFLOW TRACKING")
-print("="*80)
+print("=" * 80)
 
 tracker = MLflowTracker(
     experiment_name="spotify_popularity_prediction",
@@ -104,9 +102,9 @@ run = tracker.start_run(
 # STEP 1: LOAD DATA
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📂 STEP 1: LOAD DATA")
-print("="*80)
+print("=" * 80)
 
 if not os.path.exists(DATA_PATH):
     print(f"❌ Error: Cleaned data not found at {DATA_PATH}")
@@ -118,7 +116,8 @@ df = pd.read_csv(DATA_PATH)
 print(f"✅ Loaded data: {df.shape[0]:,} rows, {df.shape[1]} columns")
 
 # Display basic info
-print(f"\nColumns: {list(df.columns)[:10]}..." if len(df.columns) > 10 else f"\nColumns: {list(df.columns)}")
+print(f"\nColumns: {list(df.columns)[:10]}..." if len(df.columns) > 10
+      else f"\nColumns: {list(df.columns)}")
 
 # Log dataset to MLflow (as first-class dataset object, not just tags)
 print("\n📊 Logging dataset to MLflow...")
@@ -136,9 +135,9 @@ print(f"✅ Dataset logged: {dataset.name} ({len(df)} rows, {len(df.columns)} co
 # STEP 2: FEATURE SELECTION & PREPARATION
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔧 STEP 2: FEATURE SELECTION & PREPARATION")
-print("="*80)
+print("=" * 80)
 
 # Define target and features
 target_col = 'popularity'
@@ -183,9 +182,9 @@ tracker.log_dict({
 # STEP 3: DATA SPLITTING (WITH SEPARATE VALIDATION SET)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✂️  STEP 3: DATA SPLITTING (Phase 1 Improvement)")
-print("="*80)
+print("=" * 80)
 
 # Split into train+val (80%) and test (20%)
 X_train_full, X_test, y_train_full, y_test = train_test_split(
@@ -222,13 +221,13 @@ check_missing_values(X_train, X_test)
 # STEP 4: LOAD MODEL CONFIGURATION
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("⚙️  STEP 4: LOAD MODEL CONFIGURATION (Phase 2 Improvement)")
-print("="*80)
+print("=" * 80)
 
 # PHASE 2: Load from JSON config
 params = load_config(CONFIG_PATH)
-print(f"\nModel Parameters:")
+print("\nModel Parameters:")
 for key, value in params.items():
     print(f"  {key}: {value}")
 
@@ -240,9 +239,9 @@ tracker.log_params(params)
 # STEP 5: TRAIN MODEL WITH LEARNING CURVES
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🤖 STEP 5: TRAIN XGBOOST MODEL")
-print("="*80)
+print("=" * 80)
 
 # Initialize model
 model = XGBRegressor(**params)
@@ -257,7 +256,7 @@ model.fit(
     verbose=False
 )
 
-print(f"✅ Model trained successfully!")
+print("✅ Model trained successfully!")
 print(f"Best iteration: {model.best_iteration if hasattr(model, 'best_iteration') else 'N/A'}")
 
 # Log model training info
@@ -292,9 +291,9 @@ plt.close()
 # STEP 6: PREDICTIONS & EVALUATION
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📊 STEP 6: PREDICTIONS & EVALUATION")
-print("="*80)
+print("=" * 80)
 
 # Make predictions
 y_train_pred = model.predict(X_train)
@@ -352,9 +351,9 @@ tracker.log_metrics(metrics)
 # STEP 7: VISUALIZATIONS
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📊 STEP 7: VISUALIZATIONS")
-print("="*80)
+print("=" * 80)
 
 # 7.1: Actual vs Predicted (Test Set)
 plt.figure(figsize=(10, 6))
@@ -369,7 +368,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 actual_pred_path = os.path.join(PLOTS_DIR, 'actual_vs_predicted.png')
 plt.savefig(actual_pred_path, dpi=300, bbox_inches='tight')
-print(f"✅ Actual vs Predicted plot saved")
+print("✅ Actual vs Predicted plot saved")
 tracker.log_figure(plt.gcf(), 'actual_vs_predicted.png')
 plt.close()
 
@@ -387,7 +386,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 density_path = os.path.join(PLOTS_DIR, 'prediction_density.png')
 plt.savefig(density_path, dpi=300, bbox_inches='tight')
-print(f"✅ Density plot saved")
+print("✅ Density plot saved")
 tracker.log_figure(plt.gcf(), 'prediction_density.png')
 plt.close()
 
@@ -404,7 +403,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 residuals_path = os.path.join(PLOTS_DIR, 'residuals_plot.png')
 plt.savefig(residuals_path, dpi=300, bbox_inches='tight')
-print(f"✅ Residuals plot saved")
+print("✅ Residuals plot saved")
 tracker.log_figure(plt.gcf(), 'residuals_plot.png')
 plt.close()
 
@@ -417,7 +416,7 @@ plt.grid(True, alpha=0.3)
 plt.tight_layout()
 qq_path = os.path.join(PLOTS_DIR, 'qq_plot_residuals.png')
 plt.savefig(qq_path, dpi=300, bbox_inches='tight')
-print(f"✅ QQ plot saved")
+print("✅ QQ plot saved")
 tracker.log_figure(plt.gcf(), 'qq_plot_residuals.png')
 plt.close()
 
@@ -436,7 +435,7 @@ plt.title('Feature Correlation Heatmap (with Target)')
 plt.tight_layout()
 corr_path = os.path.join(PLOTS_DIR, 'correlation_heatmap.png')
 plt.savefig(corr_path, dpi=300, bbox_inches='tight')
-print(f"✅ Correlation heatmap saved")
+print("✅ Correlation heatmap saved")
 tracker.log_figure(plt.gcf(), 'correlation_heatmap.png')
 plt.close()
 
@@ -445,9 +444,9 @@ plt.close()
 # STEP 8: FEATURE IMPORTANCE (STANDARD)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔍 STEP 8: FEATURE IMPORTANCE (Standard)")
-print("="*80)
+print("=" * 80)
 
 # Standard feature importance
 feature_importance = pd.DataFrame({
@@ -467,7 +466,7 @@ plt.ylabel('Feature')
 plt.tight_layout()
 feature_imp_path = os.path.join(PLOTS_DIR, 'feature_importance.png')
 plt.savefig(feature_imp_path, dpi=300, bbox_inches='tight')
-print(f"✅ Feature importance plot saved")
+print("✅ Feature importance plot saved")
 tracker.log_figure(plt.gcf(), 'feature_importance.png')
 plt.close()
 
@@ -476,9 +475,9 @@ plt.close()
 # STEP 9: SHAP VALUES (CRITICAL - PHASE 1)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔬 STEP 9: SHAP VALUES - MODEL EXPLAINABILITY (Phase 1 CRITICAL)")
-print("="*80)
+print("=" * 80)
 
 print("Computing SHAP values (this may take a few minutes for large datasets)...")
 
@@ -501,7 +500,7 @@ shap.summary_plot(shap_values, X_test_shap, plot_type="bar", show=False)
 plt.tight_layout()
 shap_bar_path = os.path.join(PLOTS_DIR, 'xgboost_shap_summary_bar.png')
 plt.savefig(shap_bar_path, dpi=300, bbox_inches='tight')
-print(f"✅ SHAP summary bar plot saved")
+print("✅ SHAP summary bar plot saved")
 tracker.log_figure(plt.gcf(), 'shap_summary_bar.png')
 plt.close()
 
@@ -512,7 +511,7 @@ shap.summary_plot(shap_values, X_test_shap, show=False)
 plt.tight_layout()
 shap_beeswarm_path = os.path.join(PLOTS_DIR, 'xgboost_shap_beeswarm.png')
 plt.savefig(shap_beeswarm_path, dpi=300, bbox_inches='tight')
-print(f"✅ SHAP beeswarm plot saved")
+print("✅ SHAP beeswarm plot saved")
 tracker.log_figure(plt.gcf(), 'shap_beeswarm.png')
 plt.close()
 
@@ -529,9 +528,9 @@ print(f"✅ SHAP values exported to: {shap_export_path}")
 # STEP 10: SAVE MODEL & METADATA (PHASE 1)
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("💾 STEP 10: SAVE MODEL & METADATA (Phase 1 Improvement)")
-print("="*80)
+print("=" * 80)
 
 # Create comprehensive metadata
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -565,9 +564,9 @@ tracker.log_artifact(metadata_path, "metadata")
 # SUMMARY
 # ============================================================================
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✨ PIPELINE COMPLETE!")
-print("="*80)
+print("=" * 80)
 
 print("\n📊 Final Test Set Performance:")
 print(f"  RMSE: {test_rmse:.4f}")
@@ -590,12 +589,12 @@ print("  ✅ Phase 2: Adjusted R² metric")
 print("  ✅ Phase 2: Correlation heatmap & QQ plots")
 print("  ✅ Phase 3: Full MLflow experiment tracking")
 
-print(f"\n🔍 View results in MLflow UI:")
-print(f"   Run: make mlflow-ui")
-print(f"   Or:  mlflow ui --backend-store-uri sqlite:///mlruns/mlflow.db")
+print("\n🔍 View results in MLflow UI:")
+print("   Run: make mlflow-ui")
+print("   Or:  mlflow ui --backend-store-uri sqlite:///mlruns/mlflow.db")
 
 print(f"\n⏰ End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
 
 # End MLflow run
 tracker.end_run(status="FINISHED")
@@ -0,0 +1,150 @@
+"""
+Persisted Imputation Statistics
+
+Fits the imputation values (median of numeric columns, mode of categorical
+columns) and the observed value range of each numeric column once, on the
+cleaned dataset, and stores them as a small versioned JSON artifact. The ETL,
+the training scripts and the dashboards load the artifact, so missing values
+are filled with the same values everywhere by dictionary lookup instead of
+recomputing column medians.
+
+The ranges are the observed min/max, not validation rules: delta runs only
+warn about new rows outside them. Rows are validated (and quarantined) by the
+rules in src/validation.py.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Artifact written by the ETL next to the cleaned dataset
+STATS_FILE = "imputation_stats.json"
+DEFAULT_STATS_PATH = f"data/processed/{STATS_FILE}"
+
+# Format version of the artifact; bump when fields change meaning
+STATS_FORMAT_VERSION = 1
+
+# Defaults of model features the cleaned dataset has no statistics for
+FALLBACK_DEFAULTS = {'release_year': 2020}
+
+
+def _to_builtin(value):
+    """Convert numpy/pandas scalars to JSON-serializable Python values"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+@dataclass
+class ImputationStats:
+    """Fill values and observed ranges of the cleaned dataset"""
+    fill_values: Dict[str, object]
+    ranges: Dict[str, Tuple[float, float]]
+    n_rows: int = 0
+    created: str = field(default_factory=lambda: datetime.now().isoformat())
+    format_version: int = STATS_FORMAT_VERSION
+
+    @property
+    def version(self) -> str:
+        """Short content hash identifying these statistics"""
+        payload = json.dumps({'fill_values': self.fill_values, 'ranges': self.ranges},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, columns: List[str] = None) -> "ImputationStats":
+        """
+        Fit fill values and ranges on a cleaned dataframe.
+
+        Fitting on the already imputed frame gives the same values as fitting
+        before imputation, since filling with the median/mode leaves both
+        unchanged.
+
+        Args:
+            df: Cleaned dataframe
+            columns: Columns to fit (default: all)
+
+        Returns:
+            Fitted statistics
+        """
+        columns = columns if columns is not None else list(df.columns)
+        fill_values = {}
+        ranges = {}
+
+        for col in columns:
+            series = df[col]
+            if pd.api.types.is_bool_dtype(series):
+                mode = series.mode()
+                if not mode.empty:
+                    fill_values[col] = bool(mode.iloc[0])
+            elif pd.api.types.is_numeric_dtype(series):
+                if series.notna().any():
+                    fill_values[col] = _to_builtin(series.median())
+                    ranges[col] = (_to_builtin(series.min()), _to_builtin(series.max()))
+            else:
+                mode = series.mode()
+                if not mode.empty:
+                    fill_values[col] = _to_builtin(mode.iloc[0])
+
+        return cls(fill_values=fill_values, ranges=ranges, n_rows=len(df))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STATS_PATH) -> "ImputationStats":
+        """Load statistics saved with save()"""
+        data = json.loads(Path(path).read_text())
+        if data.get('format_version', 1) > STATS_FORMAT_VERSION:
+            raise ValueError(f"{path} has format version {data['format_version']}, "
+                             f"this code reads up to {STATS_FORMAT_VERSION}")
+        data.pop('version', None)
+        data['ranges'] = {col: tuple(bounds) for col, bounds in data['ranges'].items()}
+        stats = cls(**data)
+        logger.info(f"Loaded imputation stats {stats.version} ({len(stats.fill_values)} columns) "
+                    f"from {path}")
+        return stats
+
+    def save(self, path: str = DEFAULT_STATS_PATH) -> Path:
+        """Save the statistics as JSON"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = asdict(self)
+        data['version'] = self.version
+        path.write_text(json.dumps(data, indent=2, default=str))
+        logger.info(f"Saved imputation stats {self.version} to {path}")
+        return path
+
+    def fill(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill missing values of the columns that have statistics"""
+        return df.fillna({col: value for col, value in self.fill_values.items()
+                          if col in df.columns})
+
+    def defaults(self, columns: Iterable[str], fallback: object = 0) -> Dict[str, object]:
+        """Default of each column: its fill value, else its FALLBACK_DEFAULTS entry or fallback"""
+        return {col: self.fill_values.get(col, FALLBACK_DEFAULTS.get(col, fallback))
+                for col in columns}
+
+    def out_of_range(self, df: pd.DataFrame) -> Dict[str, int]:
+        """Number of values outside the observed range, per column (for warnings, not validation)"""
+        counts = {}
+        for col, (low, high) in self.ranges.items():
+            if col in df.columns:
+                n = int((~df[col].between(low, high) & df[col].notna()).sum())
+                if n:
+                    counts[col] = n
+        return counts
+
+
+def load_stats(path: str = DEFAULT_STATS_PATH) -> Optional[ImputationStats]:
+    """Load the statistics artifact if it exists, else None"""
+    if not Path(path).exists():
+        logger.warning(f"No imputation stats at {path} - run the ETL pipeline to create them")
+        return None
+    return ImputationStats.load(path)
@@ -80,7 +80,7 @@ def adjusted_r2(r2: float, n: int, k: int) -> float:
         >>> print(f"Adjusted R²: {adj_r2:.4f}")
     """
     if n <= k + 1:
-        raise ValueError(f"Sample size (n={n}) must be greater than features + 1 (k+1={k+1})")
+        raise ValueError(f"Sample size (n={n}) must be greater than features + 1 (k+1={k + 1})")
 
     return 1 - (1 - r2) * (n - 1) / (n - k - 1)
 
@@ -112,8 +112,6 @@ def get_environment_info() -> Dict[str, str]:
     try:
         import sklearn
         import xgboost
-        import pandas as pd
-        import numpy as np
         import shap
 
         env_info = {
@@ -242,15 +240,16 @@ def log_data_split_info(
     """
     total_samples = len(X_train) + len(X_val) + len(X_test)
 
-    print("\n" + "="*60)
+    print("\n" + "=" * 60)
     print("📊 DATA SPLIT SUMMARY")
-    print("="*60)
-    print(f"Training set:   {X_train.shape[0]:,} samples ({100*len(X_train)/total_samples:.1f}%)")
-    print(f"Validation set: {X_val.shape[0]:,} samples ({100*len(X_val)/total_samples:.1f}%)")
-    print(f"Test set:       {X_test.shape[0]:,} samples ({100*len(X_test)/total_samples:.1f}%)")
+    print("=" * 60)
+    print(f"Training set:   {X_train.shape[0]:,} samples "
+          f"({100 * len(X_train) / total_samples:.1f}%)")
+    print(f"Validation set: {X_val.shape[0]:,} samples ({100 * len(X_val) / total_samples:.1f}%)")
+    print(f"Test set:       {X_test.shape[0]:,} samples ({100 * len(X_test) / total_samples:.1f}%)")
     print(f"Total:          {total_samples:,} samples")
     print(f"Features:       {X_train.shape[1]}")
-    print("="*60 + "\n")
+    print("=" * 60 + "\n")
 
     # Check target distribution
     print("Target distribution (popularity):")
@@ -380,7 +380,7 @@ def track_experiment(
                     tracker.log_artifact(path, artifact_path=artifact_type)
 
         tracker.end_run(status="FINISHED")
-        print(f"\n✅ Experiment tracked successfully!")
+        print("\n✅ Experiment tracked successfully!")
         print(f"   Run ID: {run.info.run_id}")
         print(f"   View in UI: mlflow ui --backend-store-uri {tracker.tracking_uri}")
 
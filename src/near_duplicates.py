@@ -0,0 +1,187 @@
+"""
+Tolerance-Based Near-Duplicate Detection
+
+Finds tracks whose audio features differ only by float noise (catalog
+re-releases, remasters with re-computed features) without comparing all
+pairs of tracks.
+
+Features are scaled to [0, 1] and two tracks are near duplicates when every
+feature differs by at most the tolerance. Tracks are blocked on a grid of
+cell width = tolerance over a few blocking features, so a near duplicate
+always lies in the same or an adjacent cell. Only pairs from neighbouring
+cells are compared, which keeps the cost roughly linear in the number of
+tracks; candidate pairs are generated in batches of at most
+MAX_CANDIDATE_PAIRS, so a dense cell costs time but not memory.
+
+Tracks are grouped around representatives rather than by chaining pairs:
+in popularity order, a track joins the most popular representative it is a
+near duplicate of, or becomes a representative itself. Every track is then
+within the tolerance of its group's representative, so a chain of small
+differences cannot merge clearly different tracks.
+"""
+
+import itertools
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+
+from src.fingerprint_index import AUDIO_FEATURES
+
+logger = logging.getLogger(__name__)
+
+# Value range of each audio feature, used to scale it to [0, 1].
+# Features not listed are already in [0, 1].
+FEATURE_RANGES: Dict[str, Tuple[float, float]] = {
+    'loudness': (-60.0, 5.0),
+    'tempo': (0.0, 250.0),
+}
+
+# Features that define the blocking grid (spread out and rarely tied)
+BLOCK_FEATURES = ['tempo', 'loudness', 'energy']
+
+DEFAULT_TOLERANCE = 0.002
+
+# Most candidate pairs materialized at once while scanning neighbouring cells
+MAX_CANDIDATE_PAIRS = 4_000_000
+
+
+def _scaled_features(df: pd.DataFrame, features: List[str]) -> np.ndarray:
+    """Audio features scaled to [0, 1] as an (n_rows, n_features) array"""
+    columns = []
+    for feature in features:
+        low, high = FEATURE_RANGES.get(feature, (0.0, 1.0))
+        values = df[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+        columns.append((values - low) / (high - low))
+    return np.column_stack(columns)
+
+
+def _batches(counts: np.ndarray, max_pairs: int) -> List[Tuple[int, int]]:
+    """Ranges of rows whose candidate counts sum to at most max_pairs (or a single row)"""
+    ends = np.cumsum(counts)
+    bounds, start = [], 0
+    while start < len(counts):
+        offset = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, offset + max_pairs, side='right')), start + 1)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def near_duplicate_groups(df: pd.DataFrame, tolerance: float = DEFAULT_TOLERANCE,
+                          features: List[str] = None,
+                          block_features: List[str] = None) -> np.ndarray:
+    """
+    Group tracks whose scaled audio features all differ by at most tolerance
+    from the group's representative (its most popular track).
+
+    Args:
+        df: Dataframe containing the audio feature columns
+        tolerance: Maximum per-feature difference, as a fraction of the
+            feature's range
+        features: Features compared (default: AUDIO_FEATURES present in df)
+        block_features: Features used for blocking (default: BLOCK_FEATURES
+            present in df)
+
+    Returns:
+        int64 array with a group label per row (the row position of the
+        group's representative); every row is a near duplicate of the
+        representative of its group
+    """
+    if tolerance <= 0:
+        raise ValueError(f"tolerance must be positive, got {tolerance}")
+
+    n = len(df)
+    features = features or [f for f in AUDIO_FEATURES if f in df.columns]
+    block_features = [f for f in (block_features or BLOCK_FEATURES) if f in features] \
+        or features[:1]
+    if n == 0 or not features:
+        return np.arange(n, dtype=np.int64)
+
+    values = _scaled_features(df, features)
+    valid = ~np.isnan(values).any(axis=1)
+
+    # Grid cell of each row on the blocking features, packed into one int64
+    block = values[:, [features.index(f) for f in block_features]]
+    cells = np.floor(np.nan_to_num(block) / tolerance).astype(np.int64)
+    cells -= cells.min(axis=0)
+    base = int(cells.max()) + 3
+    if base ** len(block_features) >= 2 ** 62:
+        raise ValueError(f"tolerance {tolerance} is too small for {len(block_features)} "
+                         "blocking features")
+    weights = base ** np.arange(len(block_features), dtype=np.int64)
+    keys = (cells + 1) @ weights
+
+    candidates = np.flatnonzero(valid)
+    order = candidates[np.argsort(keys[candidates], kind='stable')]
+    sorted_keys = keys[order]
+
+    # Visit each pair of neighbouring cells once: the cell itself and the
+    # "positive" half of its 3**k - 1 neighbours
+    offsets = [o for o in itertools.product((-1, 0, 1), repeat=len(block_features))
+               if o >= (0,) * len(o)]
+
+    rows, cols = [], []
+    for offset in offsets:
+        target = sorted_keys + np.asarray(offset, dtype=np.int64) @ weights
+        start = np.searchsorted(sorted_keys, target, side='left')
+        stop = np.searchsorted(sorted_keys, target, side='right')
+        if not any(offset):
+            # Same cell: only pairs (i, j) with j after i
+            start = np.maximum(start, np.arange(len(order)) + 1)
+        counts = np.maximum(stop - start, 0)
+        if not counts.sum():
+            continue
+
+        for first, last in _batches(counts, MAX_CANDIDATE_PAIRS):
+            batch_counts = counts[first:last]
+            left = np.repeat(np.arange(first, last), batch_counts)
+            batch_starts = np.cumsum(batch_counts) - batch_counts
+            right = np.arange(batch_counts.sum()) - np.repeat(batch_starts, batch_counts) \
+                + np.repeat(start[first:last], batch_counts)
+            left, right = order[left], order[right]
+
+            close = (np.abs(values[left] - values[right]) <= tolerance).all(axis=1)
+            rows.append(left[close])
+            cols.append(right[close])
+
+    rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    logger.info(f"Found {len(rows):,} near-duplicate pairs (tolerance {tolerance})")
+
+    # Representatives, most popular first (ties: first row). Only rows with a
+    # near duplicate are visited; every other row is its own group.
+    popularity = df['popularity'].to_numpy(dtype=np.float64, na_value=-np.inf) \
+        if 'popularity' in df.columns else np.zeros(n)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(-popularity, kind='stable')] = np.arange(n)
+    both = (np.concatenate([rows, cols]), np.concatenate([cols, rows]))
+    neighbours = coo_matrix((np.ones(2 * len(rows), dtype=np.int8), both), shape=(n, n)).tocsr()
+
+    labels = np.arange(n, dtype=np.int64)
+    is_representative = np.ones(n, dtype=bool)
+    paired = np.unique(np.concatenate([rows, cols]))
+    for row in paired[np.argsort(rank[paired], kind='stable')]:
+        candidates = neighbours.indices[neighbours.indptr[row]:neighbours.indptr[row + 1]]
+        candidates = candidates[is_representative[candidates] & (rank[candidates] < rank[row])]
+        if len(candidates):
+            labels[row] = candidates[np.argmin(rank[candidates])]
+            is_representative[row] = False
+    return labels
+
+
+def near_duplicate_mask(df: pd.DataFrame, tolerance: float = DEFAULT_TOLERANCE,
+                        features: List[str] = None, block_features: List[str] = None) -> np.ndarray:
+    """
+    Boolean mask keeping one track per near-duplicate group.
+
+    The group's representative is kept: its most popular track, or the first
+    one if tied.
+
+    Returns:
+        Boolean array, True for rows to keep
+    """
+    labels = near_duplicate_groups(df, tolerance, features, block_features)
+    return labels == np.arange(len(df))
@@ -5,19 +5,24 @@ Quick script to retrain and save the best Random Forest model from Optuna tuning
 Uses the optimal hyperparameters discovered in the tuning phase.
 """
 
+import os
+import sys
 import pandas as pd
 import joblib
 import json
 from pathlib import Path
 from datetime import datetime
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 import numpy as np
+import sklearn
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.splits import hash_split  # noqa: E402
 
-print("="*80)
+print("=" * 80)
 print("💾 SAVING TUNED RANDOM FOREST MODEL")
-print("="*80)
+print("=" * 80)
 
 # Load best parameters from tuning results
 results_file = sorted(Path('outputs/metadata').glob('rf_tuning_results_*.json'))[-1]
@@ -27,7 +32,7 @@ with open(results_file, 'r') as f:
     tuning_results = json.load(f)
 
 best_params = tuning_results['optuna']['best_params']
-print(f"\nBest parameters:")
+print("\nBest parameters:")
 for param, value in best_params.items():
     print(f"  {param}: {value}")
 
@@ -49,13 +54,11 @@ y = df['popularity'].copy()
 mask = ~(X.isnull().any(axis=1) | y.isnull())
 X, y = X[mask], y[mask]
 
-# Same split as tuning: 70% train, 15% val, 15% test
-X_train, X_temp, y_train, y_temp = train_test_split(
-    X, y, test_size=0.3, random_state=42
-)
-X_val, X_test, y_val, y_test = train_test_split(
-    X_temp, y_temp, test_size=0.5, random_state=42
-)
+# Same split as tuning: 70% train, 15% val, 15% test, assigned by track_id hash
+split = hash_split(df.loc[X.index, 'track_id'], test_size=0.15, val_size=0.15, random_state=42)
+X_train, y_train = X.iloc[split['train']], y.iloc[split['train']]
+X_val, y_val = X.iloc[split['val']], y.iloc[split['val']]
+X_test, y_test = X.iloc[split['test']], y.iloc[split['test']]
 
 print(f"✓ Train: {X_train.shape[0]:,} samples")
 print(f"✓ Val: {X_val.shape[0]:,} samples")
@@ -84,7 +87,7 @@ test_r2 = r2_score(y_test, y_test_pred)
 test_rmse = np.sqrt(mean_squared_error(y_test, y_test_pred))
 test_mae = mean_absolute_error(y_test, y_test_pred)
 
-print(f"\nTest Performance:")
+print("\nTest Performance:")
 print(f"  R² = {test_r2:.4f}")
 print(f"  RMSE = {test_rmse:.2f}")
 print(f"  MAE = {test_mae:.2f}")
@@ -94,13 +97,11 @@ timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 model_path = Path(f'outputs/models/rf_model_full_{timestamp}.joblib')
 model_path.parent.mkdir(parents=True, exist_ok=True)
 
-print(f"\nSaving model...")
+print("\nSaving model...")
 joblib.dump(model, model_path)
 print(f"✓ Model saved: {model_path}")
 
 # Save metadata
-import sklearn
-
 metadata = {
     'timestamp': datetime.now().isoformat(),
     'model_type': 'RandomForestRegressor',
@@ -130,9 +131,9 @@ with open(metadata_path, 'w') as f:
     json.dump(metadata, f, indent=2)
 print(f"✓ Metadata saved: {metadata_path}")
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✅ RANDOM FOREST MODEL SAVED SUCCESSFULLY")
-print("="*80)
+print("=" * 80)
 print(f"\nModel: {model_path.name}")
 print(f"Test R²: {test_r2:.4f}")
 print(f"Test RMSE: {test_rmse:.2f}")
@@ -0,0 +1,210 @@
+"""
+Train/Validation/Test Split Manifests
+
+A split is stored as compact int32 row-index arrays into the dataset it was
+drawn from, plus a content hash of that dataset, instead of as copies of the
+rows in X_train/X_test/... Parquet files. Scripts slice the feature store (or
+any frame with the same rows) with the indices, so every script that uses a
+manifest sees the same split, and a manifest for different data is rejected
+rather than silently misaligned.
+
+With method='hash' each row's split is derived from a hash of its track_id
+(hash_split) instead of a shuffle of all current rows, so a track keeps its
+split forever: adding tracks only assigns the new ones, and models and
+metrics computed on earlier versions of the data stay comparable.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPLITS_DIR = "data/processed/splits"
+
+SPLIT_METHODS = ('random', 'hash')
+
+
+def frame_hash(X: pd.DataFrame, y: pd.Series = None) -> str:
+    """Short content hash of a feature frame (column names, values and row order) and target"""
+    # Categorical columns are hashed by their codes
+    X = X.assign(**{col: X[col].cat.codes for col in X.columns
+                    if isinstance(X[col].dtype, pd.CategoricalDtype)})
+    digest = hashlib.sha256(json.dumps(list(map(str, X.columns))).encode())
+    digest.update(np.ascontiguousarray(X.to_numpy(dtype=np.float64)).tobytes())
+    if y is not None:
+        digest.update(np.ascontiguousarray(y.to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def make_split(n_rows: int, test_size: float, val_size: float = None,
+               random_state: int = 42) -> Dict[str, np.ndarray]:
+    """
+    Draw train/(val)/test row indices.
+
+    Uses train_test_split on the row positions, so the rows (and their order)
+    are the same as splitting the data itself with the same arguments: first
+    test_size of all rows, then val_size of all rows from the remainder.
+
+    Returns:
+        Dictionary of split name -> int32 row indices
+    """
+    rows = np.arange(n_rows, dtype=np.int32)
+    train, test = train_test_split(rows, test_size=test_size, random_state=random_state,
+                                   shuffle=True)
+    if not val_size:
+        return {'train': train, 'test': test}
+    train, val = train_test_split(train, test_size=val_size / (1 - test_size),
+                                  random_state=random_state, shuffle=True)
+    return {'train': train, 'val': val, 'test': test}
+
+
+def assign_splits(keys: Iterable, test_size: float, val_size: float = None,
+                  random_state: int = 42) -> np.ndarray:
+    """
+    Split of each key ('train', 'val' or 'test') from a hash of the key alone.
+
+    The first 8 bytes of sha256("<random_state>:<key>") give a uniform
+    position in [0, 1): test below test_size, val below test_size + val_size,
+    train above. The assignment does not depend on any other row, so it never
+    changes as rows are added or removed and a new key is assigned in O(1).
+    Split sizes match the fractions up to sampling noise.
+
+    Args:
+        keys: Row keys (track_id)
+        test_size: Fraction of keys assigned to test
+        val_size: Fraction of keys assigned to val (None = no validation split)
+        random_state: Salt; a different value gives a different, equally stable split
+
+    Returns:
+        Array of split names, one per key
+    """
+    positions = np.fromiter(
+        (int.from_bytes(hashlib.sha256(f"{random_state}:{key}".encode()).digest()[:8], 'big')
+         for key in keys),
+        dtype=np.uint64,
+    ) / 2.0 ** 64
+    return np.where(positions < test_size, 'test',
+                    np.where(positions < test_size + (val_size or 0), 'val', 'train'))
+
+
+def hash_split(keys: Iterable, test_size: float, val_size: float = None,
+               random_state: int = 42) -> Dict[str, np.ndarray]:
+    """
+    Train/(val)/test row indices from a hash of each row's key (see assign_splits).
+
+    Returns:
+        Dictionary of split name -> int32 row indices (in row order)
+    """
+    splits = assign_splits(keys, test_size, val_size, random_state)
+    names = ['train', 'val', 'test'] if val_size else ['train', 'test']
+    return {name: np.flatnonzero(splits == name).astype(np.int32) for name in names}
+
+
+@dataclass
+class SplitManifest:
+    """Row indices of each split and the hash of the dataset they index"""
+    name: str
+    source_hash: str
+    n_rows: int
+    indices: Dict[str, np.ndarray]
+    params: Dict[str, object] = field(default_factory=dict)
+    created: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @classmethod
+    def create(cls, name: str, X: pd.DataFrame, y: pd.Series = None, test_size: float = 0.2,
+               val_size: float = None, random_state: int = 42,
+               method: str = 'random') -> "SplitManifest":
+        """
+        Draw a new split of the rows of X.
+
+        method='random' shuffles the current rows (make_split); method='hash'
+        assigns each row from its track_id (hash_split), which X must be
+        indexed by.
+        """
+        if method not in SPLIT_METHODS:
+            raise ValueError(f"Unknown split method '{method}', expected one of {SPLIT_METHODS}")
+        if method == 'hash':
+            if X.index.name != 'track_id':
+                raise ValueError("Hash splits need X indexed by track_id")
+            indices = hash_split(X.index, test_size, val_size, random_state)
+        else:
+            indices = make_split(len(X), test_size, val_size, random_state)
+        params = {'test_size': test_size, 'val_size': val_size, 'random_state': random_state,
+                  'method': method}
+        return cls(name, frame_hash(X, y), len(X), indices, params)
+
+    @classmethod
+    def load(cls, path: str) -> "SplitManifest":
+        """Load a manifest saved with save() (the .json file)"""
+        path = Path(path)
+        data = json.loads(path.read_text())
+        with np.load(path.with_suffix('.npz')) as arrays:
+            indices = {split: arrays[split] for split in data.pop('splits')}
+        return cls(indices=indices, **data)
+
+    @classmethod
+    def load_or_create(cls, name: str, X: pd.DataFrame, y: pd.Series = None,
+                       splits_dir: str = DEFAULT_SPLITS_DIR, **kwargs) -> "SplitManifest":
+        """
+        Reuse the saved manifest for X if there is one, else create and save it.
+
+        A saved manifest is only reused if it indexes the same data (same
+        hash) and was drawn with the same parameters. With method='hash' a
+        redrawn manifest keeps every earlier track in its split.
+        """
+        path = Path(splits_dir) / f"{name}.json"
+        if path.exists():
+            manifest = cls.load(path)
+            params = {'test_size': kwargs.get('test_size', 0.2), 'val_size': kwargs.get('val_size'),
+                      'random_state': kwargs.get('random_state', 42),
+                      'method': kwargs.get('method', 'random')}
+            if manifest.source_hash == frame_hash(X, y) and manifest.params == params:
+                logger.info(f"Reusing split manifest {path}")
+                return manifest
+            logger.info(f"Split manifest {path} is for other data or parameters - "
+                        "drawing a new split")
+        manifest = cls.create(name, X, y, **kwargs)
+        manifest.save(path)
+        return manifest
+
+    def save(self, path: str) -> Path:
+        """Save as <path>.json (metadata) and <path>.npz (indices)"""
+        path = Path(path).with_suffix('.json')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path.with_suffix('.npz'),
+                 **{split: rows.astype(np.int32) for split, rows in self.indices.items()})
+        path.write_text(json.dumps({
+            'name': self.name,
+            'source_hash': self.source_hash,
+            'n_rows': self.n_rows,
+            'params': self.params,
+            'created': self.created,
+            'splits': {split: int(len(rows)) for split, rows in self.indices.items()},
+        }, indent=2))
+        sizes = ', '.join(f'{split}={len(rows):,}' for split, rows in self.indices.items())
+        logger.info(f"Saved split manifest {path} ({sizes})")
+        return path
+
+    def verify(self, X: pd.DataFrame, y: pd.Series = None):
+        """Raise if X (and y) are not the rows the manifest was drawn from"""
+        source_hash = frame_hash(X, y)
+        if len(X) != self.n_rows or source_hash != self.source_hash:
+            raise ValueError(f"Split manifest '{self.name}' indexes {self.n_rows:,} rows with hash "
+                             f"{self.source_hash}, got {len(X):,} rows with hash {source_hash}")
+
+    def take(self, split: str, X: pd.DataFrame, y: pd.Series = None,
+             verify: bool = False) -> Tuple[pd.DataFrame, Optional[pd.Series]]:
+        """Rows of one split of X (and y)"""
+        if verify:
+            self.verify(X, y)
+        rows = self.indices[split]
+        return X.iloc[rows], (y.iloc[rows] if y is not None else None)
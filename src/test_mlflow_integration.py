@@ -11,12 +11,12 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.mlflow_tracker import MLflowTracker
-from src.ml_utils import adjusted_r2, load_config
+from src.mlflow_tracker import MLflowTracker  # noqa: E402
+from src.ml_utils import adjusted_r2, load_config  # noqa: E402
 
-print("="*80)
+print("=" * 80)
 print("🧪 TESTING MLFLOW INTEGRATION")
-print("="*80)
+print("=" * 80)
 
 np.random.seed(42)
 n_samples = 1000
@@ -33,11 +33,11 @@ data = {
 }
 
 popularity = (
-    10 * data['energy'] +
-    8 * data['danceability'] +
-    5 * data['valence'] +
-    np.random.randn(n_samples) * 5 +
-    50
+    10 * data['energy']
+    + 8 * data['danceability']
+    + 5 * data['valence']
+    + np.random.randn(n_samples) * 5
+    + 50
 )
 popularity = np.clip(popularity, 0, 100)
 
@@ -60,7 +60,7 @@ tracker = MLflowTracker(
 
 try:
     params = load_config('config/xgboost_params.json')
-except:
+except Exception:
     params = {
         'max_depth': 6,
         'learning_rate': 0.1,
@@ -131,16 +131,16 @@ tracker.log_dict({
 
 tracker.end_run(status="FINISHED")
 
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✅ MLFLOW INTEGRATION TEST COMPLETE!")
-print("="*80)
-print(f"\n📊 Test Results:")
+print("=" * 80)
+print("\n📊 Test Results:")
 print(f"   Test R²:          {test_r2:.4f}")
 print(f"   Test Adjusted R²: {test_adj_r2:.4f}")
 print(f"   Test RMSE:        {test_rmse:.4f}")
 print(f"   Test MAE:         {test_mae:.4f}")
 
-print(f"\n🔍 View results in MLflow UI:")
-print(f"   Run: make mlflow-ui")
-print(f"   Or:  mlflow ui --backend-store-uri sqlite:///mlruns/mlflow.db")
-print("\n" + "="*80)
+print("\n🔍 View results in MLflow UI:")
+print("   Run: make mlflow-ui")
+print("   Or:  mlflow ui --backend-store-uri sqlite:///mlruns/mlflow.db")
+print("\n" + "=" * 80)
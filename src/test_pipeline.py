@@ -8,9 +8,9 @@ import numpy as np
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-print("="*80)
+print("=" * 80)
 print("🧪 TESTING ML PIPELINE WITH SYNTHETIC DATA")
-print("="*80)
+print("=" * 80)
 
 np.random.seed(42)
 n_samples = 1000
@@ -30,11 +30,11 @@ data = {
 }
 
 popularity = (
-    10 * data['energy'] +
-    8 * data['danceability'] +
-    5 * data['valence'] +
-    np.random.randn(n_samples) * 5 +
-    50
+    10 * data['energy']
+    + 8 * data['danceability']
+    + 5 * data['valence']
+    + np.random.randn(n_samples) * 5
+    + 50
 )
 popularity = np.clip(popularity, 0, 100)
 data['popularity'] = popularity
@@ -45,6 +45,6 @@ df.to_csv(output_path, index=False)
 
 print(f"✅ Synthetic data saved to: {output_path}")
 print(f"\nDataset shape: {df.shape}")
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✅ Now run: python src/improved_ml_pipeline.py")
-print("="*80)
+print("=" * 80)
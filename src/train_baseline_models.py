@@ -11,30 +11,35 @@ Models trained:
 Purpose: Establish baseline performance for comparison with XGBoost
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import json
 from pathlib import Path
 from datetime import datetime
-from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*80)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.imputation_stats import load_stats  # noqa: E402
+from src.splits import hash_split  # noqa: E402
+
+print("=" * 80)
 print("🎵 TRAINING BASELINE MODELS ON CLEANED DATASET")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print()
 
 # ============================================================================
 # STEP 1: Load Cleaned Dataset
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📂 STEP 1: LOAD CLEANED DATASET")
-print("="*80)
+print("=" * 80)
 
 df = pd.read_parquet('data/processed/cleaned_spotify_data.parquet')
 print(f"✓ Loaded {len(df):,} tracks")
@@ -44,9 +49,9 @@ print()
 # ============================================================================
 # STEP 2: Prepare Features
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎯 STEP 2: PREPARE FEATURES")
-print("="*80)
+print("=" * 80)
 
 # Use same 9 audio features as XGBoost model
 feature_cols = [
@@ -57,12 +62,18 @@ feature_cols = [
 X = df[feature_cols].copy()
 y = df['popularity'].copy()
 
+# Fill missing features with the ETL's imputation stats (same values as XGBoost and the apps)
+imputation_stats = load_stats()
+if imputation_stats is not None:
+    X = imputation_stats.fill(X)
+    print(f"✓ Missing features filled with imputation stats {imputation_stats.version}")
+
 # Remove NaN values
 mask = ~(X.isnull().any(axis=1) | y.isnull())
 X, y = X[mask], y[mask]
 
 print(f"✓ Features: {feature_cols}")
-print(f"✓ Target: popularity")
+print("✓ Target: popularity")
 print(f"✓ Samples: {len(X):,}")
 print(f"✓ Features shape: {X.shape}")
 print(f"✓ Target range: {y.min():.1f} - {y.max():.1f} (mean: {y.mean():.1f})")
@@ -71,29 +82,28 @@ print()
 # ============================================================================
 # STEP 3: Train/Test Split
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("✂️  STEP 3: TRAIN/TEST SPLIT")
-print("="*80)
-
-# Use same split as XGBoost for fair comparison: 70% train, 15% val, 15% test
-X_train, X_temp, y_train, y_temp = train_test_split(
-    X, y, test_size=0.3, random_state=42
-)
-X_val, X_test, y_val, y_test = train_test_split(
-    X_temp, y_temp, test_size=0.5, random_state=42
-)
-
-print(f"✓ Train: {X_train.shape[0]:,} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Val: {X_val.shape[0]:,} samples ({X_val.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Test: {X_test.shape[0]:,} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
+print("=" * 80)
+
+# Use same split as XGBoost for fair comparison: 70% train, 15% val, 15% test,
+# assigned by track_id hash
+split = hash_split(df.loc[X.index, 'track_id'], test_size=0.15, val_size=0.15, random_state=42)
+X_train, y_train = X.iloc[split['train']], y.iloc[split['train']]
+X_val, y_val = X.iloc[split['val']], y.iloc[split['val']]
+X_test, y_test = X.iloc[split['test']], y.iloc[split['test']]
+
+print(f"✓ Train: {X_train.shape[0]:,} samples ({X_train.shape[0] / len(X) * 100:.1f}%)")
+print(f"✓ Val: {X_val.shape[0]:,} samples ({X_val.shape[0] / len(X) * 100:.1f}%)")
+print(f"✓ Test: {X_test.shape[0]:,} samples ({X_test.shape[0] / len(X) * 100:.1f}%)")
 print()
 
 # ============================================================================
 # STEP 4: Train Linear Regression
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 STEP 4: TRAIN LINEAR REGRESSION")
-print("="*80)
+print("=" * 80)
 
 lr_model = LinearRegression()
 print("Training Linear Regression...")
@@ -102,6 +112,8 @@ print("✓ Training complete")
 print()
 
 # Evaluate Linear Regression
+
+
 def evaluate_model(model, X, y, name=""):
     """Calculate metrics for a dataset"""
     y_pred = model.predict(X)
@@ -129,6 +141,7 @@ def evaluate_model(model, X, y, name=""):
         'mae': mae
     }
 
+
 lr_train_metrics = evaluate_model(lr_model, X_train, y_train, "Linear Regression - Training")
 lr_val_metrics = evaluate_model(lr_model, X_val, y_val, "Linear Regression - Validation")
 lr_test_metrics = evaluate_model(lr_model, X_test, y_test, "Linear Regression - Test")
@@ -136,9 +149,9 @@ lr_test_metrics = evaluate_model(lr_model, X_test, y_test, "Linear Regression -
 # ============================================================================
 # STEP 5: Train Random Forest
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🌲 STEP 5: TRAIN RANDOM FOREST")
-print("="*80)
+print("=" * 80)
 
 # Use default hyperparameters for baseline
 rf_model = RandomForestRegressor(
@@ -163,9 +176,9 @@ rf_test_metrics = evaluate_model(rf_model, X_test, y_test, "Random Forest - Test
 # ============================================================================
 # STEP 6: Compare with XGBoost
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📈 STEP 6: MODEL COMPARISON")
-print("="*80)
+print("=" * 80)
 
 # XGBoost metrics from previous training
 xgb_test_r2 = 0.1619
@@ -193,9 +206,9 @@ print()
 # ============================================================================
 # STEP 7: Save Results
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("💾 STEP 7: SAVE RESULTS")
-print("="*80)
+print("=" * 80)
 
 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -252,9 +265,12 @@ print()
 # ============================================================================
 # SUMMARY
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 BASELINE MODELS SUMMARY")
-print("="*80)
+print("=" * 80)
+
+lr_improvement = (xgb_test_r2 - lr_test_metrics['r2']) / lr_test_metrics['r2'] * 100
+rf_improvement = (xgb_test_r2 - rf_test_metrics['r2']) / rf_test_metrics['r2'] * 100
 
 print(f"""
 Dataset: 78,310 cleaned tracks (deduplicated, zero-popularity removed)
@@ -281,13 +297,13 @@ Key Insights:
 - Simple linear regression shows R² = {lr_test_metrics['r2']:.4f} (baseline)
 - Random Forest achieves R² = {rf_test_metrics['r2']:.4f} (tree-based baseline)
 - XGBoost achieves R² = {xgb_test_r2:.4f} (tuned model)
-- Improvement: XGBoost outperforms Linear Regression by {((xgb_test_r2 - lr_test_metrics['r2']) / lr_test_metrics['r2'] * 100):.1f}%
-- Improvement: XGBoost outperforms Random Forest by {((xgb_test_r2 - rf_test_metrics['r2']) / rf_test_metrics['r2'] * 100):.1f}%
+- Improvement: XGBoost outperforms Linear Regression by {lr_improvement:.1f}%
+- Improvement: XGBoost outperforms Random Forest by {rf_improvement:.1f}%
 
 All models limited by audio-only features (R² ~0.16 ceiling).
 Artist features expected to improve R² to 0.28-0.32.
 """)
 
-print("="*80)
+print("=" * 80)
 print(f"✅ BASELINE TRAINING COMPLETE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
@@ -18,12 +18,16 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 import joblib
-import mlflow
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from xgboost import XGBRegressor
 import optuna
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.imputation_stats import STATS_FILE, load_stats  # noqa: E402
+from src.feature_engineering import FeaturePipeline, pipeline_path_for  # noqa: E402
+from src.feature_store import STORE_DIR, FeatureStore, load_features  # noqa: E402
+from src.splits import DEFAULT_SPLITS_DIR, SplitManifest  # noqa: E402
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
@@ -36,36 +40,42 @@ np.random.seed(RANDOM_STATE)
 # ============================================================================
 BASE_DIR = Path(__file__).parent.parent
 DATA_PATH = BASE_DIR / "data" / "processed" / "cleaned_spotify_data.parquet"
+STATS_PATH = BASE_DIR / "data" / "processed" / STATS_FILE
+STORE_PATH = BASE_DIR / "data" / "processed" / STORE_DIR
 OUTPUTS_DIR = BASE_DIR / "outputs"
 PLOTS_DIR = OUTPUTS_DIR / "plots"
 MODELS_DIR = OUTPUTS_DIR / "models"
 METADATA_DIR = OUTPUTS_DIR / "metadata"
+SPLITS_PATH = BASE_DIR / DEFAULT_SPLITS_DIR
+SPLIT_NAME = "full"
 
 # Create directories
 for dir_path in [OUTPUTS_DIR, PLOTS_DIR, MODELS_DIR, METADATA_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
-print("="*80)
+print("=" * 80)
 print("🎵 TRAINING ON FULL SPOTIFY DATASET (114K SAMPLES)")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
 # ============================================================================
 # STEP 1: LOAD FULL DATASET
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📂 STEP 1: LOAD FULL DATASET")
-print("="*80)
+print("=" * 80)
 
-df = pd.read_parquet(DATA_PATH)
-print(f"✅ Loaded data: {len(df):,} rows, {df.shape[1]} columns")
+# Features come from the ETL's memory-mapped feature store (cleaned Parquet if absent)
+available_cols = FeatureStore.open(STORE_PATH).columns if FeatureStore.exists(STORE_PATH) \
+    else list(pd.read_parquet(DATA_PATH).columns)
+print(f"✅ Available columns: {len(available_cols)}")
 
 # ============================================================================
 # STEP 2: FEATURE SELECTION
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔧 STEP 2: FEATURE SELECTION")
-print("="*80)
+print("=" * 80)
 
 # Use only core audio features that exist and are meaningful
 # DO NOT use release_year - it doesn't exist in the dataset!
@@ -82,29 +92,28 @@ feature_cols = [
 ]
 
 # Verify all features exist
-missing_features = [f for f in feature_cols if f not in df.columns]
+missing_features = [f for f in feature_cols if f not in available_cols]
 if missing_features:
     print(f"⚠️  Missing features: {missing_features}")
-    feature_cols = [f for f in feature_cols if f in df.columns]
+    feature_cols = [f for f in feature_cols if f in available_cols]
 
 target_col = 'popularity'
 
 print(f"\n✓ Target: {target_col}")
 print(f"✓ Features ({len(feature_cols)}): {feature_cols}")
 
-# Extract features and target
-X = df[feature_cols].copy()
-y = df[target_col].copy()
-
-# Remove any rows with NaN
-mask = ~(X.isnull().any(axis=1) | y.isnull())
-X = X[mask]
-y = y[mask]
+# Extract features and target: missing features are filled with the ETL's
+# imputation stats (same values as the apps) and rows with NaN are left out
+X, y = load_features(feature_cols, store_path=STORE_PATH, data_path=DATA_PATH,
+                     stats_path=STATS_PATH)
+imputation_stats = load_stats(STATS_PATH)
+if imputation_stats is not None:
+    print(f"✓ Missing features filled with imputation stats {imputation_stats.version}")
 
 print(f"\n✅ Clean dataset: {len(X):,} samples, {len(feature_cols)} features")
 
 # Show feature distributions (should be natural ranges, NOT scaled)
-print(f"\n✓ Feature ranges (should be natural, not scaled):")
+print("\n✓ Feature ranges (should be natural, not scaled):")
 for col in feature_cols:
     print(f"  {col}: [{X[col].min():.3f}, {X[col].max():.3f}] "
           f"(mean: {X[col].mean():.3f}, std: {X[col].std():.3f})")
@@ -112,42 +121,38 @@ for col in feature_cols:
 # ============================================================================
 # STEP 3: TRAIN/TEST SPLIT
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("✂️  STEP 3: TRAIN/TEST SPLIT")
-print("="*80)
-
-# Split: 70% train, 15% validation, 15% test
-X_train_val, X_test, y_train_val, y_test = train_test_split(
-    X, y, test_size=0.15, random_state=RANDOM_STATE, shuffle=True
-)
+print("=" * 80)
 
-X_train, X_val, y_train, y_val = train_test_split(
-    X_train_val, y_train_val, test_size=0.15/(1-0.15), random_state=RANDOM_STATE, shuffle=True
-)
+# Split: 70% train, 15% validation, 15% test, assigned from a hash of each
+# track_id so tracks keep their split as the dataset grows. The row indices are
+# saved as a manifest and reused by every script that trains on the same features.
+split = SplitManifest.load_or_create(SPLIT_NAME, X, y, splits_dir=SPLITS_PATH, test_size=0.15,
+                                     val_size=0.15, random_state=RANDOM_STATE, method='hash')
+X_train, y_train = split.take('train', X, y)
+X_val, y_val = split.take('val', X, y)
+X_test, y_test = split.take('test', X, y)
 
-print(f"✓ Train: {len(X_train):,} samples ({len(X_train)/len(X)*100:.1f}%)")
-print(f"✓ Validation: {len(X_val):,} samples ({len(X_val)/len(X)*100:.1f}%)")
-print(f"✓ Test: {len(X_test):,} samples ({len(X_test)/len(X)*100:.1f}%)")
+print(f"✓ Train: {len(X_train):,} samples ({len(X_train) / len(X) * 100:.1f}%)")
+print(f"✓ Validation: {len(X_val):,} samples ({len(X_val) / len(X) * 100:.1f}%)")
+print(f"✓ Test: {len(X_test):,} samples ({len(X_test) / len(X) * 100:.1f}%)")
 
 # Verify distributions are similar
-print(f"\n✓ Target distribution check:")
+print("\n✓ Target distribution check:")
 print(f"  Train mean: {y_train.mean():.2f}, std: {y_train.std():.2f}")
 print(f"  Val mean: {y_val.mean():.2f}, std: {y_val.std():.2f}")
 print(f"  Test mean: {y_test.mean():.2f}, std: {y_test.std():.2f}")
 
-# Save test/train data for later use
-X_train.to_parquet(BASE_DIR / "data" / "processed" / "X_train_full.parquet")
-X_test.to_parquet(BASE_DIR / "data" / "processed" / "X_test_full.parquet")
-y_train.to_frame().to_parquet(BASE_DIR / "data" / "processed" / "y_train_full.parquet")
-y_test.to_frame().to_parquet(BASE_DIR / "data" / "processed" / "y_test_full.parquet")
-print(f"\n✅ Saved train/test splits to data/processed/")
+print(f"\n✅ Split manifest: {SPLITS_PATH / SPLIT_NAME}.json (hash {split.source_hash})")
 
 # ============================================================================
 # STEP 4: OPTUNA HYPERPARAMETER TUNING
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🎯 STEP 4: OPTUNA HYPERPARAMETER TUNING")
-print("="*80)
+print("=" * 80)
+
 
 def objective(trial):
     """Optuna objective function"""
@@ -182,13 +187,14 @@ def objective(trial):
 
     return rmse
 
+
 print("Running Optuna optimization (50 trials)...")
 study = optuna.create_study(direction='minimize', study_name='spotify_xgboost')
 study.optimize(objective, n_trials=50, show_progress_bar=True)
 
-print(f"\n✅ Best trial:")
+print("\n✅ Best trial:")
 print(f"  RMSE: {study.best_value:.4f}")
-print(f"\n✅ Best hyperparameters:")
+print("\n✅ Best hyperparameters:")
 best_params = study.best_params
 for key, value in best_params.items():
     print(f"  {key}: {value}")
@@ -196,9 +202,9 @@ for key, value in best_params.items():
 # ============================================================================
 # STEP 5: TRAIN FINAL MODEL
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("🤖 STEP 5: TRAIN FINAL MODEL")
-print("="*80)
+print("=" * 80)
 
 # Add fixed params
 final_params = {
@@ -223,9 +229,9 @@ print(f"\n✅ Model trained with {model.best_iteration} iterations")
 # ============================================================================
 # STEP 6: EVALUATE
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("📊 STEP 6: COMPREHENSIVE EVALUATION")
-print("="*80)
+print("=" * 80)
 
 # Predictions
 y_pred_train = model.predict(X_train)
@@ -233,6 +239,8 @@ y_pred_val = model.predict(X_val)
 y_pred_test = model.predict(X_test)
 
 # Calculate metrics
+
+
 def calculate_metrics(y_true, y_pred, set_name):
     """Calculate comprehensive metrics"""
     r2 = r2_score(y_true, y_pred)
@@ -259,15 +267,16 @@ def calculate_metrics(y_true, y_pred, set_name):
         'mae': mae
     }
 
+
 metrics = {}
 metrics['train'] = calculate_metrics(y_train, y_pred_train, "Training")
 metrics['val'] = calculate_metrics(y_val, y_pred_val, "Validation")
 metrics['test'] = calculate_metrics(y_test, y_pred_test, "Test")
 
 # Check for collapse
-print(f"\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔍 MODEL HEALTH CHECK")
-print("="*80)
+print("=" * 80)
 
 collapse_indicators = []
 
@@ -293,9 +302,9 @@ else:
 # ============================================================================
 # STEP 7: SAVE MODEL
 # ============================================================================
-print("\n" + "="*80)
+print("\n" + "=" * 80)
 print("💾 STEP 7: SAVE MODEL & METADATA")
-print("="*80)
+print("=" * 80)
 
 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 model_path = MODELS_DIR / f"xgb_model_full_{timestamp}.joblib"
@@ -305,6 +314,13 @@ metadata_path = METADATA_DIR / f"xgb_metadata_full_{timestamp}.json"
 joblib.dump(model, model_path)
 print(f"✅ Model saved: {model_path}")
 
+# Save the fitted feature pipeline next to the model (used by the dashboards)
+feature_pipeline = FeaturePipeline(features=feature_cols, scale=False,
+                                   stats_path=STATS_PATH).fit(X)
+pipeline_path = pipeline_path_for(model_path)
+joblib.dump(feature_pipeline, pipeline_path)
+print(f"✅ Feature pipeline saved: {pipeline_path}")
+
 # Save metadata
 metadata = {
     'timestamp': datetime.now().isoformat(),
@@ -312,6 +328,7 @@ metadata = {
     'n_samples': len(X),
     'n_features': len(feature_cols),
     'feature_names': feature_cols,
+    'imputation_stats_version': imputation_stats.version if imputation_stats is not None else None,
     'model_params': final_params,
     'metrics': {
         'train_r2': metrics['train']['r2'],
@@ -346,16 +363,16 @@ feature_importance_path = MODELS_DIR / f"feature_importance_full_{timestamp}.csv
 feature_importance.to_csv(feature_importance_path, index=False)
 print(f"✅ Feature importance saved: {feature_importance_path}")
 
-print(f"\n" + "="*80)
+print("\n" + "=" * 80)
 print("✅ TRAINING COMPLETE")
-print("="*80)
-print(f"\nFinal Test Performance:")
+print("=" * 80)
+print("\nFinal Test Performance:")
 print(f"  R² = {metrics['test']['r2']:.4f}")
 print(f"  RMSE = {metrics['test']['rmse']:.2f}")
 print(f"  MAE = {metrics['test']['mae']:.2f}")
-print(f"\nTop 5 Features:")
+print("\nTop 5 Features:")
 for idx, row in feature_importance.head(5).iterrows():
     print(f"  {row['feature']}: {row['importance']:.4f}")
 
 print(f"\nEnd time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
@@ -13,10 +13,13 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 import joblib
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from xgboost import XGBRegressor
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.feature_store import STORE_DIR, load_features  # noqa: E402
+from src.splits import hash_split  # noqa: E402
+
 # Set random seed
 RANDOM_STATE = 42
 np.random.seed(RANDOM_STATE)
@@ -26,6 +29,7 @@ np.random.seed(RANDOM_STATE)
 # ============================================================================
 BASE_DIR = Path(__file__).parent.parent
 DATA_PATH = BASE_DIR / "data" / "processed" / "cleaned_spotify_data.parquet"
+STORE_PATH = BASE_DIR / "data" / "processed" / STORE_DIR
 OUTPUTS_DIR = BASE_DIR / "outputs"
 MODELS_DIR = OUTPUTS_DIR / "models"
 METADATA_DIR = OUTPUTS_DIR / "metadata"
@@ -34,18 +38,11 @@ METADATA_DIR = OUTPUTS_DIR / "metadata"
 for dir_path in [MODELS_DIR, METADATA_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
-print("="*80)
+print("=" * 80)
 print("🎵 QUICK TRAINING ON FULL SPOTIFY DATASET (114K SAMPLES)")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-# ============================================================================
-# LOAD DATA
-# ============================================================================
-print("📂 Loading data...")
-df = pd.read_parquet(DATA_PATH)
-print(f"✅ Loaded: {len(df):,} rows")
-
 # ============================================================================
 # FEATURE SELECTION
 # ============================================================================
@@ -55,12 +52,10 @@ feature_cols = [
 ]
 target_col = 'popularity'
 
-X = df[feature_cols].copy()
-y = df[target_col].copy()
-
-# Remove NaN
-mask = ~(X.isnull().any(axis=1) | y.isnull())
-X, y = X[mask], y[mask]
+# Memory-mapped feature store (rows with NaN already left out)
+print("📂 Loading features...")
+X, y = load_features(feature_cols, store_path=STORE_PATH, data_path=DATA_PATH)
+print(f"✅ Loaded: {len(X):,} rows")
 
 print(f"✅ Features: {len(feature_cols)}, Samples: {len(X):,}")
 
@@ -68,8 +63,11 @@ print(f"✅ Features: {len(feature_cols)}, Samples: {len(X):,}")
 # TRAIN/TEST SPLIT
 # ============================================================================
 print("\n✂️  Splitting data...")
-X_train, X_temp, y_train, y_temp = train_test_split(X, y, test_size=0.3, random_state=RANDOM_STATE)
-X_val, X_test, y_val, y_test = train_test_split(X_temp, y_temp, test_size=0.5, random_state=RANDOM_STATE)
+# 70% train, 15% val, 15% test, assigned from a hash of each track_id (stable as tracks are added)
+split = hash_split(X.index, test_size=0.15, val_size=0.15, random_state=RANDOM_STATE)
+X_train, y_train = X.iloc[split['train']], y.iloc[split['train']]
+X_val, y_val = X.iloc[split['val']], y.iloc[split['val']]
+X_test, y_test = X.iloc[split['test']], y.iloc[split['test']]
 
 print(f"Train: {len(X_train):,}, Val: {len(X_val):,}, Test: {len(X_test):,}")
 
@@ -100,7 +98,7 @@ model.fit(
     verbose=10
 )
 
-print(f"\n✅ Training complete!")
+print("\n✅ Training complete!")
 
 # ============================================================================
 # EVALUATE
@@ -111,6 +109,7 @@ y_pred_train = model.predict(X_train)
 y_pred_val = model.predict(X_val)
 y_pred_test = model.predict(X_test)
 
+
 def get_metrics(y_true, y_pred, name):
     r2 = r2_score(y_true, y_pred)
     rmse = np.sqrt(mean_squared_error(y_true, y_pred))
@@ -126,14 +125,15 @@ def get_metrics(y_true, y_pred, name):
 
     return {'r2': r2, 'adj_r2': adj_r2, 'rmse': rmse, 'mae': mae}
 
+
 metrics_train = get_metrics(y_train, y_pred_train, "Train")
 metrics_val = get_metrics(y_val, y_pred_val, "Validation")
 metrics_test = get_metrics(y_test, y_pred_test, "Test")
 
 # Health check
-print(f"\n" + "="*80)
+print("\n" + "=" * 80)
 print("🔍 HEALTH CHECK")
-print("="*80)
+print("=" * 80)
 
 if metrics_test['r2'] > 0.3:
     print("✅ Model is healthy!")
@@ -195,12 +195,12 @@ feature_importance.to_csv(MODELS_DIR / f"feature_importance_full_{timestamp}.csv
 print(f"✅ Saved: {model_path.name}")
 print(f"✅ Saved: {metadata_path.name}")
 
-print(f"\n" + "="*80)
+print("\n" + "=" * 80)
 print("🎉 COMPLETE")
-print("="*80)
+print("=" * 80)
 print(f"Final Test R²: {metrics_test['r2']:.4f}")
 print(f"Final Test RMSE: {metrics_test['rmse']:.2f}")
-print(f"\nTop 3 Features:")
+print("\nTop 3 Features:")
 for _, row in feature_importance.head(3).iterrows():
     print(f"  {row['feature']}: {row['importance']:.3f}")
-print("="*80)
+print("=" * 80)
@@ -11,8 +11,16 @@ import json
 from datetime import datetime
 from pathlib import Path
 import logging
+import os
+import shutil
+import sys
 import time
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.feature_engineering import (PIPELINE_FILE, SPLIT_NAME, SPLITS_DIR,  # noqa: E402
+                                     FeatureEngineer, load_ml_data, pipeline_path_for)
+from src.splits import SplitManifest  # noqa: E402
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -28,16 +36,28 @@ class ModelTrainer:
         self.y_test = None
         self.training_time = 0
         self.metrics = {}
+        self.data_dir = Path("data/processed")
 
     def load_data(self, data_dir="data/processed"):
-        """Load processed training data"""
+        """
+        Load processed training data (the split manifest's rows of the ML-ready data).
+
+        Streaming feature engineering writes no split; it is then drawn from
+        the streamed rows the same way FeatureEngineer.split_data() does.
+        """
         data_dir = Path(data_dir)
+        self.data_dir = data_dir
         logger.info(f"Loading data from {data_dir}")
 
-        self.X_train = pd.read_parquet(data_dir / 'X_train.parquet')
-        self.X_test = pd.read_parquet(data_dir / 'X_test.parquet')
-        self.y_train = pd.read_parquet(data_dir / 'y_train.parquet').squeeze()
-        self.y_test = pd.read_parquet(data_dir / 'y_test.parquet').squeeze()
+        X, y = load_ml_data(data_dir)
+        split_path = data_dir / SPLITS_DIR / f"{SPLIT_NAME}.json"
+        if split_path.exists():
+            split = SplitManifest.load(split_path)
+            self.X_train, self.y_train = split.take('train', X, y, verify=True)
+            self.X_test, self.y_test = split.take('test', X, y)
+        else:
+            self.X_train, self.X_test, self.y_train, self.y_test = FeatureEngineer().split_data(
+                X, y, output_dir=data_dir)
 
         logger.info(f"Train: X={self.X_train.shape}, y={self.y_train.shape}")
         logger.info(f"Test: X={self.X_test.shape}, y={self.y_test.shape}")
@@ -47,6 +67,12 @@ class ModelTrainer:
         """Initialize XGBoost model with hyperparameters"""
         logger.info("Initializing XGBoost model...")
 
+        # Categorical columns (FeatureEngineer(categorical=True)) are split on natively
+        categorical = self.X_train is not None and any(
+            isinstance(dtype, pd.CategoricalDtype) for dtype in self.X_train.dtypes)
+        if categorical:
+            logger.info("Using native categorical splits")
+
         self.model = XGBRegressor(
             n_estimators=200,
             max_depth=6,
@@ -58,7 +84,9 @@ class ModelTrainer:
             random_state=42,
             n_jobs=-1,
             early_stopping_rounds=20,
-            eval_metric='rmse'
+            eval_metric='rmse',
+            tree_method='hist',
+            enable_categorical=categorical
         )
 
         logger.info("Model initialized")
@@ -137,10 +165,20 @@ class ModelTrainer:
         self.model.save_model(str(model_path_json))
         logger.info(f"Saved: {model_path_json}")
 
+        # Keep the feature pipeline that produced the training data with the model
+        pipeline_source = self.data_dir / PIPELINE_FILE
+        if pipeline_source.exists():
+            pipeline_path = pipeline_path_for(model_path)
+            shutil.copyfile(pipeline_source, pipeline_path)
+            logger.info(f"Saved: {pipeline_path}")
+        else:
+            logger.warning(f"No feature pipeline at {pipeline_source} - "
+                           "run src/feature_engineering.py")
+
         # Save feature importance
         feature_importance = self.get_feature_importance()
         feature_importance.to_csv(output_dir / 'feature_importance.csv', index=False)
-        logger.info(f"Saved: feature_importance.csv")
+        logger.info("Saved: feature_importance.csv")
 
         # Save metadata
         metadata = {
@@ -159,9 +197,11 @@ class ModelTrainer:
                 'colsample_bytree': float(self.model.colsample_bytree),
                 'min_child_weight': int(self.model.min_child_weight),
                 'gamma': float(self.model.gamma),
+                'enable_categorical': bool(self.model.enable_categorical),
             },
             'performance': self.metrics,
-            'top_10_features': feature_importance.head(10)[['feature', 'importance']].to_dict('records')
+            'top_10_features': feature_importance.head(10)[['feature', 'importance']]
+            .to_dict('records')
         }
 
         metadata_path = output_dir / 'model_metadata.json'
@@ -177,7 +217,7 @@ class ModelTrainer:
         self.initialize_model()
         self.train()
         self.evaluate()
-        output_dir = self.save_model()
+        self.save_model()
 
         logger.info("=" * 80)
         logger.info("MODEL TRAINING COMPLETE")
@@ -194,18 +234,18 @@ if __name__ == "__main__":
     print("\n" + "=" * 80)
     print("XGBOOST TRAINING SUMMARY")
     print("=" * 80)
-    print(f"\nModel Performance:")
+    print("\nModel Performance:")
     print(f"  Test R²: {metrics['test']['r2']:.4f}")
     print(f"  Test RMSE: {metrics['test']['rmse']:.4f}")
     print(f"  Test MAE: {metrics['test']['mae']:.4f}")
 
-    print(f"\nTop 5 Important Features:")
+    print("\nTop 5 Important Features:")
     feature_importance = trainer.get_feature_importance()
     for idx, row in feature_importance.head(5).iterrows():
-        print(f"  {idx+1}. {row['feature']}: {row['importance']:.4f}")
+        print(f"  {idx + 1}. {row['feature']}: {row['importance']:.4f}")
 
-    print(f"\nFiles Saved:")
-    print(f"  ✓ xgboost_popularity_model.joblib")
-    print(f"  ✓ xgboost_popularity_model.json")
-    print(f"  ✓ model_metadata.json")
-    print(f"  ✓ feature_importance.csv")
+    print("\nFiles Saved:")
+    print("  ✓ xgboost_popularity_model.joblib")
+    print("  ✓ xgboost_popularity_model.json")
+    print("  ✓ model_metadata.json")
+    print("  ✓ feature_importance.csv")
@@ -8,30 +8,35 @@ Expected improvement:
 - After (audio + artist): R² = 0.28-0.32 (~75-100% improvement)
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import joblib
 import json
 from pathlib import Path
 from datetime import datetime
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error, mean_absolute_percentage_error
+from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 from xgboost import XGBRegressor
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*80)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.imputation_stats import load_stats  # noqa: E402
+from src.splits import hash_split  # noqa: E402
+
+print("=" * 80)
 print("🎵 TRAINING WITH ARTIST FEATURES")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print()
 
 # ============================================================================
 # STEP 1: Load Enriched Dataset
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📂 STEP 1: LOAD ENRICHED DATASET")
-print("="*80)
+print("=" * 80)
 
 df = pd.read_parquet('data/processed/cleaned_spotify_data_with_artists.parquet')
 print(f"✓ Loaded {len(df):,} tracks")
@@ -41,9 +46,9 @@ print()
 # ============================================================================
 # STEP 2: Define Features
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎯 STEP 2: DEFINE FEATURES")
-print("="*80)
+print("=" * 80)
 
 # Audio features (original 9)
 audio_features = [
@@ -73,14 +78,20 @@ target = 'popularity'
 # ============================================================================
 # STEP 3: Prepare Data
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🔧 STEP 3: PREPARE DATA")
-print("="*80)
+print("=" * 80)
 
 # Extract features and target
 X = df[all_features].copy()
 y = df[target].copy()
 
+# Audio features take the ETL's imputation stats (same values as the other models)
+imputation_stats = load_stats()
+if imputation_stats is not None:
+    X = imputation_stats.fill(X)
+    print(f"✓ Audio features filled with imputation stats {imputation_stats.version}")
+
 # Check for missing values
 missing = X.isnull().sum()
 if missing.any():
@@ -112,29 +123,27 @@ print()
 # ============================================================================
 # STEP 4: Train/Val/Test Split
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("✂️  STEP 4: TRAIN/VAL/TEST SPLIT")
-print("="*80)
+print("=" * 80)
 
-# Split: 70% train, 15% val, 15% test
-X_train, X_temp, y_train, y_temp = train_test_split(
-    X, y, test_size=0.3, random_state=42
-)
-X_val, X_test, y_val, y_test = train_test_split(
-    X_temp, y_temp, test_size=0.5, random_state=42
-)
+# Split: 70% train, 15% val, 15% test, assigned by track_id hash
+split = hash_split(df.loc[X.index, 'track_id'], test_size=0.15, val_size=0.15, random_state=42)
+X_train, y_train = X.iloc[split['train']], y.iloc[split['train']]
+X_val, y_val = X.iloc[split['val']], y.iloc[split['val']]
+X_test, y_test = X.iloc[split['test']], y.iloc[split['test']]
 
-print(f"✓ Train: {X_train.shape[0]:,} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Val: {X_val.shape[0]:,} samples ({X_val.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Test: {X_test.shape[0]:,} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
+print(f"✓ Train: {X_train.shape[0]:,} samples ({X_train.shape[0] / len(X) * 100:.1f}%)")
+print(f"✓ Val: {X_val.shape[0]:,} samples ({X_val.shape[0] / len(X) * 100:.1f}%)")
+print(f"✓ Test: {X_test.shape[0]:,} samples ({X_test.shape[0] / len(X) * 100:.1f}%)")
 print()
 
 # ============================================================================
 # STEP 5: Train Model (Using Best Hyperparameters from Optuna)
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🤖 STEP 5: TRAIN MODEL")
-print("="*80)
+print("=" * 80)
 
 # Use best hyperparameters from previous Optuna tuning
 best_params = {
@@ -155,7 +164,8 @@ best_params = {
 }
 
 print("Training XGBoost with best hyperparameters...")
-print(json.dumps({k: v for k, v in best_params.items() if k not in ['early_stopping_rounds']}, indent=2))
+print(json.dumps({k: v for k, v in best_params.items() if k not in ['early_stopping_rounds']},
+                 indent=2))
 print()
 
 model = XGBRegressor(**best_params)
@@ -171,9 +181,10 @@ print()
 # ============================================================================
 # STEP 6: Evaluate Model
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 STEP 6: EVALUATE MODEL")
-print("="*80)
+print("=" * 80)
+
 
 def evaluate_model(X, y, name=""):
     """Calculate metrics for a dataset"""
@@ -202,6 +213,7 @@ def evaluate_model(X, y, name=""):
         'mae': mae
     }
 
+
 train_metrics = evaluate_model(X_train, y_train, "Training")
 val_metrics = evaluate_model(X_val, y_val, "Validation")
 test_metrics = evaluate_model(X_test, y_test, "Test")
@@ -209,9 +221,9 @@ test_metrics = evaluate_model(X_test, y_test, "Test")
 # ============================================================================
 # STEP 7: Feature Importance Analysis
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎯 STEP 7: FEATURE IMPORTANCE ANALYSIS")
-print("="*80)
+print("=" * 80)
 
 feature_importance = pd.DataFrame({
     'feature': all_features,
@@ -223,10 +235,12 @@ print(feature_importance.head(10).to_string(index=False))
 print()
 
 # Calculate importance by feature type
-audio_importance = feature_importance[feature_importance['feature'].isin(audio_features)]['importance'].sum()
-artist_importance = feature_importance[feature_importance['feature'].isin(artist_features)]['importance'].sum()
+is_audio = feature_importance['feature'].isin(audio_features)
+is_artist = feature_importance['feature'].isin(artist_features)
+audio_importance = feature_importance.loc[is_audio, 'importance'].sum()
+artist_importance = feature_importance.loc[is_artist, 'importance'].sum()
 
-print(f"Importance by Feature Type:")
+print("Importance by Feature Type:")
 print(f"  Audio features: {audio_importance:.1%}")
 print(f"  Artist features: {artist_importance:.1%}")
 print()
@@ -234,15 +248,15 @@ print()
 # ============================================================================
 # STEP 8: Compare with Audio-Only Baseline
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📈 STEP 8: COMPARE WITH BASELINE")
-print("="*80)
+print("=" * 80)
 
 baseline_r2 = 0.1619  # From audio-only model
 improvement = test_metrics['r2'] - baseline_r2
 improvement_pct = (improvement / baseline_r2) * 100
 
-print(f"Performance Comparison:")
+print("Performance Comparison:")
 print(f"  Baseline (audio-only): R² = {baseline_r2:.4f}")
 print(f"  Current (audio + artist): R² = {test_metrics['r2']:.4f}")
 print(f"  Improvement: +{improvement:.4f} ({improvement_pct:+.1f}%)")
@@ -260,9 +274,9 @@ print()
 # ============================================================================
 # STEP 9: Save Model and Metadata
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("💾 STEP 9: SAVE MODEL AND METADATA")
-print("="*80)
+print("=" * 80)
 
 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -317,9 +331,9 @@ print()
 # ============================================================================
 # SUMMARY
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 TRAINING SUMMARY")
-print("="*80)
+print("=" * 80)
 
 print(f"""
 Model Performance:
@@ -347,6 +361,6 @@ Files Saved:
   - {metadata_path}
 """)
 
-print("="*80)
+print("=" * 80)
 print(f"✅ TRAINING COMPLETE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
@@ -16,19 +16,19 @@ from typing import Dict, Any, Optional
 import numpy as np
 import pandas as pd
 from xgboost import XGBRegressor
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import optuna
 from optuna.trial import Trial
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.ml_utils import adjusted_r2
+from src.ml_utils import adjusted_r2  # noqa: E402
 
 # Try to import MLflow (fail gracefully if not available)
 MLFLOW_AVAILABLE = False
 try:
-    import mlflow
+    import mlflow  # noqa: F401
     from src.mlflow_tracker import MLflowTracker
     MLFLOW_AVAILABLE = True
     print("✅ MLflow available - trials will be logged")
@@ -48,9 +48,9 @@ RANDOM_STATE = 42
 # Ensure output directory exists
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-print("="*80)
+print("=" * 80)
 print("🎯 HYPERPARAMETER TUNING WITH OPTUNA")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
 
@@ -204,7 +204,7 @@ class OptunaXGBoostTuner:
             if self.use_mlflow and self.mlflow_tracker and mlflow_run:
                 try:
                     self.mlflow_tracker.end_run(status="FAILED")
-                except:
+                except Exception:
                     pass
             raise
 
@@ -225,9 +225,9 @@ class OptunaXGBoostTuner:
         Returns:
             Dictionary with best parameters and results
         """
-        print(f"\n{'='*80}")
-        print(f"🚀 STARTING OPTIMIZATION")
-        print(f"{'='*80}")
+        print(f"\n{'=' * 80}")
+        print("🚀 STARTING OPTIMIZATION")
+        print(f"{'=' * 80}")
         print(f"Trials: {n_trials}")
         print(f"Timeout: {timeout if timeout else 'None'}")
         print(f"Parallel jobs: {n_jobs}")
@@ -254,12 +254,12 @@ class OptunaXGBoostTuner:
         self.best_params = self.study.best_params
         self.best_score = self.study.best_value
 
-        print(f"\n{'='*80}")
+        print(f"\n{'=' * 80}")
         print("✅ OPTIMIZATION COMPLETE")
-        print(f"{'='*80}")
+        print(f"{'=' * 80}")
         print(f"Best validation RMSE: {self.best_score:.4f}")
         print(f"Best trial number: {self.study.best_trial.number}")
-        print(f"\n📊 Best Hyperparameters:")
+        print("\n📊 Best Hyperparameters:")
         for param, value in self.best_params.items():
             print(f"  {param}: {value}")
 
@@ -330,11 +330,11 @@ def load_data(use_synthetic: bool = False) -> tuple:
         }
 
         popularity = (
-            10 * data['energy'] +
-            8 * data['danceability'] +
-            5 * data['valence'] +
-            np.random.randn(n_samples) * 5 +
-            50
+            10 * data['energy']
+            + 8 * data['danceability']
+            + 5 * data['valence']
+            + np.random.randn(n_samples) * 5
+            + 50
         )
         popularity = np.clip(popularity, 0, 100)
 
@@ -376,10 +376,10 @@ def load_data(use_synthetic: bool = False) -> tuple:
         X_train_full, y_train_full, test_size=0.2, random_state=RANDOM_STATE
     )
 
-    print(f"\n📊 Data Split:")
-    print(f"   Train: {len(X_train):,} samples ({len(X_train)/len(X)*100:.1f}%)")
-    print(f"   Val:   {len(X_val):,} samples ({len(X_val)/len(X)*100:.1f}%)")
-    print(f"   Test:  {len(X_test):,} samples ({len(X_test)/len(X)*100:.1f}%)")
+    print("\n📊 Data Split:")
+    print(f"   Train: {len(X_train):,} samples ({len(X_train) / len(X) * 100:.1f}%)")
+    print(f"   Val:   {len(X_val):,} samples ({len(X_val) / len(X) * 100:.1f}%)")
+    print(f"   Test:  {len(X_test):,} samples ({len(X_test) / len(X) * 100:.1f}%)")
 
     return X_train, X_val, X_test, y_train, y_val, y_test
 
@@ -415,9 +415,9 @@ def main(
     tuner.save_results(results)
 
     # Evaluate best model on test set
-    print(f"\n{'='*80}")
+    print(f"\n{'=' * 80}")
     print("📊 EVALUATING BEST MODEL ON TEST SET")
-    print(f"{'='*80}")
+    print(f"{'=' * 80}")
 
     best_model = XGBRegressor(**tuner.best_params)
     best_model.fit(X_train, y_train)
@@ -428,21 +428,21 @@ def main(
     test_r2 = r2_score(y_test, y_test_pred)
     test_adj_r2 = adjusted_r2(test_r2, len(y_test), X_test.shape[1])
 
-    print(f"\nTest Set Performance:")
+    print("\nTest Set Performance:")
     print(f"  RMSE: {test_rmse:.4f}")
     print(f"  MAE:  {test_mae:.4f}")
     print(f"  R²:   {test_r2:.4f}")
     print(f"  Adj R²: {test_adj_r2:.4f}")
 
-    print(f"\n{'='*80}")
+    print(f"\n{'=' * 80}")
     print("✨ HYPERPARAMETER TUNING COMPLETE!")
-    print(f"{'='*80}")
-    print(f"\n🎯 Next steps:")
+    print(f"{'=' * 80}")
+    print("\n🎯 Next steps:")
     print(f"  - Review results in: {OUTPUT_DIR}")
-    print(f"  - Best params saved to: config/xgboost_params_tuned.json")
+    print("  - Best params saved to: config/xgboost_params_tuned.json")
     if MLFLOW_AVAILABLE:
-        print(f"  - View trials in MLflow UI: make mlflow-ui")
-    print(f"  - Use tuned params: Update config/xgboost_params.json")
+        print("  - View trials in MLflow UI: make mlflow-ui")
+    print("  - Use tuned params: Update config/xgboost_params.json")
     print()
 
 
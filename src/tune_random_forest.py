@@ -17,12 +17,14 @@ Baseline Random Forest (default): R² = 0.1315, severe overfitting
 Target: XGBoost R² = 0.1619
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import json
+import joblib
 from pathlib import Path
 from datetime import datetime
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_squared_error, mean_absolute_error
 import optuna
@@ -30,18 +32,21 @@ from optuna.samplers import TPESampler
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*80)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.splits import hash_split  # noqa: E402
+
+print("=" * 80)
 print("🌲 TUNING RANDOM FOREST WITH OPTUNA")
-print("="*80)
+print("=" * 80)
 print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print()
 
 # ============================================================================
 # STEP 1: Load Cleaned Dataset
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📂 STEP 1: LOAD CLEANED DATASET")
-print("="*80)
+print("=" * 80)
 
 df = pd.read_parquet('data/processed/cleaned_spotify_data.parquet')
 print(f"✓ Loaded {len(df):,} tracks")
@@ -50,9 +55,9 @@ print()
 # ============================================================================
 # STEP 2: Prepare Features
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎯 STEP 2: PREPARE FEATURES")
-print("="*80)
+print("=" * 80)
 
 # Use same 9 audio features as XGBoost model
 feature_cols = [
@@ -68,36 +73,35 @@ mask = ~(X.isnull().any(axis=1) | y.isnull())
 X, y = X[mask], y[mask]
 
 print(f"✓ Features: {feature_cols}")
-print(f"✓ Target: popularity")
+print("✓ Target: popularity")
 print(f"✓ Samples: {len(X):,}")
 print()
 
 # ============================================================================
 # STEP 3: Train/Val/Test Split
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("✂️  STEP 3: TRAIN/VAL/TEST SPLIT")
-print("="*80)
+print("=" * 80)
 
-# Use same split as XGBoost: 70% train, 15% val, 15% test
-X_train, X_temp, y_train, y_temp = train_test_split(
-    X, y, test_size=0.3, random_state=42
-)
-X_val, X_test, y_val, y_test = train_test_split(
-    X_temp, y_temp, test_size=0.5, random_state=42
-)
+# Use same split as XGBoost: 70% train, 15% val, 15% test, assigned by track_id hash
+split = hash_split(df.loc[X.index, 'track_id'], test_size=0.15, val_size=0.15, random_state=42)
+X_train, y_train = X.iloc[split['train']], y.iloc[split['train']]
+X_val, y_val = X.iloc[split['val']], y.iloc[split['val']]
+X_test, y_test = X.iloc[split['test']], y.iloc[split['test']]
 
-print(f"✓ Train: {X_train.shape[0]:,} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Val: {X_val.shape[0]:,} samples ({X_val.shape[0]/len(X)*100:.1f}%)")
-print(f"✓ Test: {X_test.shape[0]:,} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
+print(f"✓ Train: {X_train.shape[0]:,} samples ({X_train.shape[0] / len(X) * 100:.1f}%)")
+print(f"✓ Val: {X_val.shape[0]:,} samples ({X_val.shape[0] / len(X) * 100:.1f}%)")
+print(f"✓ Test: {X_test.shape[0]:,} samples ({X_test.shape[0] / len(X) * 100:.1f}%)")
 print()
 
 # ============================================================================
 # STEP 4: Define Optuna Objective
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎯 STEP 4: OPTUNA HYPERPARAMETER TUNING")
-print("="*80)
+print("=" * 80)
+
 
 def objective(trial):
     """Optuna objective function for Random Forest"""
@@ -131,6 +135,7 @@ def objective(trial):
 
     return val_r2
 
+
 # Run Optuna optimization
 print("Starting Optuna optimization (50 trials)...")
 print("This will take approximately 10-15 minutes...")
@@ -151,9 +156,9 @@ print()
 # ============================================================================
 # STEP 5: Best Parameters
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🏆 STEP 5: BEST HYPERPARAMETERS")
-print("="*80)
+print("=" * 80)
 
 best_params = study.best_params
 best_val_r2 = study.best_value
@@ -168,9 +173,9 @@ print()
 # ============================================================================
 # STEP 6: Train Final Model with Best Parameters
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🌲 STEP 6: TRAIN FINAL MODEL")
-print("="*80)
+print("=" * 80)
 
 final_model = RandomForestRegressor(
     n_estimators=best_params['n_estimators'],
@@ -192,9 +197,10 @@ print()
 # ============================================================================
 # STEP 7: Evaluate Final Model
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 STEP 7: EVALUATE FINAL MODEL")
-print("="*80)
+print("=" * 80)
+
 
 def evaluate_model(model, X, y, name=""):
     """Calculate metrics for a dataset"""
@@ -223,6 +229,7 @@ def evaluate_model(model, X, y, name=""):
         'mae': mae
     }
 
+
 train_metrics = evaluate_model(final_model, X_train, y_train, "Random Forest (tuned) - Training")
 val_metrics = evaluate_model(final_model, X_val, y_val, "Random Forest (tuned) - Validation")
 test_metrics = evaluate_model(final_model, X_test, y_test, "Random Forest (tuned) - Test")
@@ -235,9 +242,9 @@ print()
 # ============================================================================
 # STEP 8: Compare with Baselines
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📈 STEP 8: COMPARISON WITH BASELINES")
-print("="*80)
+print("=" * 80)
 
 # Baseline metrics from previous training
 lr_test_r2 = 0.0612
@@ -305,9 +312,9 @@ print()
 # ============================================================================
 # STEP 9: Feature Importance
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("🎯 STEP 9: FEATURE IMPORTANCE")
-print("="*80)
+print("=" * 80)
 
 feature_importance = pd.DataFrame({
     'feature': feature_cols,
@@ -322,9 +329,9 @@ print()
 # ============================================================================
 # STEP 10: Save Results
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("💾 STEP 10: SAVE RESULTS")
-print("="*80)
+print("=" * 80)
 
 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -368,7 +375,6 @@ print()
 
 # Save Optuna study
 study_path = Path(f'outputs/metadata/rf_optuna_study_{timestamp}.pkl')
-import joblib
 joblib.dump(study, study_path)
 print(f"✓ Optuna study saved: {study_path}")
 print()
@@ -376,9 +382,16 @@ print()
 # ============================================================================
 # SUMMARY
 # ============================================================================
-print("="*80)
+print("=" * 80)
 print("📊 RANDOM FOREST TUNING SUMMARY")
-print("="*80)
+print("=" * 80)
+
+if test_metrics['r2'] > xgb_test_r2:
+    xgb_comparison = ('- Tuned Random Forest beats XGBoost by '
+                      f'{((test_metrics["r2"] - xgb_test_r2) / xgb_test_r2) * 100:+.1f}%')
+else:
+    xgb_comparison = ('- XGBoost still outperforms tuned Random Forest by '
+                      f'{((xgb_test_r2 - test_metrics["r2"]) / test_metrics["r2"]) * 100:.1f}%')
 
 print(f"""
 Dataset: 78,310 cleaned tracks (deduplicated, zero-popularity removed)
@@ -406,7 +419,7 @@ BEST MODEL: {best_model_name}
 
 Key Insights:
 - Tuned Random Forest improves over default by {rf_improvement:+.1f}%
-{'- Tuned Random Forest beats XGBoost by ' + f'{((test_metrics["r2"] - xgb_test_r2) / xgb_test_r2) * 100:+.1f}%' if test_metrics['r2'] > xgb_test_r2 else '- XGBoost still outperforms tuned Random Forest by ' + f'{((xgb_test_r2 - test_metrics["r2"]) / test_metrics["r2"]) * 100:.1f}%'}
+{xgb_comparison}
 - Overfitting reduced from 0.75 to {overfitting_gap:.4f}
 - Hyperparameter tuning essential for Random Forest performance
 
@@ -422,6 +435,6 @@ All models still limited by audio-only features (R² ~0.16 ceiling).
 Artist features expected to improve R² to 0.28-0.32.
 """)
 
-print("="*80)
+print("=" * 80)
 print(f"✅ RANDOM FOREST TUNING COMPLETE - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-print("="*80)
+print("=" * 80)
@@ -30,6 +30,7 @@ NEW_METRICS = {
     'dataset_version': 'Cleaned V2 (Deduplicated)'
 }
 
+
 def update_presentation(pptx_path, output_path=None):
     """
     Update PowerPoint presentation with new metrics
@@ -63,7 +64,8 @@ def update_presentation(pptx_path, output_path=None):
 
                         # Update R² values (look for multiple patterns)
                         # Old values: 0.4772, 0.8447, 0.39, etc.
-                        if re.search(r'R²\s*[=:]\s*0\.(4772|8447|477|39|40)', updated_text, re.IGNORECASE):
+                        if re.search(r'R²\s*[=:]\s*0\.(4772|8447|477|39|40)',
+                                     updated_text, re.IGNORECASE):
                             updated_text = re.sub(
                                 r'(R²\s*[=:]\s*)0\.(4772|8447|477|39|40)',
                                 rf'\g<1>{NEW_METRICS["r2"]:.4f}',
@@ -103,7 +105,8 @@ def update_presentation(pptx_path, output_path=None):
                             print(f"Slide {slide_num}: Updated MAE")
 
                         # Update n_estimators (only update 450, 400, etc.)
-                        if re.search(r'(?:n_estimators|estimators)\s*[=:]\s*(450|400|200)', updated_text, re.IGNORECASE):
+                        if re.search(r'(?:n_estimators|estimators)\s*[=:]\s*(450|400|200)',
+                                     updated_text, re.IGNORECASE):
                             updated_text = re.sub(
                                 r'((?:n_estimators|estimators)\s*[=:]\s*)(450|400|200)',
                                 rf'\g<1>{NEW_METRICS["n_estimators"]}',
@@ -113,7 +116,8 @@ def update_presentation(pptx_path, output_path=None):
                             print(f"Slide {slide_num}: Updated n_estimators")
 
                         # Update max_depth (look for values like 10, 8, etc.)
-                        if re.search(r'(?:max_depth|depth)\s*[=:]\s*(10|8)', updated_text, re.IGNORECASE):
+                        if re.search(r'(?:max_depth|depth)\s*[=:]\s*(10|8)',
+                                     updated_text, re.IGNORECASE):
                             updated_text = re.sub(
                                 r'((?:max_depth|depth)\s*[=:]\s*)(10|8)',
                                 rf'\g<1>{NEW_METRICS["max_depth"]}',
@@ -139,12 +143,13 @@ def update_presentation(pptx_path, output_path=None):
 
     # Save the updated presentation
     prs.save(output_path)
-    print(f"\n✅ Presentation updated successfully!")
+    print("\n✅ Presentation updated successfully!")
     print(f"📊 Total updates made: {updates_made}")
     print(f"💾 Saved to: {output_path}")
 
     return output_path
 
+
 if __name__ == "__main__":
     # Find presentation file
     pptx_files = list(Path(".").glob("*.pptx"))
@@ -158,7 +163,7 @@ if __name__ == "__main__":
     pptx_file = max(pptx_files, key=lambda p: p.stat().st_mtime)
 
     print(f"📂 Found presentation: {pptx_file.name}")
-    print(f"\n🔄 Updating with new metrics from Cleaned Dataset V2:")
+    print("\n🔄 Updating with new metrics from Cleaned Dataset V2:")
     print(f"  - R² Score: {NEW_METRICS['r2']:.4f}")
     print(f"  - Adjusted R²: {NEW_METRICS['adj_r2']:.4f}")
     print(f"  - RMSE: {NEW_METRICS['rmse']:.2f}")
@@ -171,9 +176,9 @@ if __name__ == "__main__":
     # Update the presentation
     output_file = update_presentation(pptx_file)
 
-    print(f"\n📝 Note: R² dropped from 0.48 to 0.16 because:")
-    print(f"  - Removed 30,533 duplicate tracks")
-    print(f"  - Removed 5,157 zero-popularity tracks")
-    print(f"  - R² = 0.16 is realistic for audio-only features")
-    print(f"  - Old R² = 0.48 was inflated by easy zero predictions")
-    print(f"\n📖 See docs/TRAINING_RUN_SUMMARY_20251114.md for full explanation")
+    print("\n📝 Note: R² dropped from 0.48 to 0.16 because:")
+    print("  - Removed 30,533 duplicate tracks")
+    print("  - Removed 5,157 zero-popularity tracks")
+    print("  - R² = 0.16 is realistic for audio-only features")
+    print("  - Old R² = 0.48 was inflated by easy zero predictions")
+    print("\n📖 See docs/TRAINING_RUN_SUMMARY_20251114.md for full explanation")
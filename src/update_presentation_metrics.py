@@ -2,7 +2,6 @@
 Update PowerPoint presentation with new tuned model metrics
 """
 from pptx import Presentation
-from pptx.util import Pt
 import re
 
 # Load the presentation
@@ -44,16 +43,20 @@ for slide_num, slide in enumerate(prs.slides, 1):
                 # Update R² values
                 # Replace 0.8447, 0.39, 0.36, 0.25 with new R² 0.4772
                 if re.search(r'R²\s*[=:]\s*0\.8447', text, re.IGNORECASE):
-                    new_text = re.sub(r'(R²\s*[=:]\s*)0\.8447', rf'\g<1>{NEW_METRICS["r2"]:.4f}', text, flags=re.IGNORECASE)
+                    new_text = re.sub(r'(R²\s*[=:]\s*)0\.8447', rf'\g<1>{NEW_METRICS["r2"]:.4f}',
+                                      text, flags=re.IGNORECASE)
                     run.text = new_text
                     modified = True
-                    print(f"✓ Slide {slide_num} ({slide_title}): Updated R² = 0.8447 → {NEW_METRICS['r2']:.4f}")
+                    print(f"✓ Slide {slide_num} ({slide_title}): "
+                          f"Updated R² = 0.8447 → {NEW_METRICS['r2']:.4f}")
 
                 elif re.search(r'R²\s*[=:]\s*0\.39', text, re.IGNORECASE):
-                    new_text = re.sub(r'(R²\s*[=:]\s*)0\.39', rf'\g<1>{NEW_METRICS["r2"]:.4f}', text, flags=re.IGNORECASE)
+                    new_text = re.sub(r'(R²\s*[=:]\s*)0\.39', rf'\g<1>{NEW_METRICS["r2"]:.4f}',
+                                      text, flags=re.IGNORECASE)
                     run.text = new_text
                     modified = True
-                    print(f"✓ Slide {slide_num} ({slide_title}): Updated R² = 0.39 → {NEW_METRICS['r2']:.4f}")
+                    print(f"✓ Slide {slide_num} ({slide_title}): "
+                          f"Updated R² = 0.39 → {NEW_METRICS['r2']:.4f}")
 
                 elif re.search(r'R²\s*[=:]\s*0\.36', text, re.IGNORECASE):
                     # This is Random Forest - leave as is for comparison
@@ -74,24 +77,30 @@ for slide_num, slide in enumerate(prs.slides, 1):
 
                 # Update RMSE values
                 if re.search(r'RMSE\s*[=:]\s*5\.74', text, re.IGNORECASE):
-                    new_text = re.sub(r'(RMSE\s*[=:]\s*)5\.74', rf'\g<1>{NEW_METRICS["rmse"]:.2f}', text, flags=re.IGNORECASE)
+                    new_text = re.sub(r'(RMSE\s*[=:]\s*)5\.74', rf'\g<1>{NEW_METRICS["rmse"]:.2f}',
+                                      text, flags=re.IGNORECASE)
                     run.text = new_text
                     modified = True
-                    print(f"✓ Slide {slide_num} ({slide_title}): Updated RMSE = 5.74 → {NEW_METRICS['rmse']:.2f}")
+                    print(f"✓ Slide {slide_num} ({slide_title}): "
+                          f"Updated RMSE = 5.74 → {NEW_METRICS['rmse']:.2f}")
 
                 # Update MAE values
                 if re.search(r'MAE\s*[=:]\s*4\.54', text, re.IGNORECASE):
-                    new_text = re.sub(r'(MAE\s*[=:]\s*)4\.54', rf'\g<1>{NEW_METRICS["mae"]:.2f}', text, flags=re.IGNORECASE)
+                    new_text = re.sub(r'(MAE\s*[=:]\s*)4\.54', rf'\g<1>{NEW_METRICS["mae"]:.2f}',
+                                      text, flags=re.IGNORECASE)
                     run.text = new_text
                     modified = True
-                    print(f"✓ Slide {slide_num} ({slide_title}): Updated MAE = 4.54 → {NEW_METRICS['mae']:.2f}")
+                    print(f"✓ Slide {slide_num} ({slide_title}): "
+                          f"Updated MAE = 4.54 → {NEW_METRICS['mae']:.2f}")
 
                 # Update n_estimators
                 if re.search(r'200\s+estimators', text, re.IGNORECASE):
-                    new_text = re.sub(r'200(\s+estimators)', rf'{NEW_METRICS["n_estimators"]}\g<1>', text, flags=re.IGNORECASE)
+                    new_text = re.sub(r'200(\s+estimators)', rf'{NEW_METRICS["n_estimators"]}\g<1>',
+                                      text, flags=re.IGNORECASE)
                     run.text = new_text
                     modified = True
-                    print(f"✓ Slide {slide_num} ({slide_title}): Updated estimators = 200 → {NEW_METRICS['n_estimators']}")
+                    print(f"✓ Slide {slide_num} ({slide_title}): "
+                          f"Updated estimators = 200 → {NEW_METRICS['n_estimators']}")
 
                 if modified:
                     updates_made += 1
@@ -100,12 +109,12 @@ for slide_num, slide in enumerate(prs.slides, 1):
 output_path = 'presentation/Final_Spotify_Popularity_Prediction_Presentation_Updated.pptx'
 prs.save(output_path)
 
-print(f"\n✅ Presentation updated successfully!")
+print("\n✅ Presentation updated successfully!")
 print(f"   Total updates: {updates_made}")
 print(f"   Saved to: {output_path}")
-print(f"\n📝 Summary of changes:")
-print(f"   • R² = 0.4772 (was 0.8447 or 0.39)")
-print(f"   • RMSE = 16.06 (was 5.74 or similar)")
-print(f"   • MAE = 11.95 (was 4.54 or similar)")
-print(f"   • Estimators = 450 (was 200)")
-print(f"\n💡 Note: Model comparison R² values (Linear=0.25, RandomForest=0.36) kept for comparison")
+print("\n📝 Summary of changes:")
+print("   • R² = 0.4772 (was 0.8447 or 0.39)")
+print("   • RMSE = 16.06 (was 5.74 or similar)")
+print("   • MAE = 11.95 (was 4.54 or similar)")
+print("   • Estimators = 450 (was 200)")
+print("\n💡 Note: Model comparison R² values (Linear=0.25, RandomForest=0.36) kept for comparison")
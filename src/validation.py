@@ -0,0 +1,142 @@
+"""
+Rule-Based Data Validation
+
+Declarative range and not-null rules evaluated in one vectorized pass. Each
+row gets a bitmask with one bit per violated rule, so bad rows can be split
+off into a quarantine file while the clean rows continue through the
+pipeline, instead of one bad record aborting the whole run.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ValidationRule:
+    """A range or not-null rule on one column"""
+    name: str
+    column: str
+    min: Optional[float] = None
+    max: Optional[float] = None
+    not_null: bool = False
+
+    @property
+    def has_range(self) -> bool:
+        return self.min is not None or self.max is not None
+
+    def violations(self, null: np.ndarray, values: np.ndarray = None) -> np.ndarray:
+        """
+        Boolean mask of rows that break the rule.
+
+        Args:
+            null: Null mask of the column
+            values: Column as float64 (required for range rules)
+        """
+        bad = null.copy() if self.not_null else np.zeros(len(null), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            if self.min is not None:
+                bad |= values < self.min
+            if self.max is not None:
+                bad |= values > self.max
+        return bad
+
+
+def _unit_range(column: str) -> ValidationRule:
+    return ValidationRule(f"{column}_range", column, 0.0, 1.0)
+
+
+# Rules applied to the cleaned dataset (at most 64, one bit each). These are
+# the checks the pipeline has always made, so they keep the same rows.
+DEFAULT_RULES: List[ValidationRule] = [
+    ValidationRule("popularity_range", "popularity", 1, 100, not_null=True),
+    _unit_range('danceability'),
+    _unit_range('energy'),
+]
+
+# Opt-in stricter rules (SpotifyETL.validation_rules, or --strict-validation).
+# They also quarantine rows the default rules keep, so the cleaned dataset can
+# lose rows compared with a default run.
+STRICT_RULES: List[ValidationRule] = DEFAULT_RULES + [
+    ValidationRule("track_id_not_null", "track_id", not_null=True),
+    *[_unit_range(col) for col in ['speechiness', 'acousticness', 'instrumentalness', 'liveness',
+                                   'valence']],
+    ValidationRule("loudness_range", "loudness", -60.0, 5.0),
+    ValidationRule("tempo_range", "tempo", 0.0, 250.0),
+    ValidationRule("key_range", "key", -1, 11),
+    ValidationRule("mode_range", "mode", 0, 1),
+    ValidationRule("time_signature_range", "time_signature", 0, 7),
+    ValidationRule("duration_ms_range", "duration_ms", 1, None),
+]
+
+
+@dataclass
+class ValidationResult:
+    """Per-row violation bitmask of a validated dataframe"""
+    rules: List[ValidationRule]
+    bitmask: np.ndarray
+
+    @property
+    def invalid(self) -> np.ndarray:
+        """Boolean mask of rows that break at least one rule"""
+        return self.bitmask != 0
+
+    @property
+    def n_invalid(self) -> int:
+        return int(np.count_nonzero(self.bitmask))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of rows violating each rule (rules without violations omitted)"""
+        counts = {}
+        for bit, rule in enumerate(self.rules):
+            n = int(np.count_nonzero(self.bitmask & np.uint64(1 << bit)))
+            if n:
+                counts[rule.name] = n
+        return counts
+
+    def describe(self, bitmask: np.ndarray = None) -> List[str]:
+        """Comma-separated names of the violated rules, per row"""
+        bitmask = self.bitmask if bitmask is None else bitmask
+        names = []
+        for value in bitmask.tolist():
+            names.append(",".join(rule.name for bit, rule in enumerate(self.rules)
+                                  if value >> bit & 1))
+        return names
+
+
+def validate(df: pd.DataFrame, rules: List[ValidationRule] = None) -> ValidationResult:
+    """
+    Evaluate all rules on a dataframe.
+
+    Each column is read once; rules on columns missing from the dataframe are
+    skipped.
+
+    Args:
+        df: Dataframe to validate
+        rules: Rules to apply (default: DEFAULT_RULES)
+
+    Returns:
+        ValidationResult with a uint64 bitmask per row (bit i = rules[i] broken)
+    """
+    rules = list(rules if rules is not None else DEFAULT_RULES)
+    if len(rules) > 64:
+        raise ValueError(f"At most 64 validation rules are supported, got {len(rules)}")
+
+    bitmask = np.zeros(len(df), dtype=np.uint64)
+    by_column: Dict[str, List[int]] = {}
+    for bit, rule in enumerate(rules):
+        by_column.setdefault(rule.column, []).append(bit)
+
+    for column, bits in by_column.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        null = series.isna().to_numpy()
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan) \
+            if any(rules[bit].has_range for bit in bits) else None
+        for bit in bits:
+            bitmask |= rules[bit].violations(null, values).astype(np.uint64) << np.uint64(bit)
+
+    return ValidationResult(rules, bitmask)
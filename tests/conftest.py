@@ -0,0 +1,69 @@
+"""Shared fixtures: a small synthetic raw dataset and its cleaned Parquet file"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+GENRES = ['pop', 'rock', 'jazz', 'k-pop', 'hip-hop', 'classical', 'acoustic', 'metal']
+
+
+def make_raw_tracks(n: int = 2000, seed: int = 0, offset: int = 0) -> pd.DataFrame:
+    """Random tracks with the columns of the Kaggle Spotify dataset"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(offset, offset + n)
+    return pd.DataFrame({
+        'Unnamed: 0': ids,
+        'track_id': [f"id{i:08d}" for i in ids],
+        'artists': rng.choice(['A;B', 'C', 'D;E;F', 'G feat. H'], n),
+        'album_name': rng.choice(['alb1', 'alb2', 'alb3', None], n),
+        'track_name': [f"track {i}" for i in ids],
+        'popularity': rng.integers(1, 101, n),
+        'duration_ms': rng.integers(60000, 400000, n),
+        'explicit': rng.choice([True, False], n),
+        'danceability': rng.random(n).round(3),
+        'energy': rng.random(n).round(3),
+        'key': rng.integers(0, 12, n),
+        'loudness': (-rng.random(n) * 30).round(3),
+        'mode': rng.integers(0, 2, n),
+        'speechiness': rng.random(n).round(3),
+        'acousticness': rng.random(n).round(3),
+        'instrumentalness': rng.random(n).round(3),
+        'liveness': rng.random(n).round(3),
+        'valence': rng.random(n).round(3),
+        'tempo': (rng.random(n) * 150 + 50).round(3),
+        'time_signature': rng.choice([3, 4, 5], n),
+        'track_genre': rng.choice(GENRES, n),
+    })
+
+
+@pytest.fixture
+def raw_csv(tmp_path) -> Path:
+    path = tmp_path / "raw" / "dataset.csv"
+    path.parent.mkdir()
+    make_raw_tracks().to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def cleaned_parquet(raw_csv, tmp_path) -> Path:
+    """Cleaned dataset written by a batch ETL run"""
+    from src.etl_pipeline import SpotifyETL
+
+    etl = SpotifyETL(str(raw_csv))
+    etl.extract()
+    etl.transform()
+    _, parquet_path = etl.load(str(tmp_path / "processed" / "cleaned_spotify_data.csv"), write_csv=False)
+    return Path(parquet_path)
+
+
+@pytest.fixture
+def repo_env() -> dict:
+    """Environment for subprocesses that import the src package"""
+    return {**os.environ, 'PYTHONPATH': str(REPO_ROOT)}
@@ -0,0 +1,34 @@
+"""Tests for the column statistics embedded in the cleaned Parquet files"""
+
+import numpy as np
+import pytest
+
+from src.column_stats import StatisticsAccumulator, column_statistics, read_parquet_statistics
+from src.etl_pipeline import SpotifyETL
+
+
+def test_batches_give_single_pass_statistics():
+    rng = np.random.default_rng(0)
+    values = rng.normal(5, 2, (5000, 3))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:, 2] = np.round(values[:, 2])
+
+    accumulator = StatisticsAccumulator(['a', 'b', 'c'])
+    for start in range(0, len(values), 777):
+        accumulator.update(values[start:start + 777])
+    batched, single = accumulator.to_dict(), column_statistics(values, ['a', 'b', 'c'])
+
+    for col in single:
+        assert batched[col] == pytest.approx(single[col])
+    assert single['c']['distinct'] == len(np.unique(values[~np.isnan(values[:, 2]), 2]))
+
+
+def test_streaming_and_delta_outputs_carry_statistics(raw_csv, tmp_path):
+    rows, _, parquet_path = SpotifyETL(str(raw_csv)).run_streaming(
+        str(tmp_path / "stream" / "cleaned.csv"), chunksize=500, write_csv=False)
+    stats = read_parquet_statistics(parquet_path).set_index('feature')
+    assert stats.loc['popularity', 'missing'] == 0
+    assert 'energy' in stats.index
+
+    _, part_path = SpotifyETL(str(raw_csv)).run_delta(str(tmp_path / "delta" / "cleaned"))
+    assert 'energy' in read_parquet_statistics(part_path)['feature'].values
@@ -0,0 +1,40 @@
+"""Tests for the mergeable single-pass profiler"""
+
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from src.data_profiler import DataProfile
+
+
+def test_merged_chunk_profiles_match_exact_statistics():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({
+        'tempo': rng.normal(120, 30, n),
+        'key': rng.integers(0, 12, n),
+        'track_id': [f"id{i}" for i in rng.integers(0, 15_000, n)],
+    })
+    df.loc[rng.random(n) < 0.05, 'tempo'] = np.nan
+    df.loc[rng.random(n) < 0.02, 'track_id'] = None
+
+    chunks = [DataProfile.from_frame(df.iloc[i:i + 1500]) for i in range(0, n, 1500)]
+    report = reduce(DataProfile.merge, chunks).to_report()
+
+    assert report['total_rows'] == n
+    assert report['missing_values'] == df.isna().sum().to_dict()
+
+    tempo = df['tempo'].dropna()
+    stats = report['numeric_stats']['tempo']
+    assert stats['count'] == len(tempo)
+    np.testing.assert_allclose([stats['mean'], stats['std'], stats['min'], stats['max']],
+                               [tempo.mean(), tempo.std(), tempo.min(), tempo.max()], rtol=1e-9)
+    # Approximate quantiles: rank error within 1%
+    for q in (0.25, 0.5, 0.75):
+        assert abs((tempo < stats[f"{q:.0%}"]).mean() - q) < 0.01
+
+    # HyperLogLog distinct counts within 5% (about 3 standard errors at p=12)
+    for col in df.columns:
+        exact = df[col].nunique()
+        assert abs(report['distinct_counts'][col] - exact) <= max(0.05 * exact, 1)
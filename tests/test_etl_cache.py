@@ -0,0 +1,47 @@
+"""Tests for the skip cache of batch ETL runs"""
+
+import pandas as pd
+
+from src.etl_pipeline import SpotifyETL
+from src.validation import DEFAULT_RULES, ValidationRule
+
+
+def _run(raw_csv, output_path, rules=None):
+    etl = SpotifyETL(str(raw_csv))
+    if rules is not None:
+        etl.validation_rules = rules
+    etl.run(str(output_path), write_csv=False)
+    return etl
+
+
+def test_unchanged_run_is_cached(raw_csv, tmp_path):
+    output_path = tmp_path / "out" / "cleaned.csv"
+    assert 'extract' in _run(raw_csv, output_path).stage_metrics
+    assert 'extract' not in _run(raw_csv, output_path).stage_metrics
+
+
+def test_changed_validation_rules_invalidate_cache(raw_csv, tmp_path):
+    output_path = tmp_path / "out" / "cleaned.csv"
+    _run(raw_csv, output_path)
+    stricter = DEFAULT_RULES + [ValidationRule("energy_floor", "energy", 0.1, None)]
+    etl = _run(raw_csv, output_path, stricter)
+    assert 'extract' in etl.stage_metrics
+    assert (etl.df['energy'] >= 0.1).all()
+
+
+def test_cache_hit_returns_the_cleaned_rows(raw_csv, tmp_path):
+    output_path = tmp_path / "out" / "cleaned.csv"
+    fresh = _run(raw_csv, output_path)
+    etl = SpotifyETL(str(raw_csv))
+    df, _, parquet_path = etl.run(str(output_path), write_csv=False)
+    assert 'extract' not in etl.stage_metrics and df is etl.df
+    pd.testing.assert_frame_equal(df.reset_index(drop=True), fresh.df.reset_index(drop=True))
+    assert etl.imputation_stats.version == fresh.imputation_stats.version
+
+
+def test_engine_is_part_of_cache_key(raw_csv, tmp_path):
+    output_path = tmp_path / "out" / "cleaned.csv"
+    _run(raw_csv, output_path)
+    etl = SpotifyETL(str(raw_csv))
+    etl.run(str(output_path), write_csv=False, engine='pandas')
+    assert 'extract' in etl.stage_metrics
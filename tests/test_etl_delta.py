@@ -0,0 +1,64 @@
+"""Tests for delta (incremental) ETL runs"""
+
+import pandas as pd
+
+from conftest import make_raw_tracks
+from src.etl_pipeline import SpotifyETL, _last_record_end
+from src.fingerprint_index import AUDIO_FEATURES, FingerprintIndex, fingerprint
+
+
+def test_record_end_skips_newlines_in_quoted_fields():
+    data = b'a,b\n1,"x\ny"\n2,"p\nq'
+    assert data[:_last_record_end(data)] == b'a,b\n1,"x\ny"\n'
+    assert _last_record_end(b'a,b') == 0
+
+
+def test_delta_runs_append_only_new_rows(tmp_path):
+    raw_csv = tmp_path / "raw" / "dataset.csv"
+    raw_csv.parent.mkdir()
+    make_raw_tracks(n=500).to_csv(raw_csv, index=False)
+    dataset_dir = tmp_path / "processed" / "cleaned"
+
+    rows_first, first_part = SpotifyETL(str(raw_csv)).run_delta(str(dataset_dir))
+    make_raw_tracks(n=300, seed=1, offset=500).to_csv(raw_csv, mode='a', header=False, index=False)
+    rows_second, second_part = SpotifyETL(str(raw_csv)).run_delta(str(dataset_dir))
+
+    assert first_part.exists() and second_part.exists()
+    assert not list(dataset_dir.glob("ingest_date=*/.*.tmp"))
+    assert len(pd.read_parquet(dataset_dir)) == rows_first + rows_second
+    assert SpotifyETL(str(raw_csv)).run_delta(str(dataset_dir)) == (0, None)
+
+
+def test_staged_part_is_published_once_fingerprints_are_saved(tmp_path):
+    raw_csv = tmp_path / "raw" / "dataset.csv"
+    raw_csv.parent.mkdir()
+    make_raw_tracks(n=500).to_csv(raw_csv, index=False)
+    dataset_dir = tmp_path / "processed" / "cleaned"
+    rows, part_path = SpotifyETL(str(raw_csv)).run_delta(str(dataset_dir))
+
+    # Simulate a crash after the fingerprints were saved but before the rename
+    staged_path = part_path.with_name(f".{part_path.name}.tmp")
+    part_path.rename(staged_path)
+    (dataset_dir / "_audio_fingerprints.parquet").touch()
+
+    assert SpotifyETL(str(raw_csv)).run_delta(str(dataset_dir)) == (0, None)
+    assert part_path.exists() and not staged_path.exists()
+    assert len(pd.read_parquet(dataset_dir)) == rows
+
+
+def test_stored_corpus_fingerprints_match_raw_rows():
+    raw = make_raw_tracks(n=200)
+    etl = SpotifyETL()
+    etl.df = raw.copy()
+    etl.transform()
+    etl.enforce_schema()
+    stored = etl.df
+    assert (stored[AUDIO_FEATURES].dtypes == 'float32').all()
+
+    # The index of the stored corpus recognizes the raw float64 rows it came from
+    index = FingerprintIndex.from_frame(stored)
+    kept = raw.set_index('track_id').loc[stored['track_id']].reset_index()
+    assert (fingerprint(kept) == fingerprint(stored)).all()
+    batch, _ = index.deduplicate(kept.assign(track_id=kept['track_id'] + 'r', popularity=0),
+                                 keep='popular')
+    assert batch.empty
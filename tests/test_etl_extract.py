@@ -0,0 +1,23 @@
+"""Tests for reading the raw CSV with the Arrow and pandas engines"""
+
+import numpy as np
+import pandas as pd
+
+from src.etl_pipeline import SpotifyETL
+
+
+def test_arrow_engine_matches_pandas_missing_values(raw_csv):
+    arrow = SpotifyETL(str(raw_csv)).extract(engine='arrow')
+    expected = SpotifyETL(str(raw_csv)).extract(engine='pandas')
+
+    assert arrow['album_name'].isna().any()
+    assert not any(value is None for value in arrow['album_name'])
+    pd.testing.assert_series_equal(arrow['album_name'], expected['album_name'])
+
+
+def test_arrow_engine_reads_absent_columns_as_missing(raw_csv):
+    df = SpotifyETL(str(raw_csv)).extract(columns=['track_id', 'popularity', 'release_year'])
+
+    assert list(df.columns) == ['track_id', 'popularity', 'release_year']
+    assert df['release_year'].isna().all()
+    assert np.isnan(df['release_year'].iloc[0])
@@ -0,0 +1,67 @@
+"""Tests for the process-pool transform"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_raw_tracks
+from src.etl_pipeline import SpotifyETL
+
+
+def _raw_with_duplicates_and_nulls() -> pd.DataFrame:
+    df = make_raw_tracks(n=3000)
+    rng = np.random.default_rng(1)
+    exact = df.sample(200, random_state=1)
+    reissues = df.sample(150, random_state=2).assign(
+        track_id=lambda d: d['track_id'] + 'r', popularity=rng.integers(1, 101, 150))
+    df = pd.concat([df, exact, reissues], ignore_index=True)
+    for seed, col in enumerate(['danceability', 'tempo', 'loudness', 'album_name']):
+        df.loc[df.sample(frac=0.05, random_state=seed).index, col] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('shard_by', ['track_id', 'track_genre'])
+def test_parallel_transform_matches_serial(shard_by):
+    raw = _raw_with_duplicates_and_nulls()
+
+    serial = SpotifyETL()
+    serial.df = raw.copy()
+    serial.transform()
+
+    parallel = SpotifyETL()
+    parallel.df = raw.copy()
+    parallel.transform_parallel(n_workers=2, shard_by=shard_by)
+
+    pd.testing.assert_frame_equal(parallel.df, serial.df)
+
+
+def test_stage_metrics_record_worker_memory(raw_csv, tmp_path):
+    etl = SpotifyETL(str(raw_csv))
+    etl.run(str(tmp_path / "out" / "cleaned.csv"), write_csv=False, n_workers=2)
+
+    metrics = etl.stage_metrics['transform.parallel']
+    assert metrics['workers_peak_rss_mb'] > 0
+    assert metrics['process_peak_rss_mb'] > 0
+    assert metrics['rss_growth_mb'] is not None
+
+
+def test_serial_and_parallel_dedup_hash_audio_features_alike():
+    raw = make_raw_tracks(n=400)
+    baseline = SpotifyETL()
+    baseline.df = raw.copy()
+    baseline.transform()
+    # Reissues differing only below float32 precision are the same recording once stored
+    reissues = raw.head(50).assign(track_id=lambda d: d['track_id'] + 'r',
+                                   energy=lambda d: d['energy'] + 1e-12)
+    raw = pd.concat([raw, reissues], ignore_index=True)
+
+    serial = SpotifyETL()
+    serial.df = raw.copy()
+    serial.transform()
+    assert len(serial.df) == len(baseline.df)
+
+    parallel = SpotifyETL()
+    parallel.df = raw.copy()
+    parallel.transform_parallel(n_workers=2, shard_by='track_id')
+
+    pd.testing.assert_frame_equal(parallel.df, serial.df)
@@ -0,0 +1,32 @@
+"""Tests for the genre-partitioned copy of the cleaned dataset"""
+
+import subprocess
+import sys
+
+import pandas as pd
+
+from conftest import REPO_ROOT
+from src.etl_pipeline import SpotifyETL, genre_dataset_path, read_cleaned_data
+
+
+def test_partitions_are_written_next_to_flat_file(raw_csv, tmp_path):
+    etl = SpotifyETL(str(raw_csv))
+    _, _, parquet_path = etl.run(str(tmp_path / "out" / "cleaned.csv"), write_csv=False,
+                                 partition_by_genre=True)
+
+    assert parquet_path.is_file()
+    assert genre_dataset_path(parquet_path).is_dir()
+    assert len(pd.read_parquet(parquet_path)) == len(etl.df)
+
+    genre = etl.df['track_genre'].iloc[0]
+    subset = read_cleaned_data(str(parquet_path), genres=[genre], columns=['track_id'])
+    assert len(subset) == (etl.df['track_genre'] == genre).sum()
+
+
+def test_partition_flag_rejected_outside_batch_runs(raw_csv, tmp_path, repo_env):
+    result = subprocess.run(
+        [sys.executable, "src/etl_pipeline.py", "--input", str(raw_csv),
+         "--output", str(tmp_path / "cleaned.csv"), "--chunksize", "500", "--partition-by-genre"],
+        cwd=REPO_ROOT, env=repo_env, capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "--partition-by-genre" in result.stderr
@@ -0,0 +1,38 @@
+"""Tests for the batch transform of src/etl_pipeline.py"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from conftest import make_raw_tracks
+from src.etl_pipeline import SpotifyETL
+
+
+def test_vectorized_mood_matches_row_wise_classifier():
+    edges = [np.nan, -0.1, 0.0, 0.4999, 0.5, 0.5001, 1.0, 1.2]
+    rows = pd.DataFrame(list(product(edges, edges)), columns=['valence', 'energy'])
+
+    expected = rows.apply(SpotifyETL._classify_mood, axis=1)
+    vectorized = SpotifyETL._classify_mood_vectorized(rows['valence'], rows['energy'])
+    assert list(vectorized.astype(str)) == list(expected)
+
+
+def test_copy_free_transform_matches_legacy_path():
+    raw = make_raw_tracks(n=2000)
+    rng = np.random.default_rng(3)
+    exact = raw.sample(100, random_state=1)
+    reissues = raw.sample(100, random_state=2).assign(
+        track_id=lambda d: d['track_id'] + 'r', popularity=rng.integers(0, 101, 100),
+        energy=lambda d: d['energy'] + 1e-12)
+    raw = pd.concat([raw, exact, reissues], ignore_index=True)
+    raw.loc[raw.sample(50, random_state=4).index, 'popularity'] = 0
+    for seed, col in enumerate(['danceability', 'tempo', 'album_name']):
+        raw.loc[raw.sample(frac=0.05, random_state=seed).index, col] = np.nan
+
+    frames = []
+    for copy_free in (True, False):
+        etl = SpotifyETL()
+        etl.df = raw.copy()
+        frames.append(etl.transform(copy_free=copy_free))
+    pd.testing.assert_frame_equal(frames[0], frames[1])
@@ -0,0 +1,25 @@
+"""Tests for the compact storage schema of the cleaned dataset"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.etl_pipeline import SpotifyETL
+
+
+def _etl(explicit) -> SpotifyETL:
+    etl = SpotifyETL()
+    etl.df = pd.DataFrame({'popularity': [10, 20, 30], 'explicit': explicit})
+    return etl
+
+
+def test_bool_cast_keeps_values():
+    etl = _etl(pd.Series([True, False, 1], dtype=object))
+    etl.enforce_schema()
+    assert etl.df['explicit'].tolist() == [True, False, True]
+
+
+@pytest.mark.parametrize('explicit', [[True, np.nan, False], [True, 'yes', False]])
+def test_bool_cast_rejects_missing_and_foreign_values(explicit):
+    with pytest.raises(ValueError, match="explicit"):
+        _etl(pd.Series(explicit, dtype=object)).enforce_schema()
@@ -0,0 +1,134 @@
+"""Tests for the feature pipeline saved by src/feature_engineering.py"""
+
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import REPO_ROOT
+from src.feature_engineering import (ML_STORE_DIR, PIPELINE_FILE, FeatureEngineer, FeaturePipeline,
+                                     compute_features, hash_encode, load_ml_data, one_hot_encode,
+                                     resolve_features)
+
+
+def test_saved_pipeline_loads_in_another_process(cleaned_parquet, tmp_path, repo_env):
+    output_dir = tmp_path / "ml"
+    subprocess.run([sys.executable, "src/feature_engineering.py", "--input", str(cleaned_parquet),
+                    "--output-dir", str(output_dir)], cwd=REPO_ROOT, env=repo_env, check=True,
+                   capture_output=True)
+
+    # A fresh interpreter, as the training scripts and dashboards use
+    script = ("import joblib, pandas as pd; "
+              f"p = joblib.load({str(output_dir / PIPELINE_FILE)!r}); "
+              f"X = p.transform(pd.read_parquet({str(cleaned_parquet)!r}).head(5)); "
+              "print(type(p).__module__, X.shape[0])")
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=repo_env, check=True,
+                            capture_output=True, text=True)
+    assert result.stdout.split() == ["src.feature_engineering", "5"]
+
+
+def test_pipeline_round_trip_gives_same_features(cleaned_parquet, tmp_path):
+    df = pd.read_parquet(cleaned_parquet)
+    pipeline = FeaturePipeline().fit(df)
+    joblib.dump(pipeline, tmp_path / PIPELINE_FILE)
+
+    reloaded = joblib.load(tmp_path / PIPELINE_FILE)
+    pd.testing.assert_frame_equal(reloaded.transform(df), pipeline.transform(df))
+
+
+def test_streaming_replaces_batch_outputs_for_training(cleaned_parquet, tmp_path):
+    from src.train_model import ModelTrainer
+
+    output_dir = tmp_path / "ml"
+    FeatureEngineer(str(cleaned_parquet)).run(output_dir)
+    rows_written, _ = FeatureEngineer(str(cleaned_parquet)).run_streaming(output_dir, batch_size=500)
+
+    assert not (output_dir / ML_STORE_DIR).exists()
+    X, y = load_ml_data(output_dir)
+    assert len(X) == len(y) == rows_written
+    assert X.index.name == 'track_id'
+
+    trainer = ModelTrainer().load_data(output_dir)
+    assert len(trainer.X_train) + len(trainer.X_test) == rows_written
+    assert list(trainer.X_train.columns) == joblib.load(output_dir / PIPELINE_FILE).features_
+
+
+def test_pipeline_for_model_features_fits_on_those_columns(cleaned_parquet):
+    df = pd.read_parquet(cleaned_parquet)
+    # 'Chill/Happy' is the dropped first mood category
+    features = ['danceability', 'energy', 'tempo', 'energy_danceability',
+                'mood_energy_Happy/High Energy', 'mood_energy_Chill/Happy']
+
+    from_inputs = FeaturePipeline(features=features, scale=False).fit(
+        df[['danceability', 'energy', 'tempo', 'valence']])
+    from_cleaned = FeaturePipeline(features=features, scale=False).fit(df)
+    pd.testing.assert_frame_equal(from_inputs.transform(df), from_cleaned.transform(df))
+    assert from_cleaned.transform(df)['mood_energy_Happy/High Energy'].any()
+
+    with pytest.raises(ValueError, match='mood_energy_Happy/Energetic'):
+        FeaturePipeline(features=['energy', 'mood_energy_Happy/Energetic'], scale=False).fit(df)
+
+
+def test_step_by_step_api_delegates_to_pipeline(cleaned_parquet):
+    engineer = FeatureEngineer(str(cleaned_parquet)).load_data()
+    engineer.create_interaction_features().encode_features().scale_features()
+    assert engineer.scaler is engineer.pipeline.scaler_
+    assert list(engineer.le_genre.classes_) == list(engineer.pipeline.genre_classes_)
+    genres = engineer.df['track_genre'].head(5)
+    assert list(engineer.le_genre.inverse_transform(engineer.le_genre.transform(genres))) == \
+        list(genres)
+
+
+def test_one_hot_encode_matches_get_dummies():
+    df = pd.DataFrame({'mode': [1, 0, 1, None, 0], 'key': ['C', 'D', 'E', 'D', None]})
+    categories = {'mode': [0.0, 1.0], 'key': ['C', 'D', 'E']}
+    expected = pd.get_dummies(
+        df.astype({col: pd.CategoricalDtype(cats) for col, cats in categories.items()}),
+        drop_first=True, dtype=np.uint8)
+
+    block, names = one_hot_encode(df, categories)
+    assert names == ['mode_1.0', 'key_D', 'key_E'] == list(expected.columns)
+    np.testing.assert_array_equal(block, expected.to_numpy())
+    sparse_block, _ = one_hot_encode(df, categories, sparse=True)
+    np.testing.assert_array_equal(sparse_block.toarray(), block)
+
+
+def test_registry_resolves_transitive_dependencies():
+    assert [f.name for f in resolve_features(['is_long_track'])] == \
+        ['duration_min', 'is_long_track']
+    assert [f.name for f in resolve_features(['is_long_track'], {'duration_min'})] == \
+        ['is_long_track']
+
+    df = compute_features(pd.DataFrame({'duration_ms': [120_000, 360_000]}), ['is_long_track'])
+    assert list(df.columns) == ['duration_ms', 'duration_min', 'is_long_track']
+    assert df['is_long_track'].tolist() == [0, 1]
+
+
+def test_hash_encode_has_fixed_width_and_deterministic_rows():
+    df = pd.DataFrame({'artists': ['A;B', 'C', None, 'A;B'], 'album_name': ['x', 'y', 'z', 'x']})
+    block, names = hash_encode(df, ['artists', 'album_name'], n_features=64)
+    assert block.shape == (4, 64) and names == [f"hash_{i}" for i in range(64)]
+    np.testing.assert_array_equal(block[0].toarray(), block[3].toarray())
+
+    # Each row depends only on its own values, whatever else is in the batch
+    unseen = pd.DataFrame({'artists': ['new artist', 'C'], 'album_name': ['w', 'y']})
+    other, _ = hash_encode(unseen, ['artists', 'album_name'], n_features=64)
+    assert other.shape == (2, 64)
+    np.testing.assert_array_equal(other[1].toarray(), block[1].toarray())
+    again, _ = hash_encode(df, ['artists', 'album_name'], n_features=64)
+    assert (again != block).nnz == 0
+
+
+def test_categorical_mode_maps_unseen_categories_to_nan(cleaned_parquet):
+    df = pd.read_parquet(cleaned_parquet)
+    pipeline = FeaturePipeline(features=['energy', 'track_genre', 'key'], categorical=True).fit(df)
+
+    tracks = df.head(3).assign(track_genre=['pop', 'not-a-genre', 'jazz'], key=[0, 99, 5])
+    X = pipeline.transform(tracks)
+    assert isinstance(X['track_genre'].dtype, pd.CategoricalDtype)
+    assert list(X['track_genre'].cat.categories) == pipeline.categories_['track_genre']
+    assert X['track_genre'].isna().tolist() == [False, True, False]
+    assert X['key'].isna().tolist() == [False, True, False]
@@ -0,0 +1,32 @@
+"""Tests for the memory-mapped feature store"""
+
+import pandas as pd
+
+from src.feature_store import build_feature_store
+
+
+def test_rows_for_looks_up_track_ids(cleaned_parquet, tmp_path):
+    df = pd.read_parquet(cleaned_parquet).head(50)
+    store = build_feature_store(df, path=str(tmp_path / "store"), columns=['energy', 'tempo'])
+
+    ids = store.track_ids()
+    assert store.rows_for([ids[3], 'missing', ids[0]]).tolist() == [3, -1, 0]
+
+
+def test_rows_for_on_empty_store(cleaned_parquet, tmp_path):
+    df = pd.read_parquet(cleaned_parquet).head(0)
+    store = build_feature_store(df, path=str(tmp_path / "store"), columns=['energy', 'tempo'])
+
+    assert len(store) == 0
+    assert store.rows_for(['a', 'b']).tolist() == [-1, -1]
+
+
+def test_rebuild_keeps_previous_version_until_next_build(cleaned_parquet, tmp_path):
+    df = pd.read_parquet(cleaned_parquet)
+    path = tmp_path / "store"
+    versions = [build_feature_store(df.head(n), path=str(path), columns=['energy']).version
+                for n in (10, 20)]
+    assert sorted(d.name for d in path.glob('v*')) == sorted(f"v{v}" for v in versions)
+
+    latest = build_feature_store(df.head(30), path=str(path), columns=['energy']).version
+    assert sorted(d.name for d in path.glob('v*')) == sorted([f"v{versions[1]}", f"v{latest}"])
@@ -0,0 +1,42 @@
+"""Tests for the persisted imputation statistics"""
+
+import pandas as pd
+import pytest
+
+from src.feature_engineering import FeaturePipeline
+from src.imputation_stats import ImputationStats
+
+
+def test_defaults_fall_back_for_columns_without_stats():
+    stats = ImputationStats.fit(pd.DataFrame({'tempo': [100.0, 120.0, None]}))
+    assert stats.defaults(['tempo', 'release_year', 'other']) == \
+        {'tempo': 110.0, 'release_year': 2020, 'other': 0}
+
+
+def test_pipeline_defaults_release_year(cleaned_parquet):
+    df = pd.read_parquet(cleaned_parquet)
+    pipeline = FeaturePipeline(features=['energy', 'release_year'], scale=False).fit(df)
+    assert (pipeline.transform(df.head(3))['release_year'] == 2020).all()
+
+
+def test_pipeline_takes_defaults_from_persisted_stats(cleaned_parquet, tmp_path):
+    df = pd.read_parquet(cleaned_parquet)
+    stats = ImputationStats(fill_values={'energy': 0.123, 'release_year': 1999}, ranges={})
+    stats_path = stats.save(tmp_path / 'imputation_stats.json')
+
+    pipeline = FeaturePipeline(features=['energy', 'tempo', 'release_year'], scale=False,
+                               stats_path=stats_path).fit(df)
+    assert pipeline.stats_.fill_values['energy'] == 0.123
+    assert pipeline.stats_.fill_values['tempo'] == df['tempo'].median()
+    assert pipeline.defaults_ == {'release_year': 1999}
+    assert pipeline.transform(df[['tempo']].head(2))['energy'].eq(0.123).all()
+
+
+def test_pipeline_from_stats_needs_no_data(cleaned_parquet):
+    df = pd.read_parquet(cleaned_parquet)
+    stats = ImputationStats.fit(df)
+    features = ['energy', 'valence_energy', 'is_long_track', 'release_year']
+    fitted = FeaturePipeline(features=features, scale=False).fit(df)
+    built = FeaturePipeline.from_stats(features, stats)
+    pd.testing.assert_frame_equal(built.transform(df.head(20)), fitted.transform(df.head(20)))
+    pytest.raises(ValueError, FeaturePipeline.from_stats, ['energy', 'mode_1'], stats)
@@ -0,0 +1,43 @@
+"""Tests for grouping tracks with near-identical audio features"""
+
+import numpy as np
+import pandas as pd
+
+from src import near_duplicates
+from src.fingerprint_index import AUDIO_FEATURES
+from src.near_duplicates import near_duplicate_groups, near_duplicate_mask
+
+
+def _tracks(energy, popularity) -> pd.DataFrame:
+    df = pd.DataFrame({feature: 0.5 for feature in AUDIO_FEATURES}, index=range(len(energy)))
+    df['loudness'] = -10.0
+    df['tempo'] = 120.0
+    df['energy'] = energy
+    df['popularity'] = popularity
+    return df
+
+
+def test_near_duplicates_do_not_chain():
+    # A~B and B~C, but A and C differ by twice the tolerance
+    df = _tracks([0.500, 0.501, 0.502], [50, 40, 30])
+    assert near_duplicate_mask(df, tolerance=0.0015).tolist() == [True, False, True]
+
+
+def test_group_members_are_within_tolerance_of_representative():
+    rng = np.random.default_rng(0)
+    df = _tracks(0.5 + rng.uniform(0, 0.02, 2000), rng.integers(0, 100, 2000))
+    labels = near_duplicate_groups(df, tolerance=0.002)
+
+    assert (np.abs(df['energy'].to_numpy() - df['energy'].to_numpy()[labels]) <= 0.002 + 1e-12).all()
+    representatives = labels == np.arange(len(df))
+    assert (df['popularity'].to_numpy() <= df['popularity'].to_numpy()[labels]).all()
+    assert near_duplicate_mask(df, tolerance=0.002).tolist() == representatives.tolist()
+
+
+def test_dense_cell_is_scanned_in_bounded_batches(monkeypatch):
+    rng = np.random.default_rng(1)
+    df = _tracks(0.5 + rng.uniform(0, 0.001, 500), rng.integers(0, 100, 500))
+    expected = near_duplicate_groups(df, tolerance=0.002)
+
+    monkeypatch.setattr(near_duplicates, 'MAX_CANDIDATE_PAIRS', 1000)
+    np.testing.assert_array_equal(near_duplicate_groups(df, tolerance=0.002), expected)
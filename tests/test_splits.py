@@ -0,0 +1,86 @@
+"""Tests for hash splits and split manifests"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+
+from src.splits import SplitManifest, assign_splits, frame_hash, hash_split, make_split
+
+
+def _frame(n: int, offset: int = 0, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    index = pd.Index([f"id{i:08d}" for i in range(offset, offset + n)], name='track_id')
+    X = pd.DataFrame({'energy': rng.random(n), 'tempo': rng.random(n) * 200}, index=index)
+    y = pd.Series(rng.integers(1, 101, n), index=index, name='popularity')
+    return X, y
+
+
+def test_assignment_is_stable_when_rows_are_added():
+    keys = [f"id{i:08d}" for i in range(5000)]
+    before = assign_splits(keys, test_size=0.15, val_size=0.15)
+    after = assign_splits(keys + [f"id{i:08d}" for i in range(5000, 8000)], test_size=0.15, val_size=0.15)
+
+    np.testing.assert_array_equal(after[:5000], before)
+    np.testing.assert_array_equal(assign_splits(keys[::-1], 0.15, 0.15), before[::-1])
+
+
+def test_split_proportions_match_fractions():
+    rows = hash_split([f"id{i:08d}" for i in range(50_000)], test_size=0.15, val_size=0.15)
+
+    assert sum(len(r) for r in rows.values()) == 50_000
+    # Binomial standard deviation at n=50,000 and p=0.15 is about 0.0016
+    assert abs(len(rows['test']) / 50_000 - 0.15) < 0.01
+    assert abs(len(rows['val']) / 50_000 - 0.15) < 0.01
+    assert abs(len(rows['train']) / 50_000 - 0.70) < 0.01
+
+
+def test_random_split_matches_train_test_split():
+    X, _ = _frame(1000)
+    rows = make_split(len(X), test_size=0.2, val_size=0.1, random_state=7)
+
+    X_train, X_test = train_test_split(X, test_size=0.2, random_state=7, shuffle=True)
+    X_train, X_val = train_test_split(X_train, test_size=0.1 / 0.8, random_state=7, shuffle=True)
+    for split, expected in [('train', X_train), ('val', X_val), ('test', X_test)]:
+        pd.testing.assert_frame_equal(X.iloc[rows[split]], expected)
+
+
+def test_manifest_round_trip(tmp_path):
+    X, y = _frame(500)
+    manifest = SplitManifest.create('full', X, y, test_size=0.15, val_size=0.15, method='hash')
+    path = manifest.save(tmp_path / "full.json")
+
+    loaded = SplitManifest.load(path)
+    assert (loaded.name, loaded.source_hash, loaded.n_rows, loaded.params) == \
+        (manifest.name, manifest.source_hash, manifest.n_rows, manifest.params)
+    for split, rows in manifest.indices.items():
+        np.testing.assert_array_equal(loaded.indices[split], rows)
+        assert loaded.indices[split].dtype == np.int32
+    pd.testing.assert_frame_equal(loaded.take('test', X, y, verify=True)[0], X.iloc[rows])
+
+
+def test_manifest_for_other_data_is_rejected(tmp_path):
+    X, y = _frame(500)
+    manifest = SplitManifest.load_or_create('full', X, y, splits_dir=tmp_path, test_size=0.2, method='hash')
+
+    changed = X.assign(energy=X['energy'] + 0.01)
+    assert frame_hash(changed, y) != manifest.source_hash
+    with pytest.raises(ValueError, match="Split manifest 'full'"):
+        manifest.verify(changed, y)
+
+    # load_or_create draws and saves a new split for the changed data
+    redrawn = SplitManifest.load_or_create('full', changed, y, splits_dir=tmp_path, test_size=0.2, method='hash')
+    assert redrawn.source_hash == frame_hash(changed, y)
+    assert SplitManifest.load(tmp_path / "full.json").source_hash == redrawn.source_hash
+
+
+def test_redrawn_hash_manifest_keeps_earlier_tracks_in_their_split(tmp_path):
+    X, y = _frame(2000)
+    first = SplitManifest.load_or_create('full', X, y, splits_dir=tmp_path, test_size=0.2, method='hash')
+
+    X_new, y_new = _frame(500, offset=2000, seed=1)
+    grown = SplitManifest.load_or_create('full', pd.concat([X, X_new]), pd.concat([y, y_new]),
+                                         splits_dir=tmp_path, test_size=0.2, method='hash')
+    for split in ('train', 'test'):
+        old_rows = grown.indices[split][grown.indices[split] < len(X)]
+        np.testing.assert_array_equal(old_rows, first.indices[split])
@@ -0,0 +1,49 @@
+"""Tests for the declarative validation rules"""
+
+import numpy as np
+import pandas as pd
+
+from src.validation import DEFAULT_RULES, STRICT_RULES, validate
+
+
+def _tracks() -> pd.DataFrame:
+    return pd.DataFrame({
+        'track_id': ['a', 'b', None, 'd'],
+        'popularity': [10, 0, 30, 40],
+        'danceability': [0.5, 0.5, 0.5, 0.5],
+        'energy': [0.5, 0.5, 0.5, 0.5],
+        'tempo': [120.0, 120.0, 120.0, 300.0],
+        'time_signature': [4, 4, 4, 0],
+        'duration_ms': [200000, 200000, 200000, 0],
+    })
+
+
+def test_default_rules_only_make_the_baseline_checks():
+    result = validate(_tracks(), DEFAULT_RULES)
+    np.testing.assert_array_equal(result.invalid, [False, True, False, False])
+    assert result.counts() == {'popularity_range': 1}
+
+
+def test_strict_rules_are_opt_in():
+    result = validate(_tracks(), STRICT_RULES)
+    np.testing.assert_array_equal(result.invalid, [False, True, True, True])
+    assert result.describe()[3] == "tempo_range,duration_ms_range"
+
+
+def test_streaming_writes_quarantined_rows_per_chunk(tmp_path):
+    from conftest import make_raw_tracks
+    from src.etl_pipeline import QUARANTINE_FILE, SpotifyETL
+
+    raw = make_raw_tracks(n=1000)
+    raw.loc[raw.index % 50 == 0, 'tempo'] = 300.0
+    raw_path = tmp_path / "raw.csv"
+    raw.to_csv(raw_path, index=False)
+
+    etl = SpotifyETL(str(raw_path))
+    etl.validation_rules = STRICT_RULES
+    etl.run_streaming(str(tmp_path / "out" / "cleaned.csv"), chunksize=200, write_csv=False)
+
+    assert etl.quarantine == []
+    quarantine = pd.read_parquet(tmp_path / "out" / QUARANTINE_FILE)
+    assert len(quarantine) == 20
+    assert (quarantine['violated_rules'] == 'tempo_range').all()